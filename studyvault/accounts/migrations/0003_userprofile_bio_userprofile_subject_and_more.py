@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+import accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_remove_userprofile_bio_alter_userprofile_avatar_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='bio',
+            field=models.TextField(blank=True, max_length=400, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='subject',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to=accounts.models.avatar_upload_path),
+        ),
+    ]
@@ -1,7 +1,7 @@
 # materials/admin.py
 from django.contrib import admin
 from .models import Category, Department, SemesterYear, Material
-from .models import University
+from .models import ProcessingJob, University
 
 
 @admin.register(Category)
@@ -31,10 +31,14 @@ class SemesterYearAdmin(admin.ModelAdmin):
 @admin.register(Material)
 class MaterialAdmin(admin.ModelAdmin):
     list_display = ("title", "uploader", "category", "department", "semester", "download_count", "created_at")
-    list_filter = ("category", "department", "semester", "created_at")
+    list_filter = ("category", "department", "semester", "processing_status", "created_at")
     search_fields = ("title", "description", "uploader__username")
     autocomplete_fields = ("uploader", "category", "department", "semester")
-    readonly_fields = ("download_count", "created_at", "updated_at")
+    readonly_fields = (
+        "download_count", "upvote_count", "downvote_count", "comment_count",
+        "processing_status", "sha256", "mime_type", "page_count", "thumbnail",
+        "created_at", "updated_at",
+    )
     fieldsets = (
         ("Basic Info", {
             "fields": ("title", "description", "uploader")
@@ -45,14 +49,33 @@ class MaterialAdmin(admin.ModelAdmin):
         ("File", {
             "fields": ("file", )
         }),
+        ("Processing", {
+            "fields": ("processing_status", "sha256", "mime_type", "page_count", "thumbnail")
+        }),
         ("Stats", {
-            "fields": ("download_count", "created_at", "updated_at")
+            "fields": (
+                "download_count", "upvote_count", "downvote_count", "comment_count",
+                "created_at", "updated_at",
+            )
         }),
     )
 
+@admin.register(ProcessingJob)
+class ProcessingJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "material", "status", "attempts", "run_after", "locked_at", "heartbeat_at", "updated_at",
+    )
+    list_filter = ("status",)
+    raw_id_fields = ("material",)
+    readonly_fields = (
+        "attempts", "locked_at", "heartbeat_at", "last_error", "created_at", "updated_at",
+    )
+
+
 @admin.register(University)
 class UniversityAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug", "created_at")
+    list_display = ("name", "slug", "material_count", "created_at")
+    readonly_fields = ("material_count",)
     search_fields = ("name",)
     prepopulated_fields = {"slug": ("name",)}
     ordering = ("name",)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MaterialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'materials'
+
+    def ready(self):
+        import materials.signals
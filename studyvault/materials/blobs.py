@@ -0,0 +1,123 @@
+# materials/blobs.py
+"""
+Blob reference counting.
+
+Material save/delete signal (materials/signals.py) থেকে ``retain`` / ``release``
+call হয়। ``release`` এ count শূন্য হলে commit-এর পরে row আর ফাইল দুইটাই যায়।
+Drift হলে: ``python manage.py reconcile_counters``
+
+Race: নতুন upload দেখে blob ফাইল আছে, তাই লেখে না (storage.py) — আর ঠিক
+তখনই পুরোনো শেষ reference চলে গেলে collector ফাইলটা মুছে দেয়। তাই
+``collect`` row lock ধরে ref_count আবার দেখে তবেই মুছে, আর ``retain``
+reference বসানোর পরে (এর পরে আর কেউ মুছতে পারে না) ফাইল আছে কিনা দেখে;
+না থাকলে না-লেখা content / ``source`` থেকে আবার লেখে।
+"""
+import logging
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Blob, Material
+from .storage import blob_storage, digest_of, is_blob
+
+logger = logging.getLogger(__name__)
+
+
+class BlobMissing(Exception):
+    """Reference বসানো হলো কিন্তু blob ফাইল নেই, আবার লেখার content-ও নেই।"""
+
+
+def retain(name, using="default", count=1, source=None, strict=True):
+    """
+    ``count``: একসাথে কয়টা reference (bulk import-এ একই blob অনেক row)।
+    ``source``: ফাইল মুছে গিয়ে থাকলে যেখান থেকে আবার copy (importer-এর path)।
+    ``strict=False``: ফাইল না পেলে শুধু log (reconcile — আগে থেকেই নেই এমন ফাইল)।
+    """
+    if not is_blob(name) or count <= 0:
+        return
+    updated = Blob.objects.using(using).filter(name=name).update(ref_count=F("ref_count") + count)
+    if not updated:
+        _create(name, count, using)
+    if _ensure_file(name, source, strict):
+        # নতুন row-এর size ফাইল মুছে যাওয়া অবস্থায় ধরা হয়েছিল
+        Blob.objects.using(using).filter(name=name).update(size=blob_storage.size(name))
+
+
+def _ensure_file(name, source, strict):
+    """ফাইল না থাকলে আবার লেখে; লিখলে True।"""
+    content = blob_storage.take_skipped(name)
+    if blob_storage.exists(name):
+        return False
+    if content is not None:
+        blob_storage.restore(name, content)
+        return True
+    if source is not None:
+        with open(source, "rb") as f:
+            blob_storage.restore(name, File(f))
+        return True
+    if strict:
+        raise BlobMissing(name)
+    logger.error("Blob %s is referenced but missing on disk.", name)
+    return False
+
+
+def _create(name, count, using):
+    try:
+        size = blob_storage.size(name)
+    except OSError:
+        size = 0
+    blob, created = Blob.objects.using(using).get_or_create(
+        name=name, defaults={"sha256": digest_of(name), "size": size, "ref_count": count}
+    )
+    if not created:
+        Blob.objects.using(using).filter(pk=blob.pk).update(ref_count=F("ref_count") + count)
+
+
+def release(name, using="default"):
+    if not is_blob(name):
+        return
+    Blob.objects.using(using).filter(name=name, ref_count__gt=0).update(
+        ref_count=F("ref_count") - 1
+    )
+    transaction.on_commit(lambda: collect(name, using=using), using=using)
+
+
+def collect(name, using="default"):
+    """Reference না থাকলে blob row + ফাইল delete; delete হলে True।"""
+    with transaction.atomic(using=using):
+        # row lock — এর মধ্যে কেউ retain করলে ref_count > 0, কিছুই মুছি না
+        blob = (
+            Blob.objects.using(using).select_for_update()
+            .filter(name=name, ref_count__lte=0).first()
+        )
+        if blob is None:
+            return False
+        blob.delete()
+        # lock ধরে রেখেই ফাইল মুছি: এই সময়ে আসা retain এই transaction শেষ হওয়ার
+        # পরে চলে, তখন ফাইল নেই দেখে _ensure_file আবার লেখে
+        blob_storage.delete(name)
+    return True
+
+
+def reconcile():
+    """Material table থেকে আবার গুনে ref_count বসায়। কয়টা row বদলালো return করে।"""
+    actual = dict(
+        Material.objects.filter(file__startswith="blobs/")
+        .order_by()
+        .values_list("file")
+        .annotate(n=Count("pk"))
+    )
+    fixed = 0
+    for name in actual.keys() - set(Blob.objects.values_list("name", flat=True)):
+        retain(name, strict=False)
+        Blob.objects.filter(name=name).update(ref_count=actual[name])
+        fixed += 1
+    for blob in Blob.objects.all().iterator():
+        n = actual.get(blob.name, 0)
+        if blob.ref_count != n:
+            Blob.objects.filter(pk=blob.pk).update(ref_count=n)
+            fixed += 1
+            if n == 0:
+                collect(blob.name)
+    return fixed
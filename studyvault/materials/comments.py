@@ -0,0 +1,117 @@
+# materials/comments.py
+"""
+Comment tree loader.
+
+একটা page-এর সব material-এর comment একটাই query-তে আনি (user সহ),
+তারপর Python-এ parent/child tree বানিয়ে প্রতিটা comment-এ ``replies`` list
+বসিয়ে দিই — template আর ``c.children.all`` / ``c.user`` এর জন্য query করে না।
+"""
+from django.db import connections
+from django.db.models.signals import post_delete
+
+from .models import Comment
+
+# কত লেভেল পর্যন্ত nested দেখাবো; এর চেয়ে গভীর reply শেষ লেভেলে flatten হয়
+MAX_DEPTH = 4
+# browse card-এ প্রতি material-এ কয়টা top-level comment, বাকিগুলো "load more"
+PER_MATERIAL = 3
+
+
+def _comment_queryset(material_ids):
+    return (
+        Comment.objects
+        .filter(material_id__in=material_ids)
+        .select_related("user")
+        .only(
+            "id", "material_id", "parent_id", "body", "created_at",
+            "user__id", "user__username",
+        )
+        # parent সবসময় child-এর আগে আসবে
+        .order_by("created_at", "id")
+    )
+
+
+def build_trees(comments, max_depth=MAX_DEPTH):
+    """
+    comments (created_at ascending) থেকে {material_id: [root, ...]} বানায়।
+    প্রতিটা comment-এ ``replies`` (newest first) আর ``depth`` সেট হয়।
+    """
+    nodes = {}
+    roots = {}
+    for c in comments:
+        c.replies = []
+        parent = nodes.get(c.parent_id) if c.parent_id else None
+        if parent is None:
+            c.depth = 0
+            c.thread_parent = None
+            roots.setdefault(c.material_id, []).append(c)
+        elif parent.depth < max_depth:
+            c.depth = parent.depth + 1
+            c.thread_parent = parent
+            parent.replies.append(c)
+        else:
+            # বেশি গভীর: parent-এর পাশেই বসাই
+            holder = parent.thread_parent or parent
+            c.depth = holder.depth + 1
+            c.thread_parent = holder
+            holder.replies.append(c)
+        nodes[c.id] = c
+
+    # Comment.Meta.ordering এর মত নতুনগুলো আগে
+    for c in nodes.values():
+        c.replies.reverse()
+    for material_roots in roots.values():
+        material_roots.reverse()
+    return roots
+
+
+def attach_comment_trees(materials, max_depth=MAX_DEPTH, limit=PER_MATERIAL):
+    """
+    materials-এর প্রতিটাতে সেট করে:
+      m.comment_tree     – প্রথম ``limit`` টা root comment (None হলে সব)
+      m.more_comments    – বাকি কয়টা root comment "load more" এর জন্য আছে
+    """
+    materials = list(materials)
+    if not materials:
+        return materials
+
+    trees = build_trees(_comment_queryset([m.pk for m in materials]), max_depth)
+    for m in materials:
+        roots = trees.get(m.pk, [])
+        m.comment_tree = roots if limit is None else roots[:limit]
+        m.more_comments = len(roots) - len(m.comment_tree)
+    return materials
+
+
+def load_more_roots(material, offset, limit=PER_MATERIAL, max_depth=MAX_DEPTH):
+    """"Load more" এর জন্য: offset থেকে পরের ``limit`` টা root (tree সহ), আর কয়টা বাকি।"""
+    roots = build_trees(_comment_queryset([material.pk]), max_depth).get(material.pk, [])
+    page = roots[offset:offset + limit]
+    return page, max(len(roots) - offset - len(page), 0)
+
+
+def delete_subtree(comment, using="default"):
+    """
+    Comment আর তার নিচের সব reply একটা DELETE-এ (recursive CTE) — ORM cascade
+    প্রতি reply level-এ একটা SELECT করত, আর post_delete listener থাকায় প্রতিটা
+    row আগে load করত। কয়টা মুছলো return করে।
+
+    Signal একবারই, root-এর জন্য — listener (card/page cache bump) material ধরে
+    কাজ করে, আর সব reply একই material-এর।
+    """
+    table = Comment._meta.db_table
+    with connections[using].cursor() as cursor:
+        # CTE subquery-র ভিতরে — statement WITH দিয়ে শুরু হলে sqlite3 rowcount -1 দেয়
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ("
+            f"  WITH RECURSIVE subtree(id) AS ("
+            f"    SELECT id FROM {table} WHERE id = %s"
+            f"    UNION ALL"
+            f"    SELECT c.id FROM {table} c JOIN subtree s ON c.parent_id = s.id"
+            f"  ) SELECT id FROM subtree"
+            f")",
+            [comment.pk],
+        )
+        deleted = cursor.rowcount
+    post_delete.send(sender=Comment, instance=comment, using=using, origin=comment)
+    return deleted
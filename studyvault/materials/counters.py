@@ -0,0 +1,92 @@
+# materials/counters.py
+"""
+Material-এর denormalized counter (upvote/downvote/comment/download)।
+
+View গুলো row insert/delete করার সাথে একই transaction-এ ``bump()`` call করে,
+তাই counter আর আসল row সবসময় একসাথে commit/rollback হয়। Download count
+download_stats.py একই transaction-এ ``DownloadDay`` এর সাথে লেখে — DownloadDay
+আসার আগের history migration 0023 একটা day row হিসেবে তুলে দিয়েছে, তাই
+দিনগুলোর যোগফলই আসল মান।
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from studyvault import pagecache
+
+from . import ranking
+from .models import Comment, DownloadDay, Downvote, Material, Upvote
+
+# counter field -> (যে model থেকে আসল মান, কীভাবে: row গোনা / count যোগ)
+SOURCES = {
+    "upvote_count": (Upvote, Count("pk")),
+    "downvote_count": (Downvote, Count("pk")),
+    "comment_count": (Comment, Count("pk")),
+    "download_count": (DownloadDay, Sum("count")),
+}
+
+
+def bump(material_id, **deltas):
+    """
+    bump(pk, upvote_count=1, downvote_count=-1) -> একটাই UPDATE, F() দিয়ে
+    (hot_score / top_score সহ)।
+    """
+    deltas = {field: d for field, d in deltas.items() if d}
+    if not deltas:
+        return 0
+    return Material.objects.filter(pk=material_id).update(
+        **{field: F(field) + d for field, d in deltas.items()},
+        # hot/top score একই UPDATE-এ (materials/ranking.py)
+        **ranking.score_updates(deltas),
+    )
+
+
+def actual_counts():
+    """প্রতিটা counter-এর আসল মান (correlated COUNT/SUM subquery) annotate করার expression।"""
+    exprs = {}
+    for field, (model, aggregate) in SOURCES.items():
+        counts = (
+            model.objects.filter(material=OuterRef("pk"))
+            .order_by()
+            .values("material")
+            .annotate(n=aggregate)
+            .values("n")
+        )
+        exprs[f"actual_{field}"] = Coalesce(Subquery(counts), Value(0))
+    return exprs
+
+
+def reconcile(queryset=None, batch_size=500):
+    """
+    যে material গুলোর stored counter আসল row count-এর সাথে মেলে না,
+    সেগুলো batch করে ``bulk_update`` দিয়ে ঠিক করে (score সহ)। কয়টা ঠিক হলো return করে।
+    """
+    if queryset is None:
+        queryset = Material.objects.all()
+
+    score_fields = ["created_at", "hot_score", "top_score"]
+    qs = queryset.only("pk", *SOURCES, *score_fields).annotate(**actual_counts()).order_by("pk")
+    update_fields = [*SOURCES, "hot_score", "top_score"]
+
+    fixed = 0
+    batch = []
+    for m in qs.iterator(chunk_size=batch_size):
+        drift = False
+        for field in SOURCES:
+            actual = getattr(m, f"actual_{field}")
+            if getattr(m, field) != actual:
+                setattr(m, field, actual)
+                drift = True
+        if drift:
+            ranking.apply_scores(m)
+            batch.append(m)
+        if len(batch) >= batch_size:
+            Material.objects.bulk_update(batch, update_fields)
+            fixed += len(batch)
+            batch = []
+    if batch:
+        Material.objects.bulk_update(batch, update_fields)
+        fixed += len(batch)
+    if fixed:
+        # card আর detail-এর count বদলেছে, hot/top order-ও
+        pagecache.purge(pagecache.page_tag("browse"), pagecache.page_tag("detail"))
+    return fixed
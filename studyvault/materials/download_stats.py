@@ -0,0 +1,178 @@
+# materials/download_stats.py
+"""
+Buffered download counter.
+
+প্রতি download-এ DB-তে UPDATE না করে event গুলো process-এর memory-তে জমাই,
+তারপর ``MATERIALS_DOWNLOAD_FLUSH_INTERVAL`` সেকেন্ড পরপর একটা background thread
+একবারে flush করে:
+  * ``Material.download_count`` -> একটাই UPDATE (CASE WHEN দিয়ে সব material)
+  * ``DownloadDay`` -> একটাই upsert (``ON CONFLICT … DO UPDATE count = count + …``)
+
+Process বন্ধ হওয়ার সময় (gunicorn/uvicorn graceful shutdown, runserver reload)
+``atexit`` বাকি সব flush করে দেয়। Interval 0 হলে buffer ছাড়াই সাথে সাথে লেখে
+(tests)।
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+
+from studyvault import pagecache
+
+from . import fragments, ranking
+from .models import DownloadDay, Material
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 10  # seconds
+
+
+def flush_interval():
+    return getattr(settings, "MATERIALS_DOWNLOAD_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+
+def write_counts(events):
+    """
+    events: {(material_id, day): n}. একটা transaction-এ material counter আর
+    per-day history দুটোই আপডেট করে।
+    """
+    per_material = Counter()
+    for (material_id, _), n in events.items():
+        per_material[material_id] += n
+
+    with transaction.atomic():
+        # এর মধ্যে delete হয়ে যাওয়া material বাদ
+        alive = set(
+            Material.objects.filter(pk__in=per_material).order_by().values_list("pk", flat=True)
+        )
+        if not alive:
+            return
+        delta = Case(
+            *[When(pk=pk, then=Value(per_material[pk])) for pk in alive],
+            default=Value(0),
+        )
+        Material.objects.filter(pk__in=alive).update(
+            download_count=F("download_count") + delta,
+            # hot/top score-ও একই UPDATE-এ
+            **ranking.score_updates({"download_count": delta}),
+        )
+
+        table = DownloadDay._meta.db_table
+        rows = [
+            (material_id, day, n)
+            for (material_id, day), n in events.items()
+            if material_id in alive
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (material_id, day, count) VALUES (%s, %s, %s) "
+                f"ON CONFLICT (material_id, day) "
+                f"DO UPDATE SET count = {table}.count + excluded.count",
+                rows,
+            )
+        # card-এ download count দেখায় (detail page-এও)
+        fragments.bump(*alive)
+        pagecache.purge(*(pagecache.material_tag(pk) for pk in alive))
+
+
+class DownloadBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def record(self, material_id, when=None):
+        day = timezone.localdate(when)
+        with self._lock:
+            self._pending[(material_id, day)] += 1
+
+        if flush_interval() <= 0:
+            self.flush()
+        else:
+            self._ensure_thread()
+
+    def pending(self):
+        with self._lock:
+            return sum(self._pending.values())
+
+    def flush(self):
+        """জমে থাকা সব event লিখে দেয়; কয়টা event লেখা হলো return করে।"""
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+        if not batch:
+            return 0
+        try:
+            write_counts(batch)
+        except Exception:
+            # হারাবো না — পরের flush-এ আবার চেষ্টা
+            with self._lock:
+                self._pending.update(batch)
+            raise
+        return sum(batch.values())
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="download-stats-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(flush_interval()):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Download counter flush failed; will retry.")
+            finally:
+                close_old_connections()
+
+    def shutdown(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Download counter flush on shutdown failed.")
+
+
+buffer = DownloadBuffer()
+atexit.register(buffer.shutdown)
+
+
+def record(material_id):
+    buffer.record(material_id)
+
+
+async def arecord(material_id):
+    """Async view থেকে। Buffer থাকলে শুধু memory-তে যোগ — thread hop লাগে না।"""
+    if flush_interval() <= 0:
+        # সাথে সাথে DB-তে লেখে — async context থেকে সরাসরি ORM চলে না
+        await sync_to_async(buffer.record)(material_id)
+    else:
+        buffer.record(material_id)
+
+
+def flush():
+    return buffer.flush()
+
+
+def trending(days=7):
+    """শেষ ``days`` দিনে সবচেয়ে বেশি download হওয়া material (``recent_downloads`` সহ)।"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return (
+        Material.objects
+        .filter(download_days__day__gte=since)
+        .annotate(recent_downloads=Sum("download_days__count"))
+        .order_by("-recent_downloads", "-created_at")
+    )
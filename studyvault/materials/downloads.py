@@ -0,0 +1,174 @@
+# materials/downloads.py
+"""
+File download pipeline.
+
+settings.MATERIALS_DOWNLOAD_OFFLOAD:
+  None               -> Python থেকেই stream (HTTP Range / 206 সাপোর্ট সহ)
+  "x-accel-redirect" -> nginx কে ``X-Accel-Redirect`` header দিয়ে ফাইল পাঠাতে বলি
+  "x-sendfile"       -> Apache/lighttpd ``X-Sendfile``
+
+সব mode-এ ETag / Last-Modified দেওয়া হয়, ``If-None-Match`` / ``If-Modified-Since``
+মিললে 304 — worker-কে ফাইল ছুঁতেই হয় না।
+
+ASGI (uvicorn) তে ``asynchronous=True``: body async generator থেকে আসে। Sync
+iterator (FileResponse সহ) দিলে Django ASGI handler পুরো ফাইল আগে memory-তে
+list করে নেয় — 50MB PDF হলে 50MB RAM প্রতি download।
+"""
+import asyncio
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+# async-এ প্রতিটা read একটা thread hop — বড় chunk-এ hop কম
+ASYNC_CHUNK_SIZE = 256 * 1024
+
+X_ACCEL_REDIRECT = "x-accel-redirect"
+X_SENDFILE = "x-sendfile"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def make_etag(stat):
+    return f'"{stat.st_size:x}-{int(stat.st_mtime * 1_000_000):x}"'
+
+
+def parse_range(header, size):
+    """
+    ``Range: bytes=…`` থেকে (start, end) inclusive।
+      None        -> header নেই / বুঝিনি / multi-range: পুরো ফাইল (200) পাঠাও
+      "invalid"   -> satisfy করা যায় না (416)
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multi-range বা অন্য unit: RFC অনুযায়ী ignore করা যায়
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: শেষের N byte
+        length = int(last)
+        if length == 0 or size == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return "invalid"
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, mtime):
+    """``If-Range`` না থাকলে বা validator মিললে True — তখনই Range মানা হবে।"""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def _iter_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _aiter_range(path, start, end):
+    # disk read blocking — thread-এ পড়ি, event loop আটকায় না
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(ASYNC_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def _offload_response(mode, path, content_type):
+    response = HttpResponse(content_type=content_type)
+    if mode == X_ACCEL_REDIRECT:
+        prefix = getattr(settings, "MATERIALS_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative)
+    else:
+        response["X-Sendfile"] = path
+    return response
+
+
+def serve_file(request, path, filename=None, asynchronous=False):
+    """
+    Download response বানায়। ``response.counts_as_download`` True হলে
+    এটাকে নতুন download হিসেবে গুনতে হবে (resume করা বাকি অংশ না)।
+    ``asynchronous``: ASGI request হলে True — body async generator।
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = make_etag(stat)
+    filename = filename or os.path.basename(path)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    # 304 / 412
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is not None:
+        response.counts_as_download = False
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+
+    mode = getattr(settings, "MATERIALS_DOWNLOAD_OFFLOAD", None)
+    if mode in (X_ACCEL_REDIRECT, X_SENDFILE):
+        # Range/206 proxy নিজেই সামলাবে
+        response = _offload_response(mode, path, content_type)
+    elif byte_range == "invalid":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response.counts_as_download = False
+        return response
+    elif byte_range:
+        start, end = byte_range
+        iterate = _aiter_range if asynchronous else _iter_range
+        response = StreamingHttpResponse(
+            iterate(path, start, end), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    elif asynchronous:
+        response = StreamingHttpResponse(
+            _aiter_range(path, 0, size - 1), content_type=content_type
+        )
+        response["Content-Length"] = str(size)
+    else:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    # ফাইলের শুরু থেকে পড়লে তবেই নতুন download
+    response.counts_as_download = byte_range is None or (
+        byte_range != "invalid" and byte_range[0] == 0
+    )
+    return response
@@ -0,0 +1,176 @@
+# materials/events.py
+"""
+Live update — vote count আর নতুন comment, page reload ছাড়াই (Server-Sent Events)।
+
+Publish: vote toggle / comment save commit হওয়ার পর ``publish(material_id, …)``।
+Subscribe: ``/materials/<pk>/events/`` (detail) বা ``/materials/events/?ids=1,2,3``
+(browse page-এর card গুলো) — ``stream()`` async generator, প্রতিটা খোলা
+connection শুধু একটা asyncio.Queue, কোনো thread না। তাই ASGI worker (uvicorn)
+একাই হাজার হাজার idle connection ধরে রাখতে পারে।
+
+Broker বদলানো যায় (settings ``MATERIALS_EVENT_BROKER``, CACHES এর মত):
+  InProcessBroker -> একটা process-এর ভিতরেই (dev / single uvicorn worker)
+  RedisBroker     -> একাধিক worker/process (gunicorn থেকে vote, uvicorn-এ SSE);
+                     ``redis`` package লাগবে
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import aclosing
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# কিছু না এলে এতক্ষণ পরপর ": ping" — proxy idle connection কেটে না দেয়
+HEARTBEAT = 15
+# এরপর stream বন্ধ, browser নিজেই reconnect করে (deploy-এর পরে পুরোনো worker ছাড়ে)
+MAX_STREAM_SECONDS = 300
+RETRY_MS = 3000
+# browse page-এ একসাথে এর বেশি material subscribe না
+MAX_CHANNELS = 50
+
+VOTES = "votes"
+COMMENT = "comment"
+COMMENT_DELETED = "comment_deleted"
+
+
+def channel_for(material_id):
+    return f"material:{material_id}"
+
+
+class InProcessBroker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, event):
+        """যেকোনো thread থেকে call করা যায় (sync view, sync_to_async, worker)।"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                pass  # loop বন্ধ হয়ে গেছে — subscriber-এর finally নিজেই সরাবে
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            # ধীর client: পুরোনোটা ফেলে দেই, publisher কখনো আটকায় না
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def subscribe(self, channels, heartbeat=HEARTBEAT):
+        """Event yield করে; ``heartbeat`` সেকেন্ড কিছু না এলে None।"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                for channel in channels:
+                    subs = self._subscribers.get(channel)
+                    if subs is not None:
+                        subs.discard(subscriber)
+                        if not subs:
+                            del self._subscribers[channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return len({s for subs in self._subscribers.values() for s in subs})
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publish Redis-এ যায়; প্রতিটা process-এ একটাই PSUBSCRIBE connection Redis থেকে
+    এনে local subscriber দের ভাগ করে দেয় — হাজার SSE client মানে হাজার Redis
+    connection না।
+    """
+    prefix = "studyvault:"
+
+    def __init__(self, url=None, **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker needs the 'redis' package.")
+        self.url = url or "redis://localhost:6379/0"
+        self._client = redis.Redis.from_url(self.url)
+        self._relay = None
+
+    def publish(self, channel, event):
+        self._client.publish(self.prefix + channel, json.dumps(event))
+
+    async def subscribe(self, channels, heartbeat=HEARTBEAT):
+        if self._relay is None or self._relay.done():
+            self._relay = asyncio.get_running_loop().create_task(self._run_relay())
+        async with aclosing(super().subscribe(channels, heartbeat)) as events:
+            async for event in events:
+                yield event
+
+    async def _run_relay(self):
+        import redis.asyncio as aioredis
+
+        while True:
+            try:
+                client = aioredis.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + "*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        channel = message["channel"].decode()[len(self.prefix):]
+                        super().publish(channel, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Redis event relay dropped; reconnecting.", exc_info=True)
+                await asyncio.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = getattr(settings, "MATERIALS_EVENT_BROKER", {})
+    backend = import_string(config.get("BACKEND", "materials.events.InProcessBroker"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+def publish(material_id, kind, data):
+    """Commit-এর পরে call করো (``transaction.on_commit``) — rollback হলে কিছু যায় না।"""
+    try:
+        get_broker().publish(channel_for(material_id), {"event": kind, "data": data})
+    except Exception:
+        # live update না গেলেও vote/comment নিজে যেন fail না করে
+        logger.warning("Publishing %s for material %s failed.", kind, material_id, exc_info=True)
+
+
+def format_event(event):
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream(material_ids, heartbeat=HEARTBEAT, max_seconds=MAX_STREAM_SECONDS):
+    """SSE body (``text/event-stream``) — StreamingHttpResponse-এ দাও।"""
+    channels = [channel_for(pk) for pk in material_ids]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    yield f"retry: {RETRY_MS}\n\n"
+    async with aclosing(get_broker().subscribe(channels, heartbeat)) as events:
+        async for event in events:
+            yield ": ping\n\n" if event is None else format_event(event)
+            if loop.time() >= deadline:
+                break
@@ -0,0 +1,162 @@
+# materials/facets.py
+"""
+Browse sidebar-এর facet count — "CSE (42)", "PDF (17)" …
+
+প্রতি facet value-র জন্য আলাদা COUNT না চালিয়ে একটাই GROUP BY query:
+search (q) এর result কে (category, department, semester, university, file kind)
+combination অনুযায়ী গুনি। সেই ছোট table থেকে Python-এ প্রতিটা dimension-এর
+count বের করি, আর বাকি active filter গুলো মেনে (নিজের dimension বাদ দিয়ে —
+যাতে "CSE" select করার পরেও অন্য department গুলোর count দেখা যায়)।
+
+Cache key = facet filter বসানোর *আগের* queryset-এর compiled SQL + params।
+তাতে search-এর normalize করা match expression (``DSA`` আর `` dsa`` একই),
+আর caller আগে থেকে যা filter বসিয়েছে সব থাকে — অন্যভাবে filter করা queryset
+কখনো একই entry পায় না। Facet filter (category/department/…/kind) ইচ্ছা করেই
+key-তে নেই: ওগুলো cached table-এর উপর Python-এ বসে, তাই একই search-এর সব
+facet combination একটা entry থেকেই ঠিক count পায়।
+"""
+import hashlib
+from collections import Counter, namedtuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Q
+
+from . import lookups
+from .models import Category
+
+FACET_CACHE_TIMEOUT = 60  # seconds — count একটু পুরোনো হলে ক্ষতি নেই
+
+KINDS = ["pdf", "docx", "pptx"]
+
+# dimension (GET param) -> Material-এর column
+DIMENSIONS = {
+    "category": "category_id",
+    "department": "department_id",
+    "semester": "semester_id",
+    "university": "university_id",
+}
+
+FacetValue = namedtuple("FacetValue", "value label count active")
+
+
+def active_filters(params):
+    """Request GET থেকে শুধু facet filter গুলো (খালি/অচেনা value বাদ)।"""
+    filters = {}
+    for dim in DIMENSIONS:
+        value = (params.get(dim) or "").strip()
+        if value.isdigit():
+            filters[dim] = value
+    kind = (params.get("kind") or "").lower()
+    if kind in KINDS:
+        filters["kind"] = kind
+    return filters
+
+
+def apply(queryset, filters):
+    for dim, value in filters.items():
+        if dim == "kind":
+            # category slug -> id (lookup cache), যাতে দুই দিকেই index চলে (JOIN-এর OR না)
+            category = lookups.by_slug(Category, value)
+            match = Q(file_ext=value)
+            if category is not None:
+                match |= Q(category_id=category.pk)
+            queryset = queryset.filter(match)
+        else:
+            queryset = queryset.filter(**{DIMENSIONS[dim]: value})
+    return queryset
+
+
+def _cache_key(grouped):
+    try:
+        sql, params = grouped.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return "materials:facets:" + hashlib.md5(f"{grouped.db}:{sql}:{params!r}".encode()).hexdigest()
+
+
+def _combinations(queryset):
+    """
+    [(category_id, department_id, semester_id, university_id, file_ext, n), …]
+    আর প্রতিটা id-র নাম — সব একটাই query-তে (নাম JOIN দিয়ে আসে)।
+    """
+    columns = list(DIMENSIONS.values())
+    names = [f"{dim}__name" for dim in DIMENSIONS]
+    rows, labels = [], {dim: {} for dim in DIMENSIONS}
+    labels["slug"] = {}
+    grouped = (
+        queryset.order_by()
+        .values(*columns, *names, "category__slug", "file_ext")
+        .annotate(n=Count("pk"))
+    )
+    key = _cache_key(grouped)
+    if key is None:
+        # queryset.none() (যেমন শুধু যতিচিহ্নের search) — query-ই লাগে না
+        return rows, labels
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    for row in grouped:
+        rows.append(tuple(row[c] for c in columns) + (row["file_ext"], row["n"]))
+        for dim, column, name in zip(DIMENSIONS, columns, names):
+            labels[dim][row[column]] = row[name]
+        labels["slug"][row["category_id"]] = row["category__slug"]
+
+    result = (rows, labels)
+    cache.set(key, result, FACET_CACHE_TIMEOUT)
+    return result
+
+
+def _row_kinds(row, slugs):
+    kinds = {row[-2]} if row[-2] in KINDS else set()
+    slug = slugs.get(row[0])
+    if slug in KINDS:
+        kinds.add(slug)
+    return kinds
+
+
+def compute(queryset, filters):
+    """
+    queryset: search হয়ে যাওয়া কিন্তু facet filter বসানো হয়নি এমন queryset।
+    Return: {dimension: [FacetValue, …]} (count অনুযায়ী বড় থেকে ছোট)।
+    """
+    rows, labels = _combinations(queryset)
+    slugs = labels["slug"]
+    dims = list(DIMENSIONS)
+
+    def matches(row, skip):
+        for dim, value in filters.items():
+            if dim == skip:
+                continue
+            if dim == "kind":
+                if value not in _row_kinds(row, slugs):
+                    return False
+            elif str(row[dims.index(dim)]) != value:
+                return False
+        return True
+
+    counts = {dim: Counter() for dim in (*dims, "kind")}
+    for row in rows:
+        n = row[-1]
+        for i, dim in enumerate(dims):
+            if row[i] is not None and matches(row, skip=dim):
+                counts[dim][row[i]] += n
+        if matches(row, skip="kind"):
+            for kind in _row_kinds(row, slugs):
+                counts["kind"][kind] += n
+
+    facets = {}
+    for dim in dims:
+        facets[dim] = sorted(
+            (
+                FacetValue(pk, labels[dim].get(pk, "—"), n, filters.get(dim) == str(pk))
+                for pk, n in counts[dim].items()
+            ),
+            key=lambda f: (-f.count, f.label),
+        )
+    facets["kind"] = [
+        FacetValue(kind, kind.upper(), counts["kind"][kind], filters.get("kind") == kind)
+        for kind in KINDS
+    ]
+    return facets
@@ -0,0 +1,126 @@
+# materials/filetypes.py
+"""
+File-এর প্রথম কয়েকটা byte (magic bytes) দেখে আসল type বের করা।
+নামের extension বিশ্বাস করি না — শুধু ambiguous হলে (পুরোনো Office OLE2) নাম দেখি।
+"""
+import zipfile
+
+PDF = "application/pdf"
+ZIP = "application/zip"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DOC = "application/msword"
+PPT = "application/vnd.ms-powerpoint"
+XLS = "application/vnd.ms-excel"
+OCTET_STREAM = "application/octet-stream"
+
+EXTENSIONS = {
+    PDF: {"pdf"},
+    DOCX: {"docx"},
+    PPTX: {"pptx"},
+    XLSX: {"xlsx"},
+    DOC: {"doc"},
+    PPT: {"ppt"},
+    XLS: {"xls"},
+    ZIP: {"zip"},
+}
+
+_OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")
+_OLE2_BY_EXT = {"doc": DOC, "ppt": PPT, "xls": XLS}
+
+# OOXML zip-এর ভিতরের folder নাম -> type
+_OOXML_PARTS = (("word/", DOCX), ("ppt/", PPTX), ("xl/", XLSX))
+OOXML = (DOCX, PPTX, XLSX)
+
+# sniff() এর জন্য শুরুর এতটুকু byte যথেষ্ট (OOXML হলে zip local header-এ
+# প্রথম entry-র নাম থাকে; পুরো zip থাকলে central directory দেখি)
+HEADER_SIZE = 8 * 1024
+
+
+def _extension(name):
+    return name.rsplit(".", 1)[-1].lower() if name and "." in name else ""
+
+
+def _ooxml_from_names(names):
+    for name in names:
+        for prefix, mime in _OOXML_PARTS:
+            if name.startswith(prefix):
+                return mime
+    return None
+
+
+def _ooxml_from_local_headers(head):
+    """
+    Stream-এর শুরু থেকে zip local file header গুলো পড়ে entry নাম বের করি
+    (পুরো ফাইল লাগে না)। ``[Content_Types].xml`` আর ``_rels/`` এর পরেই সাধারণত
+    word/ ppt/ xl/ আসে।
+    """
+    names = []
+    offset = 0
+    while head.startswith(b"PK\x03\x04", offset) and offset + 30 <= len(head):
+        name_len = int.from_bytes(head[offset + 26:offset + 28], "little")
+        extra_len = int.from_bytes(head[offset + 28:offset + 30], "little")
+        comp_size = int.from_bytes(head[offset + 18:offset + 22], "little")
+        name = head[offset + 30:offset + 30 + name_len].decode("utf-8", "replace")
+        names.append(name)
+        offset += 30 + name_len + extra_len + comp_size
+    return _ooxml_from_names(names)
+
+
+def sniff(head, name=""):
+    """
+    head: ফাইলের শুরুর byte (অন্তত কয়েকশো byte)। MIME type return করে,
+    চিনতে না পারলে ``application/octet-stream``।
+    """
+    # spec অনুযায়ী "%PDF-" এর আগে ১KB পর্যন্ত junk থাকতে পারে
+    if b"%PDF-" in head[:1024]:
+        return PDF
+    if head.startswith(_ZIP_MAGIC):
+        return _ooxml_from_local_headers(head) or ZIP
+    if head.startswith(_OLE2_MAGIC):
+        return _OLE2_BY_EXT.get(_extension(name), DOC)
+    return OCTET_STREAM
+
+
+def sniff_file(f, name=""):
+    """
+    Seek করা যায় এমন file object। zip হলে central directory থেকে নিশ্চিত হই।
+    File position শুরুতে ফিরিয়ে দেয়।
+    """
+    f.seek(0)
+    head = f.read(HEADER_SIZE)
+    mime = sniff(head, name)
+    if mime == ZIP:
+        f.seek(0)
+        try:
+            with zipfile.ZipFile(f) as zf:
+                mime = _ooxml_from_names(zf.namelist()) or ZIP
+        except zipfile.BadZipFile:
+            mime = OCTET_STREAM
+    f.seek(0)
+    return mime
+
+
+def matches_extension(mime, name):
+    """
+    Sniff করা type আর file নামের extension মেলে কিনা। zip-এর ভিতরে OOXML থাকলেও
+    ".zip" নামে upload করা যায়।
+    """
+    ext = _extension(name)
+    if ext in EXTENSIONS.get(mime, set()):
+        return True
+    return ext == "zip" and mime in OOXML
+
+
+def plausible(mime, name):
+    """
+    শুধু শুরুর কিছু byte দেখে (upload stream চলাকালীন) — extension এর সাথে মেলে,
+    অথবা zip কিন্তু ভিতরের word/ ppt/ xl/ entry এখনো আসেনি। পুরো ফাইল হাতে
+    এলে ``sniff_file`` দিয়ে নিশ্চিত হতে হবে।
+    """
+    if matches_extension(mime, name):
+        return True
+    return mime == ZIP and _extension(name) in {"docx", "pptx", "xlsx"}
+
@@ -1,9 +1,20 @@
 # materials/forms.py
 from django import forms
-from .models import Material, Comment, Category
+from . import filetypes
+from .lookups import CachedModelChoiceField
+from .models import Material, Comment, Category, Department, SemesterYear, University
+
+# upload form-এ শুধু এই category গুলো
+UPLOAD_CATEGORY_SLUGS = ("pdf", "docx", "pptx")
 
 
 class MaterialForm(forms.ModelForm):
+    # ✅ choice গুলো lookup cache থেকে (materials/lookups.py) — render/submit-এ query নেই
+    university = CachedModelChoiceField(University, required=False)
+    category = CachedModelChoiceField(Category, only=lambda c: c.slug in UPLOAD_CATEGORY_SLUGS)
+    department = CachedModelChoiceField(Department)
+    semester = CachedModelChoiceField(SemesterYear)
+
     class Meta:
         model = Material
         fields = [
@@ -23,9 +34,7 @@ class MaterialForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # ✅ শুধু pdf / docx / pptx দেখাবে
-        allowed_slugs = ["pdf", "docx", "pptx"]
-        self.fields["category"].queryset = Category.objects.filter(slug__in=allowed_slugs).order_by("name")
+        # ✅ শুধু pdf / docx / pptx দেখাবে (UPLOAD_CATEGORY_SLUGS, field-এর only=)
         self.fields["category"].empty_label = "----------"  # চাইলে রাখো
 
         # Optional: nice labels
@@ -36,6 +45,15 @@ class MaterialForm(forms.ModelForm):
         self.fields["semester"].label = "Semester/Year"
         self.fields["file"].label = "Upload file"
 
+    def clean_file(self):
+        f = self.cleaned_data.get("file")
+        if f and hasattr(f, "seek"):
+            # ✅ নাম না, ভিতরের byte দেখে type (zip হলে central directory পর্যন্ত)
+            mime = filetypes.sniff_file(f, f.name)
+            if not filetypes.matches_extension(mime, f.name):
+                raise forms.ValidationError("File content does not match its extension.")
+        return f
+
 
 # ⬇️ নতুন CommentForm (ব্রাউজ পেজে কমেন্ট পোস্ট করার জন্য)
 class CommentForm(forms.ModelForm):
@@ -0,0 +1,106 @@
+# materials/fragments.py
+"""
+Material card fragment cache (browse page)।
+
+প্রতিটা card-এর rendered HTML cache-এ থাকে, key = material id + version stamp
+(+ viewer logged in কিনা)। Material / Upvote / Downvote / Comment বদলালে signal
+থেকে ``bump()`` নতুন version বসায় — পুরোনো HTML আর কখনো পড়া হয় না, TTL-এ
+নিজে থেকেই মুছে যায়। Card-এ category/department/semester-এর নাম আর
+uploader/commenter-এর username-ও থাকে: lookup table বদলালে ``bump_all()``,
+user rename হলে তার material/comment-এর card ``bump()`` (materials/signals.py)।
+সময় absolute date হিসেবে — "x minutes ago" cache-এ পুরোনো হয়ে যেত।
+
+Card-এ user-ভিত্তিক কিছু নেই: comment-এর delete button সবার জন্য render হয়ে
+লুকানো থাকে, ``_comments_js.html`` এর CSS শুধু owner/staff-এর জন্য দেখায়।
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .comments import attach_comment_trees
+
+CARD_TIMEOUT = 60 * 60
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(material_id):
+    return f"materials:card-version:{material_id}"
+
+
+# সব card-এর একটা version — lookup নাম (category/department/…) বদলালে সব card বাতিল
+GLOBAL_VERSION_KEY = "materials:card-version:all"
+
+
+def _card_key(material_id, version, authenticated):
+    return f"materials:card:{material_id}:{version}:{int(authenticated)}"
+
+
+def bump(*material_ids, using="default"):
+    """Commit হওয়ার পরে এই material গুলোর card version বদলে দেয়।"""
+    ids = {pk for pk in material_ids if pk}
+    if not ids:
+        return
+
+    def _bump():
+        version = time.time_ns()
+        cache.set_many({_version_key(pk): version for pk in ids}, VERSION_TIMEOUT)
+
+    transaction.on_commit(_bump, using=using)
+
+
+def bump_all(using="default"):
+    """Commit হওয়ার পরে সব card বাতিল (lookup table-এর নাম card-এ থাকে)।"""
+    transaction.on_commit(
+        lambda: cache.set(GLOBAL_VERSION_KEY, time.time_ns(), VERSION_TIMEOUT), using=using
+    )
+
+
+def versions(material_ids):
+    """
+    {material_id: "global.own" version}; যেগুলোর version নেই সেগুলোর নতুন
+    বসিয়ে দেয়। Global version-ও একই get_many-তে।
+    """
+    keys = {pk: _version_key(pk) for pk in material_ids}
+    found = cache.get_many([GLOBAL_VERSION_KEY, *keys.values()])
+    missing = {}
+    if GLOBAL_VERSION_KEY not in found:
+        found[GLOBAL_VERSION_KEY] = missing[GLOBAL_VERSION_KEY] = time.time_ns()
+    result = {}
+    for pk, key in keys.items():
+        if key not in found:
+            found[key] = missing[key] = time.time_ns()
+        result[pk] = f"{found[GLOBAL_VERSION_KEY]}.{found[key]}"
+    if missing:
+        cache.set_many(missing, VERSION_TIMEOUT)
+    return result
+
+
+def render_cards(request, materials):
+    """
+    প্রতিটা material-এ ``card_html`` বসায়। Cache-এ না থাকা card গুলোর জন্যই
+    শুধু comment tree লোড করে render করি।
+    """
+    materials = list(materials)
+    authenticated = request.user.is_authenticated
+    stamp = versions([m.pk for m in materials])
+    keys = {m.pk: _card_key(m.pk, stamp[m.pk], authenticated) for m in materials}
+    cached = cache.get_many(keys.values())
+
+    missing = [m for m in materials if keys[m.pk] not in cached]
+    attach_comment_trees(missing)
+
+    fresh = {}
+    for m in missing:
+        fresh[keys[m.pk]] = render_to_string(
+            "materials/_card.html", {"m": m}, request=request
+        )
+    if fresh:
+        cache.set_many(fresh, CARD_TIMEOUT)
+
+    html = {**cached, **fresh}
+    for m in materials:
+        m.card_html = mark_safe(html[keys[m.pk]])
+    return materials
@@ -0,0 +1,295 @@
+# materials/importer.py
+"""
+পুরো university একবারে onboard — হাজারো প্রশ্নপত্র, একটা directory আর একটা
+manifest (CSV বা JSON) থেকে:
+
+    file,title,description,category,department,semester,university,uploader
+    cse/2023/dsa-final.pdf,DSA Final 2023,,Question Papers,CSE,3rd Semester,BUET,
+
+  * Lookup (Category/Department/SemesterYear/University/User): শুরুতে একবার
+    সব row memory-তে (``LookupCache``), নতুন নাম হলে তখনই তৈরি — প্রতি ফাইলে
+    আলাদা query না।
+  * ফাইল: process pool-এ hash + magic-byte check + ``blobs/..`` এ copy
+    (``copy_file``) — ORM/DB ছোঁয় না, storage/filetypes-এর pure function।
+  * Row: batch করে ``bulk_create``। bulk_create signal চালায় না, তাই signal
+    যা করত (hot_score, search index, blob ref_count, university count,
+    processing job) এখানে batch-এর একই transaction-এ, batch প্রতি একবার।
+  * Resume: commit হওয়া batch-এর file path state file-এ (``<manifest>.imported``)
+    লেখা হয়; আবার চালালে সেগুলো বাদ। Commit আর state লেখার মাঝে crash হলে
+    (file, title) দিয়ে DB-তে মিলিয়ে duplicate বাদ দেয়। Fail হওয়া row state-এ
+    যায় না — ফাইল ঠিক করে আবার চালালে শুধু সেগুলোই আবার চেষ্টা হয়।
+"""
+import csv
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from studyvault import pagecache
+
+from . import blobs, filetypes, leaderboard, pagination, ranking, search
+from .models import (
+    ALLOWED_EXTENSIONS, MAX_UPLOAD_SIZE, Category, Department, Material, ProcessingJob,
+    SemesterYear, University, file_extension,
+)
+from .storage import blob_name, blob_storage
+
+FIELDS = ("file", "title", "description", "category", "department", "semester",
+          "university", "uploader")
+REQUIRED = ("file", "category", "department", "semester")
+READ_SIZE = 1024 * 1024
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def read_manifest(path):
+    """CSV (header সহ) বা JSON (list, অথবা {"materials": [...]}) -> list of dict।"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            rows = data.get("materials", []) if isinstance(data, dict) else data
+        else:
+            rows = list(csv.DictReader(f))
+    cleaned = []
+    for n, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ManifestError(f"Row {n}: expected an object.")
+        row = {k: str(row.get(k) or "").strip() for k in FIELDS}
+        missing = [k for k in REQUIRED if not row[k]]
+        if missing:
+            raise ManifestError(f"Row {n}: missing {', '.join(missing)}.")
+        row["file"] = os.path.normpath(row["file"]).replace(os.sep, "/")
+        if os.path.isabs(row["file"]) or row["file"].startswith("../"):
+            raise ManifestError(f"Row {n}: file must be relative to the import directory.")
+        cleaned.append(row)
+    return cleaned
+
+
+class LookupCache:
+    """
+    name (case-insensitive) বা slug -> pk। প্রথম ``get``-এ table-এর সব row একটা
+    query-তে; অচেনা নাম হলে ``create=True`` তে নতুন row (model-এর save() slug বানায়)।
+    """
+
+    def __init__(self, model, fields=("name", "slug"), create=True):
+        self.model = model
+        self.fields = fields
+        self.create = create
+        self._ids = None
+
+    def _load(self):
+        self._ids = {}
+        for row in self.model.objects.values("pk", *self.fields):
+            for field in self.fields:
+                if row[field]:
+                    self._ids.setdefault(row[field].casefold(), row["pk"])
+
+    def get(self, name):
+        if not name:
+            return None
+        if self._ids is None:
+            self._load()
+        key = name.casefold()
+        if key not in self._ids:
+            if not self.create:
+                raise KeyError(name)
+            obj = self.model(**{self.fields[0]: name})
+            obj.save()
+            self._ids[key] = obj.pk
+        return self._ids[key]
+
+
+# ---------------------------------------------------------------- files
+
+def copy_file(source, storage_root, max_size=MAX_UPLOAD_SIZE, allowed=tuple(ALLOWED_EXTENSIONS)):
+    """
+    Process pool worker — DB ছোঁয় না, শুধু ফাইল। সফল হলে
+    {"name", "sha256", "size", "mime"}, নাহলে {"error"}।
+    """
+    try:
+        size = os.path.getsize(source)
+        if file_extension(source) not in allowed:
+            return {"error": "extension not allowed"}
+        if size > max_size:
+            return {"error": f"larger than {max_size // (1024 * 1024)} MB"}
+        with open(source, "rb") as f:
+            mime = filetypes.sniff_file(f, source)
+            if not filetypes.matches_extension(mime, source):
+                return {"error": "content does not match extension"}
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(READ_SIZE), b""):
+                digest.update(chunk)
+
+        name = blob_name(digest.hexdigest(), source)
+        target = os.path.join(storage_root, *name.split("/"))
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # pid-এর আলাদা temp নাম -> rename: একই ফাইল দুই worker একসাথে লিখলেও অর্ধেক ফাইল না
+            part = f"{target}.{os.getpid()}.part"
+            with open(source, "rb") as src, open(part, "wb") as dst:
+                for chunk in iter(lambda: src.read(READ_SIZE), b""):
+                    dst.write(chunk)
+            os.replace(part, target)
+        return {"name": name, "sha256": digest.hexdigest(), "size": size, "mime": mime}
+    except OSError as exc:
+        return {"error": str(exc)}
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------------------------------------------------------------- import
+
+class Importer:
+    def __init__(self, root, uploader=None, batch_size=500, workers=None, state_path=None,
+                 log=None):
+        """``workers=0`` -> pool ছাড়া এই process-এই copy (test / ছোট import)।"""
+        self.root = root
+        self.default_uploader = uploader
+        self.batch_size = batch_size
+        self.workers = workers
+        self.state_path = state_path
+        self.log = log or (lambda msg: None)
+        self.lookups = {
+            "category": LookupCache(Category),
+            "department": LookupCache(Department),
+            "semester": LookupCache(SemesterYear),
+            "university": LookupCache(University),
+            "uploader": LookupCache(get_user_model(), fields=("username",), create=False),
+        }
+        self.errors = []
+
+    # ------------------------------------------------------------ state
+
+    def done_keys(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return set()
+        with open(self.state_path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    def mark_done(self, keys):
+        if not self.state_path:
+            return
+        with open(self.state_path, "a", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in keys)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ------------------------------------------------------------ rows
+
+    def build(self, row, copied):
+        if "error" in copied:
+            raise ManifestError(copied["error"])
+        try:
+            uploader_id = self.lookups["uploader"].get(row["uploader"] or self.default_uploader)
+        except KeyError:
+            raise ManifestError(f"unknown uploader {row['uploader'] or self.default_uploader!r}")
+        if uploader_id is None:
+            raise ManifestError("no uploader (column empty and no --uploader)")
+
+        filename = os.path.basename(row["file"])
+        return Material(
+            uploader_id=uploader_id,
+            title=row["title"] or os.path.splitext(filename)[0],
+            description=row["description"],
+            category_id=self.lookups["category"].get(row["category"]),
+            department_id=self.lookups["department"].get(row["department"]),
+            semester_id=self.lookups["semester"].get(row["semester"]),
+            university_id=self.lookups["university"].get(row["university"]),
+            file=copied["name"],
+            original_filename=filename,
+            file_ext=file_extension(filename),
+            sha256=copied["sha256"],
+            mime_type=copied["mime"],
+        )
+
+    def already_imported(self, materials):
+        """(file, title) DB-তে আগেই আছে — state file লেখার আগে crash হয়েছিল।"""
+        existing = set(
+            Material.objects.filter(
+                file__in={m.file.name for m in materials},
+                title__in={m.title for m in materials},
+            ).values_list("file", "title")
+        )
+        return {(m.file.name, m.title) for m in materials} & existing
+
+    def sources(self, pairs):
+        return [os.path.join(self.root, *row["file"].split("/")) for row, _ in pairs]
+
+    def save_batch(self, pairs):
+        """pairs: [(row, Material)] — সব কিছু একটা transaction-এ।"""
+        materials = [m for _, m in pairs]
+        with transaction.atomic():
+            skip = self.already_imported(materials)
+            materials = [m for m in materials if (m.file.name, m.title) not in skip]
+            Material.objects.bulk_create(materials)
+            # pre_save signal (initial_hot_score) bulk_create-এ চলে না। created_at
+            # (auto_now_add) insert-এর সময় প্রতিটা row-এ বসে — তারপর score
+            for m in materials:
+                m.top_score = 0.0
+                m.hot_score = ranking.hot_score(0.0, m.created_at)
+            Material.objects.bulk_update(materials, ["hot_score", "top_score"])
+
+            # signal গুলোর কাজ, batch ধরে
+            search.get_backend().index(materials)
+            sources = {m.file.name: source for (row, m), source in zip(pairs, self.sources(pairs))}
+            for name, n in Counter(m.file.name for m in materials).items():
+                # copy_file-এর পরে collector ফাইলটা মুছে থাকলে source থেকে আবার
+                blobs.retain(name, count=n, source=sources[name])
+            for university_id, n in Counter(m.university_id for m in materials).items():
+                leaderboard.adjust(university_id, n)
+            # thumbnail/page count/text — worker পরে (materials/processing.py)
+            ProcessingJob.objects.bulk_create([ProcessingJob(material=m) for m in materials])
+            pagecache.purge(pagecache.page_tag("browse"), pagecache.page_tag("home"))
+            pagination.invalidate_counts()
+        self.mark_done(row["file"] for row, _ in pairs)
+        return len(materials), len(skip)
+
+    def run(self, rows):
+        done = self.done_keys()
+        todo = [row for row in rows if row["file"] not in done]
+        total = len(rows)
+        self.log(f"{total} rows in manifest, {total - len(todo)} already imported.")
+
+        created = skipped = 0
+        started = time.monotonic()
+        storage_root = blob_storage.location
+        # spawn/forkserver হলে child নতুন করে এই module (আর models) import করে
+        pool = (ProcessPoolExecutor(self.workers, initializer=django.setup)
+                if self.workers != 0 else None)
+        try:
+            for batch in _chunks(todo, self.batch_size):
+                sources = [os.path.join(self.root, *row["file"].split("/")) for row in batch]
+                roots = [storage_root] * len(sources)
+                copied = (pool.map(copy_file, sources, roots, chunksize=8) if pool
+                          else map(copy_file, sources, roots))
+
+                pairs = []
+                for row, result in zip(batch, copied):
+                    try:
+                        pairs.append((row, self.build(row, result)))
+                    except ManifestError as exc:
+                        self.errors.append((row["file"], str(exc)))
+                if pairs:
+                    n, dup = self.save_batch(pairs)
+                    created += n
+                    skipped += dup
+
+                processed = total - len(todo) + created + skipped + len(self.errors)
+                rate = (created + skipped) / max(time.monotonic() - started, 1e-9)
+                self.log(f"  {processed}/{total} rows, {created} created, "
+                         f"{len(self.errors)} failed ({rate:.0f} rows/s)")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return {"created": created, "duplicates": skipped, "failed": len(self.errors)}
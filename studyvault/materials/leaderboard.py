@@ -0,0 +1,65 @@
+# materials/leaderboard.py
+"""
+Home page-এর "top universities" leaderboard।
+
+``University.material_count`` column টা incrementally আপডেট হয় (materials/signals.py),
+তাই ranking মানে শুধু ``university_leaderboard_idx`` index ধরে top N পড়া। তার উপর
+ranking টা cache-এ থাকে; count বদলালেই ``invalidate()`` (commit-এর পরে)।
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Material, University
+
+CACHE_KEY = "materials:top-universities"
+CACHE_TIMEOUT = 60 * 60
+TOP_N = 12
+
+
+def top_universities(limit=TOP_N):
+    """Document count অনুযায়ী top university (tie -> name)। Cache থেকে।"""
+    ranking = cache.get(CACHE_KEY)
+    if ranking is None:
+        ranking = list(
+            University.objects
+            .only("id", "name", "slug", "material_count")
+            .order_by("-material_count", "name")[:TOP_N]
+        )
+        cache.set(CACHE_KEY, ranking, CACHE_TIMEOUT)
+    return ranking[:limit]
+
+
+def invalidate():
+    cache.delete(CACHE_KEY)
+
+
+def adjust(university_id, delta, using="default"):
+    """একটা university-র material_count F() দিয়ে +/-; commit হলে cache invalidate।"""
+    if not university_id or not delta:
+        return
+    University.objects.using(using).filter(pk=university_id).update(
+        material_count=F("material_count") + delta
+    )
+    transaction.on_commit(invalidate, using=using)
+
+
+def reconcile():
+    """Drift হলে সব university-র material_count আবার গুনে বসায়। কয়টা বদলালো return করে।"""
+    counts = (
+        Material.objects.filter(university=OuterRef("pk"))
+        .order_by()
+        .values("university")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    actual = Coalesce(Subquery(counts), Value(0))
+    fixed = (
+        University.objects.annotate(actual=actual)
+        .exclude(material_count=F("actual"))
+        .update(material_count=actual)
+    )
+    if fixed:
+        invalidate()
+    return fixed
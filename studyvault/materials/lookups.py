@@ -0,0 +1,205 @@
+# materials/lookups.py
+"""
+ছোট lookup table (Category, Department, SemesterYear, University) memory থেকে —
+এগুলো মাসে একবার বদলায়, অথচ browse / upload form প্রতি request-এ query করত।
+
+দুই স্তর:
+  1. Process-local LRU — ``LOCAL_TTL`` সেকেন্ড পর্যন্ত কোনো I/O নেই।
+  2. Shared cache (settings CACHES) — প্রতিটা table-এর একটা version stamp আর
+     সেই version-এর row list। TTL শেষে local entry শুধু version টা মিলিয়ে নেয়;
+     বদলে থাকলে নতুন list shared cache থেকে (না থাকলে একটাই DB query)।
+
+Save/delete signal (materials/signals.py) ``invalidate()`` করে: version বদলায়
+আর এই process-এর local entry বাদ — অন্য process গুলো সর্বোচ্চ ``LOCAL_TTL``
+পরে দেখে। Commit-এর পরে আরেকবার বদলাই, যাতে commit-এর আগেই কেউ পুরোনো row
+নতুন version-এ cache করে ফেললেও টিকে না থাকে।
+
+শুধু id/name/slug রাখি — University.material_count এর মত F() দিয়ে বাড়া
+column এখানে পুরোনো হয়ে যেত। Return করা object copy, তাই view নিজের মত
+attribute বসাতে পারে (``cat.facet_count``)।
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django import forms
+from django.core.cache import cache
+from django.db import transaction
+from django.forms.models import ModelChoiceIterator
+
+from .models import Category, Department, SemesterYear, University
+
+MODELS = (Category, Department, SemesterYear, University)
+FIELDS = ("id", "name", "slug")
+
+LOCAL_TTL = 5             # seconds — অন্য process-এর invalidation এতক্ষণ পরে দেখা যায়
+LOCAL_MAX_ENTRIES = 32
+SHARED_TIMEOUT = 24 * 60 * 60
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _version_key(model):
+    return f"lookups:version:{_label(model)}"
+
+
+def _rows_key(model, version):
+    return f"lookups:rows:{_label(model)}:{version}"
+
+
+class _Table:
+    __slots__ = ("version", "checked_at", "rows", "by_pk", "by_slug")
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.rows = rows
+        self.by_pk = {obj.pk: obj for obj in rows}
+        self.by_slug = {obj.slug: obj for obj in rows if obj.slug}
+
+
+class LocalLRU:
+    def __init__(self, max_entries=LOCAL_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local = LocalLRU()
+
+
+def _shared_version(model):
+    version = cache.get(_version_key(model))
+    if version is None:
+        version = time.time_ns()
+        # add: একসাথে দুই process এলে একজনের version-ই থাকে
+        if not cache.add(_version_key(model), version, SHARED_TIMEOUT):
+            version = cache.get(_version_key(model), version)
+    return version
+
+
+def _table(model):
+    label = _label(model)
+    entry = _local.get(label)
+    if entry is not None and time.monotonic() - entry.checked_at < LOCAL_TTL:
+        return entry
+
+    version = _shared_version(model)
+    if entry is not None and entry.version == version:
+        entry.checked_at = time.monotonic()
+        return entry
+
+    rows = cache.get(_rows_key(model, version))
+    if rows is None:
+        rows = list(model.objects.only(*FIELDS).order_by("name"))
+        cache.set(_rows_key(model, version), rows, SHARED_TIMEOUT)
+    entry = _Table(version, rows)
+    _local.set(label, entry)
+    return entry
+
+
+# ---------------------------------------------------------------- API
+
+def objects(model):
+    """পুরো table (name অনুযায়ী), copy।"""
+    return [copy.copy(obj) for obj in _table(model).rows]
+
+
+def get(model, pk):
+    try:
+        obj = _table(model).by_pk.get(int(pk))
+    except (TypeError, ValueError):
+        return None
+    return copy.copy(obj) if obj is not None else None
+
+
+def by_slug(model, slug):
+    obj = _table(model).by_slug.get(slug)
+    return copy.copy(obj) if obj is not None else None
+
+
+def invalidate(model, using="default"):
+    def _bump():
+        cache.set(_version_key(model), time.time_ns(), SHARED_TIMEOUT)
+        _local.pop(_label(model))
+
+    _bump()
+    transaction.on_commit(_bump, using=using)
+
+
+def clear():
+    """এই process-এর local LRU খালি (test / shell)।"""
+    _local.clear()
+
+
+# ---------------------------------------------------------------- forms
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.cached_objects():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.cached_objects()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.cached_objects())
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField, কিন্তু choice render আর submit validate দুটোই lookup cache
+    থেকে — form render/submit-এ এই table-এর কোনো query নেই। ``only``: কোন row
+    গুলো choice হবে (যেমন শুধু pdf/docx/pptx category)।
+    """
+    iterator = CachedChoiceIterator
+
+    def __init__(self, model, *, only=None, **kwargs):
+        self.model = model
+        self.only = only
+        super().__init__(queryset=model.objects.all(), **kwargs)
+
+    def cached_objects(self):
+        rows = objects(self.model)
+        return [obj for obj in rows if self.only(obj)] if self.only else rows
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.model):
+            value = value.pk
+        obj = get(self.model, value)
+        if obj is None or (self.only and not self.only(obj)):
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        return obj
@@ -0,0 +1,87 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from materials import blobs
+from materials.models import Material
+from materials.storage import blob_name, blob_storage, hash_file, is_blob
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing material files into content-addressed blob storage, "
+        "collapsing identical files into one blob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report what would be deduplicated without touching files or rows.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        qs = (
+            Material.objects.exclude(file="")
+            .exclude(file__startswith="blobs/")
+            .only("id", "file", "original_filename")
+            .order_by("pk")
+        )
+
+        moved = duplicates = missing = saved = 0
+        seen = set()  # dry-run-এ কোন blob "বানানো হয়ে গেছে"
+        for material in qs.iterator(chunk_size=500):
+            old = material.file.name
+            if not blob_storage.exists(old):
+                missing += 1
+                self.stderr.write(f"  material {material.pk}: {old} not found, skipped")
+                continue
+
+            with blob_storage.open(old) as f:
+                target = blob_name(hash_file(f), old)
+            size = blob_storage.size(old)
+
+            if target in seen or blob_storage.exists(target):
+                duplicates += 1
+                saved += size
+            else:
+                moved += 1
+                seen.add(target)
+            if dry_run:
+                continue
+
+            if not blob_storage.exists(target):
+                # আগে hard link (একই disk হলে copy লাগে না), DB আপডেটের পরে পুরোনো নাম মুছি —
+                # মাঝপথে থামলেও কোনো Material ভাঙা ফাইল দেখায় না
+                dest = blob_storage.path(target)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                try:
+                    os.link(blob_storage.path(old), dest)
+                except OSError:
+                    # অন্য disk — storage নিজেই hash করে একই target-এ লিখবে
+                    with blob_storage.open(old) as f:
+                        blob_storage.save(old, f)
+
+            with transaction.atomic():
+                updated = Material.objects.filter(pk=material.pk, file=old).update(
+                    file=target,
+                    original_filename=material.original_filename or os.path.basename(old),
+                )
+                # .update() signal চালায় না, তাই নিজেই গুনি
+                if updated:
+                    blobs.retain(target)
+
+            if not Material.objects.filter(file=old).exists():
+                blob_storage.delete(old)
+
+        if not dry_run:
+            fixed = blobs.reconcile()
+            if fixed:
+                self.stdout.write(f"  fixed {fixed} blob reference counts")
+
+        verb = "Would move" if dry_run else "Moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {moved} files into blob storage, {duplicates} duplicates "
+            f"({saved / (1024 * 1024):.1f} MB freed), {missing} missing."
+        ))
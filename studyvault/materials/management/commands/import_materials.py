@@ -0,0 +1,49 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from materials import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import materials from a directory tree and a CSV/JSON manifest "
+        "(file,title,description,category,department,semester,university,uploader). "
+        "Lookup rows are created as needed, files are copied by a process pool and rows "
+        "are inserted in batches. Re-running resumes after the last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("manifest", help="CSV or JSON manifest.")
+        parser.add_argument("--root", help="Directory the manifest's file paths are relative to "
+                                           "(default: the manifest's directory).")
+        parser.add_argument("--uploader", help="Username for rows without an uploader column.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="File copy processes (default: CPU count; 0 = no pool).")
+        parser.add_argument("--state", help="Resume state file (default: <manifest>.imported).")
+
+    def handle(self, *args, **options):
+        manifest = options["manifest"]
+        try:
+            rows = importer.read_manifest(manifest)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read manifest: {exc}")
+
+        job = importer.Importer(
+            root=options["root"] or os.path.dirname(os.path.abspath(manifest)),
+            uploader=options["uploader"],
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            state_path=options["state"] or f"{manifest}.imported",
+            log=self.stdout.write,
+        )
+        summary = job.run(rows)
+
+        for path, error in job.errors:
+            self.stderr.write(f"  {path}: {error}")
+        style = self.style.SUCCESS if not job.errors else self.style.WARNING
+        self.stdout.write(style(
+            f"Imported {summary['created']} materials "
+            f"({summary['duplicates']} already present, {summary['failed']} failed)."
+        ))
@@ -0,0 +1,60 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from materials import ranking
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute hot/top ranking scores from the stored counters. Scores are kept up "
+        "to date incrementally; run this after changing ranking weights, and with "
+        "--every as a long-running repair job for float drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--every", type=float, default=0,
+            help="Keep running and recompute every N seconds (default: once and exit).",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        if options["every"] <= 0:
+            self._recompute(options)
+            return
+
+        # SIGTERM/Ctrl-C: চলতি pass শেষ করে বের হই
+        previous = {sig: signal.signal(sig, self._stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            self._loop(options)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _recompute(self, options):
+        fixed = ranking.recompute(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated ranking scores on {fixed} materials."))
+
+    def _loop(self, options):
+        while True:
+            self._recompute(options)
+            if self._stopping:
+                break
+            self._sleep(options["every"])
+            if self._stopping:
+                break
+            # ঘণ্টাখানেক ঘুমের পর connection টা হয়তো আর নেই
+            close_old_connections()
+
+    def _sleep(self, seconds):
+        # ছোট ছোট ঘুম — signal এলে দেরি না করে থামি
+        deadline = time.monotonic() + seconds
+        while not self._stopping and time.monotonic() < deadline:
+            time.sleep(min(1.0, deadline - time.monotonic()))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from materials import search
+from materials.models import Material
+
+
+class Command(BaseCommand):
+    help = "Rebuild the material full-text search index from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        batch_size = options["batch_size"]
+        backend = search.get_backend(using)
+
+        qs = (
+            Material.objects.using(using)
+            .only("id", "title", "description", "extracted_text")
+            .order_by("pk")
+        )
+
+        total = 0
+        with transaction.atomic(using=using):
+            backend.clear()
+            batch = []
+            for m in qs.iterator(chunk_size=batch_size):
+                batch.append(m)
+                if len(batch) >= batch_size:
+                    backend.index(batch)
+                    total += len(batch)
+                    batch = []
+                    self.stdout.write(f"  indexed {total} materials…")
+            backend.index(batch)
+            total += len(batch)
+
+        backend.optimize()
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt: {total} materials."))
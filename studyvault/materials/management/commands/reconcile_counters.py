@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from materials import blobs, counters, leaderboard
+
+
+class Command(BaseCommand):
+    help = (
+        "Repair drift in Material upvote/downvote/comment/download counters (and the "
+        "ranking scores built on them), University material counts and blob reference counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        fixed = counters.reconcile(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Reconciled counters on {fixed} materials."))
+        fixed = leaderboard.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled material_count on {fixed} universities."))
+        fixed = blobs.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled ref_count on {fixed} blobs."))
@@ -0,0 +1,47 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from materials import processing
+
+
+class Command(BaseCommand):
+    help = "Process uploaded materials (checksum, MIME type, thumbnail, text) from the job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=2.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        # SIGTERM/Ctrl-C: চলতি job শেষ করে বের হই
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        processed = 0
+        while not self._stopping:
+            close_old_connections()
+            job = processing.claim()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            ok = processing.run_job(job)
+            processed += 1
+            status = "done" if ok else f"failed (attempt {job.attempts})"
+            self.stdout.write(f"  material {job.material_id}: {status}")
+
+        self.stdout.write(self.style.SUCCESS(f"Worker stopped after {processed} jobs."))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+# materials/search.py এর normalize() এই migration-এর সময় যেমন ছিল — live module
+# import করি না, পরে tokenizer বদলালে বা module সরালে পুরোনো migration ভাঙবে না
+_TOKEN_RE = re.compile(r"[\w\u0980-\u09FF]+")
+_JOINERS = dict.fromkeys(map(ord, "\u200c\u200d"), None)
+_BANGLA_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+
+
+def _normalize(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = text.translate(_JOINERS).translate(_BANGLA_DIGITS)
+    return " ".join(t for t in _TOKEN_RE.findall(text) if t.strip("_"))
+
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS materials_search "
+    "USING fts5(title, description, tokenize = 'ascii')"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS materials_search ("
+    " material_id bigint PRIMARY KEY REFERENCES materials_material (id) ON DELETE CASCADE,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS materials_search_document_gin "
+    "ON materials_search USING gin (document)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif connection.vendor == "postgresql":
+        for sql in POSTGRES_CREATE:
+            schema_editor.execute(sql)
+    else:
+        return
+
+    # আগের material গুলো index-এ তুলে দিই — live backend না, এই migration-এর
+    # সময়কার (title, description) table layout অনুযায়ী
+    Material = apps.get_model("materials", "Material")
+    if connection.vendor == "sqlite":
+        sql = "INSERT INTO materials_search (rowid, title, description) VALUES (%s, %s, %s)"
+    else:
+        sql = (
+            "INSERT INTO materials_search (material_id, document) VALUES (%s, "
+            "setweight(to_tsvector('simple', %s), 'A') || "
+            "setweight(to_tsvector('simple', %s), 'B'))"
+        )
+    rows = (
+        (m.pk, _normalize(m.title), _normalize(m.description))
+        for m in Material.objects.using(connection.alias).only("id", "title", "description").iterator(chunk_size=1000)
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, list(rows))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS materials_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("materials", "0011_limit_categories"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
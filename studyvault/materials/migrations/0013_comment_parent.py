@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Comment.parent (threaded reply) model-এ আগে থেকেই ছিল, migration ছিল না —
+    # comment tree (materials/comments.py) এর schema, counter migration থেকে আলাদা
+
+    dependencies = [
+        ('materials', '0013_material_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='materials.comment'),
+        ),
+    ]
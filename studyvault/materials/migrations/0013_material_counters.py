@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Material = apps.get_model("materials", "Material")
+    for field, model_name in (
+        ("upvote_count", "Upvote"),
+        ("downvote_count", "Downvote"),
+        ("comment_count", "Comment"),
+    ):
+        model = apps.get_model("materials", model_name)
+        counts = (
+            model.objects.filter(material=OuterRef("pk"))
+            .order_by()
+            .values("material")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        Material.objects.update(**{field: Coalesce(Subquery(counts), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0012_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='downvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='upvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0013_comment_parent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='material',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['-created_at', '-id'], name='material_created_id_idx'),
+        ),
+    ]
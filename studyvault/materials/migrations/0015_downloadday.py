@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0014_material_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DownloadDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='download_days', to='materials.material')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day'], name='materials_d_day_34ba70_idx')],
+                'constraints': [models.UniqueConstraint(fields=('material', 'day'), name='unique_download_day_per_material')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_material_count(apps, schema_editor):
+    University = apps.get_model("materials", "University")
+    Material = apps.get_model("materials", "Material")
+    counts = (
+        Material.objects.filter(university=OuterRef("pk"))
+        .order_by()
+        .values("university")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    University.objects.update(material_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0015_downloadday'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='university',
+            name='material_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='university',
+            index=models.Index(fields=['-material_count', 'name'], name='university_leaderboard_idx'),
+        ),
+        migrations.RunPython(backfill_material_count, migrations.RunPython.noop),
+    ]
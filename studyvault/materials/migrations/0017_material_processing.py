@@ -0,0 +1,129 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:25
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# materials/search.py এর normalize() এই migration-এর সময় যেমন ছিল — live module
+# import করি না (0012_search_index এর মত)
+_TOKEN_RE = re.compile(r"[\w\u0980-\u09FF]+")
+_JOINERS = dict.fromkeys(map(ord, "\u200c\u200d"), None)
+_BANGLA_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+
+
+def _normalize(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = text.translate(_JOINERS).translate(_BANGLA_DIGITS)
+    return " ".join(t for t in _TOKEN_RE.findall(text) if t.strip("_"))
+
+
+def _recreate_sqlite_index(apps, schema_editor, columns):
+    """
+    FTS5 virtual table-এ ALTER TABLE ADD COLUMN হয় না, তাই নতুন করে বানাই।
+    Postgres-এ document শুধু একটা tsvector — table বদলাতে হয় না।
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS materials_search")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE materials_search "
+        f"USING fts5({', '.join(columns)}, tokenize = 'ascii')"
+    )
+    # extracted_text এখনো খালি, worker process করার পর content index হবে
+    Material = apps.get_model("materials", "Material")
+    rows = [
+        (m.pk, _normalize(m.title), _normalize(m.description))
+        + ("",) * (len(columns) - 2)
+        for m in Material.objects.using(connection.alias).only("id", "title", "description").iterator(chunk_size=1000)
+    ]
+    placeholders = ", ".join(["%s"] * (len(columns) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO materials_search (rowid, {', '.join(columns)}) VALUES ({placeholders})",
+            rows,
+        )
+
+
+def add_search_content_column(apps, schema_editor):
+    _recreate_sqlite_index(apps, schema_editor, ["title", "description", "content"])
+
+
+def drop_search_content_column(apps, schema_editor):
+    _recreate_sqlite_index(apps, schema_editor, ["title", "description"])
+
+
+def enqueue_existing(apps, schema_editor):
+    # পুরোনো material গুলোও একবার process হোক
+    Material = apps.get_model("materials", "Material")
+    ProcessingJob = apps.get_model("materials", "ProcessingJob")
+    ids = Material.objects.values_list("pk", flat=True).order_by("pk")
+    ProcessingJob.objects.bulk_create(
+        (ProcessingJob(material_id=pk) for pk in ids.iterator(chunk_size=1000)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0016_university_material_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='extracted_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='mime_type',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='thumbnails/%Y/%m/'),
+        ),
+        migrations.CreateModel(
+            name='ProcessingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='materials.material')),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='materials_p_status_50b535_idx')],
+            },
+        ),
+        migrations.RunPython(add_search_content_column, drop_search_content_column),
+        migrations.RunPython(enqueue_existing, migrations.RunPython.noop),
+    ]
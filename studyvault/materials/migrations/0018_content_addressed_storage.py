@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:30
+
+import os
+
+import django.core.validators
+import materials.models
+import materials.storage
+from django.db import migrations, models
+
+
+def backfill_original_filename(apps, schema_editor):
+    Material = apps.get_model("materials", "Material")
+    batch = []
+    for m in Material.objects.exclude(file="").only("id", "file").iterator(chunk_size=1000):
+        m.original_filename = os.path.basename(m.file.name)
+        batch.append(m)
+    Material.objects.bulk_update(batch, ["original_filename"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0017_material_processing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='original_filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='file',
+            field=materials.models.MaterialFileField(help_text='Allowed: pdf, doc(x), ppt(x), xls(x), zip. Max 50MB.', storage=materials.storage.material_storage, upload_to='materials/%Y/%m/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'ppt', 'pptx', 'xls', 'xlsx', 'zip']), materials.models.validate_file_size]),
+        ),
+        migrations.RunPython(backfill_original_filename, migrations.RunPython.noop),
+    ]
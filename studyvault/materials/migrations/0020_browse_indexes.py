@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:38
+
+import os
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_file_ext(apps, schema_editor):
+    Material = apps.get_model("materials", "Material")
+    batch = []
+    for m in Material.objects.exclude(file="").only("id", "file").iterator(chunk_size=1000):
+        m.file_ext = os.path.splitext(m.file.name)[1].lstrip(".").lower()[:10]
+        batch.append(m)
+    Material.objects.bulk_update(batch, ["file_ext"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0019_uploadsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='file_ext',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='material_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['department', '-created_at', '-id'], name='material_dept_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['department', 'semester', '-created_at', '-id'], name='material_dept_sem_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['semester', '-created_at', '-id'], name='material_sem_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['university', '-created_at', '-id'], name='material_uni_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['file_ext', '-created_at', '-id'], name='material_ext_created_idx'),
+        ),
+        migrations.RunPython(backfill_file_ext, migrations.RunPython.noop),
+        # composite index তৈরি হওয়ার পরে FK-র একক index বাদ
+        migrations.AlterField(
+            model_name='material',
+            name='category',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='materials', to='materials.category'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='department',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='materials', to='materials.department'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='semester',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='materials', to='materials.semesteryear'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='university',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='materials', to='materials.university'),
+        ),
+    ]
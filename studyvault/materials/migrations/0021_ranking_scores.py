@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+import math
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+# materials/ranking.py এর সাথে মিলিয়ে (migration-এ app code import করি না)
+WEIGHTS = {"upvote_count": 1.0, "downvote_count": -1.0, "comment_count": 0.5, "download_count": 0.1}
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DECAY_SECONDS = 24 * 60 * 60
+
+
+def backfill_scores(apps, schema_editor):
+    Material = apps.get_model("materials", "Material")
+    batch = []
+    for m in Material.objects.only("id", "created_at", *WEIGHTS).iterator(chunk_size=1000):
+        p = sum(w * getattr(m, field) for field, w in WEIGHTS.items())
+        log_term = math.copysign(math.log10(max(abs(p), 1.0)), p) if p else 0.0
+        m.top_score = p
+        m.hot_score = log_term + (m.created_at - EPOCH).total_seconds() / DECAY_SECONDS
+        batch.append(m)
+    Material.objects.bulk_update(batch, ["hot_score", "top_score"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0020_browse_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='top_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        # index বানানোর আগে ভরে দেই — নাহলে প্রতিটা row update-এ index-ও আপডেট
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['-hot_score', '-id'], name='material_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['-top_score', '-id'], name='material_top_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+def backfill_heartbeats(apps, schema_editor):
+    # চলতি job-এর heartbeat না থাকলে কখনো reclaim হত না — locked_at দিয়ে শুরু
+    ProcessingJob = apps.get_model("materials", "ProcessingJob")
+    ProcessingJob.objects.filter(status="running", heartbeat_at__isnull=True).update(
+        heartbeat_at=models.F("locked_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0021_ranking_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_heartbeats, migrations.RunPython.noop),
+    ]
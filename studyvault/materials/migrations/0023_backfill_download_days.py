@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_download_days(apps, schema_editor):
+    """
+    DownloadDay (0015) আসার আগের download শুধু Material.download_count-এ ছিল।
+    বাকিটা upload-এর দিনের একটা row হিসেবে তুলে দিই — এরপর দিনগুলোর যোগফলই
+    counter-এর আসল মান (counters.reconcile এটা ধরেই মেলায়)। পুরোনো দিন, তাই
+    সাম্প্রতিক trending বদলায় না।
+    """
+    Material = apps.get_model("materials", "Material")
+    DownloadDay = apps.get_model("materials", "DownloadDay")
+    recorded = (
+        DownloadDay.objects.filter(material=OuterRef("pk"))
+        .order_by()
+        .values("material")
+        .annotate(n=Sum("count"))
+        .values("n")
+    )
+    missing = (
+        Material.objects.annotate(recorded=Coalesce(Subquery(recorded), Value(0)))
+        .filter(download_count__gt=F("recorded"))
+        .values_list("pk", "created_at", "download_count", "recorded")
+    )
+    # আগে পুরো list — পড়ার মাঝে একই table-এ লিখছি
+    for pk, created_at, total, recorded_count in list(missing):
+        row, created = DownloadDay.objects.get_or_create(
+            material_id=pk, day=created_at.date(), defaults={"count": total - recorded_count}
+        )
+        if not created:
+            DownloadDay.objects.filter(pk=row.pk).update(count=F("count") + total - recorded_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0022_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_download_days, migrations.RunPython.noop),
+    ]
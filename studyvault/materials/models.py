@@ -1,10 +1,17 @@
 # materials/models.py
+import os
+import uuid
+
 from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
 from django.utils.text import slugify
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator
 
+from .storage import material_storage
+
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -73,10 +80,31 @@ class SemesterYear(TimeStampedModel):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+MAX_UPLOAD_MB = 50
+MAX_UPLOAD_SIZE = MAX_UPLOAD_MB * 1024 * 1024
+ALLOWED_EXTENSIONS = ["pdf", "doc", "docx", "ppt", "pptx", "xls", "xlsx", "zip"]
+
+
 def validate_file_size(f):
-    max_mb = 50
-    if f.size > max_mb * 1024 * 1024:
-        raise ValidationError(f"File too large. Max size is {max_mb} MB.")
+    if f.size > MAX_UPLOAD_SIZE:
+        raise ValidationError(f"File too large. Max size is {MAX_UPLOAD_MB} MB.")
+
+
+def file_extension(name):
+    """"Notes.PDF" -> "pdf" — browse-এর kind filter এই column দিয়ে চলে।"""
+    return os.path.splitext(name or "")[1].lstrip(".").lower()[:10]
+
+
+class MaterialFieldFile(FieldFile):
+    def save(self, name, content, save=True):
+        # নতুন upload: storage নাম বদলে hash করে দেবে, তাই আসল নাম আগেই রাখি
+        self.instance.original_filename = os.path.basename(name)
+        self.instance.file_ext = file_extension(name)
+        super().save(name, content, save)
+
+
+class MaterialFileField(models.FileField):
+    attr_class = MaterialFieldFile
 
 
 class Material(TimeStampedModel):
@@ -94,46 +122,113 @@ class Material(TimeStampedModel):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
 
+    # browse filter-এর চারটা FK-র আলাদা index নেই — Meta.indexes এর composite
+    # index গুলোর প্রথম column এরাই, FK lookup সেগুলো দিয়েই চলে
     university = models.ForeignKey(  # ✅ নতুন ফিল্ড
         "University",
         on_delete=models.PROTECT,
         related_name="materials",
-        null=True, blank=True
+        null=True, blank=True,
+        db_index=False,
     )
 
     category = models.ForeignKey(
-        Category, on_delete=models.PROTECT, related_name="materials"
+        Category, on_delete=models.PROTECT, related_name="materials", db_index=False
     )
     department = models.ForeignKey(
-        Department, on_delete=models.PROTECT, related_name="materials"
+        Department, on_delete=models.PROTECT, related_name="materials", db_index=False
     )
     semester = models.ForeignKey(
-        SemesterYear, on_delete=models.PROTECT, related_name="materials"
+        SemesterYear, on_delete=models.PROTECT, related_name="materials", db_index=False
     )
 
-    file = models.FileField(
+    # ✅ Content-addressed: disk-এ blobs/<sha256> নামে, একই ফাইল একবারই (materials/storage.py)
+    file = MaterialFileField(
         upload_to="materials/%Y/%m/",
+        storage=material_storage,
         validators=[
-            FileExtensionValidator(allowed_extensions=[
-                "pdf", "doc", "docx", "ppt", "pptx", "xls", "xlsx", "zip"
-            ]),
+            FileExtensionValidator(allowed_extensions=ALLOWED_EXTENSIONS),
             validate_file_size,
         ],
         help_text="Allowed: pdf, doc(x), ppt(x), xls(x), zip. Max 50MB."
     )
+    # Blob-এর নাম hash, তাই download-এর সময় দেওয়ার জন্য আসল নাম রাখি
+    original_filename = models.CharField(max_length=255, blank=True)
+    # ছোট হাতের extension ("pdf") — file__iendswith scan এর বদলে index
+    file_ext = models.CharField(max_length=10, blank=True)
 
     download_count = models.PositiveIntegerField(default=0)
 
+    # ✅ Denormalized counters — list page-এ প্রতি card-এ COUNT query লাগবে না।
+    # vote/comment path-এ F() দিয়ে আপডেট হয় (materials/counters.py),
+    # drift হলে: python manage.py reconcile_counters
+    upvote_count = models.PositiveIntegerField(default=0)
+    downvote_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    # ✅ Browse ?sort=hot / ?sort=top — counter বদলানোর একই UPDATE-এ আপডেট হয়
+    # (materials/ranking.py), তাই sort করতে কোনো aggregate লাগে না
+    hot_score = models.FloatField(default=0, editable=False)
+    top_score = models.FloatField(default=0, editable=False)
+
+    # ✅ Upload processing — background worker (materials/processing.py) ভরে দেয়
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    PROCESSING_STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    processing_status = models.CharField(
+        max_length=12, choices=PROCESSING_STATUS_CHOICES, default=STATUS_PENDING
+    )
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    mime_type = models.CharField(max_length=120, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.ImageField(upload_to="thumbnails/%Y/%m/", blank=True)
+    extracted_text = models.TextField(blank=True)
+
     # রেটিং/অ্যাপ্রুভাল পরে অ্যাড করব
     # average_rating = models.FloatField(default=0.0)
     # is_approved = models.BooleanField(default=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        # id tie-breaker: keyset pagination-এর cursor (created_at, id) unique রাখে
+        ordering = ["-created_at", "-id"]
+        # ✅ browse-এর প্রতিটা filter shape: equality column আগে, তারপর
+        # (-created_at, -id) — filter + order + keyset cursor একই index-এ, sort লাগে না।
+        # নতুন filter/ordering যোগ করলে materials/tests.py-র QueryPlanTests-এ shape যোগ করো।
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="material_created_id_idx"),
+            models.Index(fields=["category", "-created_at", "-id"], name="material_cat_created_idx"),
+            models.Index(fields=["department", "-created_at", "-id"], name="material_dept_created_idx"),
+            models.Index(
+                fields=["department", "semester", "-created_at", "-id"],
+                name="material_dept_sem_created_idx",
+            ),
+            models.Index(fields=["semester", "-created_at", "-id"], name="material_sem_created_idx"),
+            models.Index(fields=["university", "-created_at", "-id"], name="material_uni_created_idx"),
+            models.Index(fields=["file_ext", "-created_at", "-id"], name="material_ext_created_idx"),
+            models.Index(fields=["-hot_score", "-id"], name="material_hot_idx"),
+            models.Index(fields=["-top_score", "-id"], name="material_top_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} — {self.uploader}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # কোন university থেকে লোড হয়েছিল মনে রাখি — save-এ বদলালে
+        # দুই university-র material_count ঠিক করতে হবে (materials/signals.py)
+        instance._loaded_university_id = instance.__dict__.get("university_id", models.DEFERRED)
+        # একইভাবে file — blob-এর ref_count (materials/blobs.py)
+        instance._loaded_file_name = instance.__dict__.get("file", models.DEFERRED)
+        return instance
+
 
 class Upvote(TimeStampedModel):
     material = models.ForeignKey(
@@ -185,6 +280,111 @@ class Downvote(models.Model):
         return f"{self.user} ↓ {self.material_id}"
 
 
+class ProcessingJob(TimeStampedModel):
+    """
+    DB-backed job queue — আলাদা broker লাগে না।
+    ``python manage.py run_material_worker`` এই table থেকে job তুলে চালায়।
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    material = models.ForeignKey(
+        "Material",
+        on_delete=models.CASCADE,
+        related_name="processing_jobs",
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # worker চলার সময় refresh করে — পুরোনো হলে job আবার claimable
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} for material {self.material_id} ({self.status})"
+
+
+class Blob(TimeStampedModel):
+    """
+    Storage-এর একটা ফাইল আর কয়টা Material সেটা দেখছে। ref_count শূন্য হলে
+    ফাইল delete হয় (materials/blobs.py)।
+    """
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class UploadSession(TimeStampedModel):
+    """
+    Chunked/resumable upload (materials/uploads.py)। Chunk গুলো disk-এর একটা
+    partial ফাইলে লেখা হয়; ``received`` = এখন পর্যন্ত কত byte এসেছে, client
+    এখান থেকেই resume করে।
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # client যে hash বলেছে (begin-এ বাধ্যতামূলক) — finalize-এ মিলিয়ে দেখি
+    sha256 = models.CharField(max_length=64, blank=True)
+    received = models.PositiveBigIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class DownloadDay(models.Model):
+    """
+    প্রতি material-এর দিনভিত্তিক download সংখ্যা (trending-এর জন্য)।
+    materials/download_stats.py batch করে আপডেট করে।
+    """
+    material = models.ForeignKey(
+        "Material",
+        on_delete=models.CASCADE,
+        related_name="download_days",
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["material", "day"],
+                name="unique_download_day_per_material"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.material_id} @ {self.day}: {self.count}"
+
+
 class Comment(models.Model):
     material = models.ForeignKey(
         'Material',
@@ -223,8 +423,15 @@ class University(TimeStampedModel):
     name = models.CharField(max_length=150, unique=True)
     slug = models.SlugField(max_length=180, unique=True, blank=True)
 
+    # ✅ Home page leaderboard-এর জন্য materialized count —
+    # Material create/delete/university change হলে signal থেকে আপডেট হয়
+    material_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["-material_count", "name"], name="university_leaderboard_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,176 @@
+# materials/pagination.py
+"""
+Browse page-এর pagination।
+
+KeysetPaginator: OFFSET এর বদলে ``(created_at, id)`` cursor দিয়ে পরের/আগের page
+আনে — page 5000 আর page 1 একই খরচ, আর ``material_created_id_idx`` index ব্যবহার হয়।
+``key="hot_score"`` / ``"top_score"`` দিলে ``(score, id)`` — ``?sort=hot|top``।
+Cursor token টা signed, client এর কাছে opaque।
+
+মোট page সংখ্যার জন্য প্রতি request-এ ``COUNT(*)`` না চালিয়ে filter combination
+অনুযায়ী count cache করে রাখি (``cached_count``)। Key-তে একটা version stamp —
+material তৈরি/মোছা বা filter field বদলালে ``invalidate_counts()`` (signals.py,
+importer) version বদলায়, সব count একসাথে বাতিল।
+"""
+import hashlib
+import math
+import time
+from datetime import datetime
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+CURSOR_SALT = "materials.browse.cursor"
+COUNT_CACHE_TIMEOUT = 300  # seconds
+COUNT_VERSION_KEY = "materials:browse-count:version"
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def _count_version():
+    version = cache.get(COUNT_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(COUNT_VERSION_KEY, version, VERSION_TIMEOUT)
+    return version
+
+
+def invalidate_counts(using="default"):
+    """সব cached count বাতিল — এখনই, আর commit হওয়ার পরে আরেকবার (pagecache.purge এর মত)।"""
+
+    def _bump():
+        cache.set(COUNT_VERSION_KEY, time.time_ns(), VERSION_TIMEOUT)
+
+    _bump()
+    transaction.on_commit(_bump, using=using)
+
+
+def cached_count(queryset, key_parts, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    একই filter combination এর count কিছুক্ষণ cache-এ থাকে।
+    key_parts: filter param গুলোর (name, value) list।
+    """
+    raw = "&".join(f"{k}={v}" for k, v in sorted(key_parts))
+    key = f"materials:browse-count:{_count_version()}:" + hashlib.md5(raw.encode()).hexdigest()
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+class CachedCountPaginator(Paginator):
+    """Offset pagination (search/পুরোনো ?page= link) — কিন্তু count cache থেকে।"""
+
+    def __init__(self, object_list, per_page, count_key=(), **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list, self.count_key)
+
+
+class KeysetPage:
+    def __init__(self, object_list, number, num_pages, count,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.number = number
+        self.num_pages = num_pages
+        self.count = count
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Queryset ``-<key>, -id`` order-এ sort হয় (default key = created_at,
+    Material.Meta.ordering এর সাথে মিলিয়ে)।
+    """
+
+    def __init__(self, queryset, per_page, count_key=(), key="created_at"):
+        self.key = key
+        self.queryset = queryset.order_by(f"-{key}", "-id")
+        self.per_page = per_page
+        self.count_key = count_key
+
+    def encode(self, obj, direction, number):
+        value = getattr(obj, self.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return signing.dumps(
+            [value, obj.pk, direction, number, self.key],
+            salt=CURSOR_SALT, compress=True,
+        )
+
+    def decode(self, token):
+        """Invalid/tampered (বা অন্য sort-এর) cursor হলে None — তখন প্রথম page দেখাই।"""
+        try:
+            value, pk, direction, number, *key = signing.loads(token, salt=CURSOR_SALT)
+            if (key[0] if key else "created_at") != self.key:
+                return None
+            if self.key == "created_at":
+                value = parse_datetime(value)
+            elif not isinstance(value, (int, float)):
+                return None
+        except (signing.BadSignature, ValueError, TypeError):
+            return None
+        if value is None or direction not in ("next", "prev"):
+            return None
+        return value, int(pk), direction, int(number)
+
+    def get_page(self, token=None):
+        cursor = self.decode(token) if token else None
+        qs = self.queryset
+        number = 1
+        direction = "next"
+        key = self.key
+
+        if cursor:
+            value, pk, direction, number = cursor
+            if direction == "next":
+                qs = qs.filter(
+                    Q(**{f"{key}__lt": value}) | Q(**{key: value, "id__lt": pk})
+                )
+            else:
+                # আগের page: উল্টো দিকে হেঁটে তারপর reverse
+                qs = qs.filter(
+                    Q(**{f"{key}__gt": value}) | Q(**{key: value, "id__gt": pk})
+                ).order_by(key, "id")
+
+        # এক row বেশি এনে বুঝি ওই দিকে আরও আছে কিনা
+        rows = list(qs[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == "prev":
+            rows.reverse()
+            has_prev, has_next = more, True
+            if not more:
+                number = 1
+        else:
+            has_prev, has_next = cursor is not None, more
+
+        count = cached_count(self.queryset, self.count_key)
+        num_pages = max(math.ceil(count / self.per_page), 1)
+
+        return KeysetPage(
+            rows,
+            number=number,
+            num_pages=max(num_pages, number),
+            count=count,
+            next_cursor=self.encode(rows[-1], "next", number + 1) if rows and has_next else None,
+            previous_cursor=self.encode(rows[0], "prev", max(number - 1, 1)) if rows and has_prev else None,
+        )
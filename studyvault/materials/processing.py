@@ -0,0 +1,362 @@
+# materials/processing.py
+"""
+Upload-এর পরের ভারী কাজ — request-এর ভিতরে না, background worker-এ।
+
+Upload view শুধু ফাইল save করে একটা ``ProcessingJob`` row লেখে (একই transaction-এ),
+তারপর সাথে সাথে redirect। আলাদা process হিসেবে চলে:
+
+    python manage.py run_material_worker
+
+Worker queue (DB table) থেকে job claim করে:
+  * SHA-256 (chunk করে পড়ি, পুরো ফাইল memory-তে না)
+  * আসল MIME type (magic bytes — materials/filetypes.py)
+  * PDF: page count, text, প্রথম page-এর thumbnail
+  * docx/pptx/xlsx: zip-এর ভিতরের XML থেকে text (pptx-এ slide count)
+  * text -> ``extracted_text`` -> search index-এর ``content`` column
+
+Optional library: ``pypdf`` (PDF text/page), ``PyMuPDF`` (thumbnail)। না থাকলে
+page count regex দিয়ে আন্দাজ, thumbnail ``pdftoppm`` (poppler) দিয়ে, সেটাও না
+থাকলে thumbnail ছাড়াই ready।
+
+Claim একটা conditional UPDATE — একাধিক worker চালালেও একই job দুইজন নেয় না।
+Job চলার সময় একটা thread ``HEARTBEAT_INTERVAL`` পরপর ``heartbeat_at`` আপডেট
+করে; ``STALE_AFTER`` ধরে heartbeat না এলে worker মৃত ধরে job আবার claimable।
+শুধু ``locked_at``-এর বয়স দেখলে বড় PDF-এর লম্বা কিন্তু জীবিত job অন্য worker
+কেড়ে নিত, আর মরা worker-এর job অকারণে অনেকক্ষণ আটকে থাকত। Claim-এর
+``locked_at`` টাই claim-এর পরিচয় — job হাতছাড়া হলে পুরোনো worker-এর heartbeat
+আর শেষের UPDATE কোনো row পায় না, নতুন owner-এর state মোছে না।
+Fail করলে backoff দিয়ে আবার চেষ্টা, ``MAX_ATTEMPTS`` এর পর material "failed"।
+"""
+import hashlib
+import html
+import logging
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import zipfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import filetypes, storage
+from .models import Material, ProcessingJob
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(seconds=30)  # 30s, 2m, 8m …
+HEARTBEAT_INTERVAL = timedelta(seconds=30)
+# এতক্ষণ heartbeat না এলে ধরে নিই worker মারা গেছে (কয়েকটা heartbeat মিস সহ্য করি)
+STALE_AFTER = timedelta(minutes=2)
+# Search index-এ এর বেশি রাখার মানে নেই
+MAX_TEXT_CHARS = 200_000
+THUMBNAIL_WIDTH = 320
+
+_XML_TAG_RE = re.compile(r"<[^>]+>")
+_XML_BREAK_RE = re.compile(r"</(?:w:p|a:p|si)>")
+_PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_SLIDE_RE = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+
+
+def enqueue(material):
+    """Upload-এর transaction-এর ভিতরে call করো — commit না হলে job-ও থাকে না।"""
+    if material.processing_status != Material.STATUS_PENDING:
+        Material.objects.filter(pk=material.pk).update(processing_status=Material.STATUS_PENDING)
+        material.processing_status = Material.STATUS_PENDING
+    return ProcessingJob.objects.create(material=material)
+
+
+# ---------------------------------------------------------------- queue
+
+def _claimable(now):
+    return Q(status=ProcessingJob.PENDING, run_after__lte=now) | Q(
+        status=ProcessingJob.RUNNING, heartbeat_at__lt=now - STALE_AFTER
+    )
+
+
+def _owned(job):
+    """এই worker-এর claim এখনও টিকে আছে এমন row — reclaim হয়ে গেলে খালি।"""
+    return ProcessingJob.objects.filter(
+        pk=job.pk, status=ProcessingJob.RUNNING, locked_at=job.locked_at
+    )
+
+
+def heartbeat(job):
+    """চলতি job জীবিত জানায়। Job অন্য worker নিয়ে গেলে False।"""
+    return bool(_owned(job).update(heartbeat_at=timezone.now()))
+
+
+class _Heartbeat(threading.Thread):
+    """``run_job`` চলার সময় পাশে চলে; job শেষ হলে ``stop()``।"""
+
+    def __init__(self, job):
+        super().__init__(name=f"heartbeat-{job.pk}", daemon=True)
+        self.job = job
+        self._stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stopped.wait(HEARTBEAT_INTERVAL.total_seconds()):
+                if not heartbeat(self.job):
+                    logger.warning("Job %s was reclaimed by another worker.", self.job.pk)
+                    return
+        except Exception:
+            # DB busy ইত্যাদি — পরের কয়েকটা মিস হলে job stale হবে, সেটাই ঠিক
+            logger.exception("Heartbeat for job %s failed.", self.job.pk)
+        finally:
+            connection.close()  # এই thread-এর নিজের connection
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def claim():
+    """পরের job নেয় (status -> running); খালি হলে None।"""
+    now = timezone.now()
+    candidates = list(
+        ProcessingJob.objects.filter(_claimable(now))
+        .order_by("run_after", "id")
+        .values_list("pk", flat=True)[:10]
+    )
+    for pk in candidates:
+        # অন্য worker আগে নিয়ে নিলে filter মিলবে না, 0 row update
+        claimed = ProcessingJob.objects.filter(_claimable(now), pk=pk).update(
+            status=ProcessingJob.RUNNING,
+            locked_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return ProcessingJob.objects.select_related("material").get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """একটা claim করা job চালায়; success হলে True।"""
+    material = job.material
+    Material.objects.filter(pk=material.pk).update(processing_status=Material.STATUS_PROCESSING)
+    beat = _Heartbeat(job)
+    beat.start()
+    try:
+        process_material(material)
+    except Exception as exc:
+        logger.exception("Processing material %s failed (attempt %s).", material.pk, job.attempts)
+        _fail(job, exc)
+        return False
+    finally:
+        beat.stop()
+
+    if not _owned(job).update(
+        status=ProcessingJob.DONE, locked_at=None, heartbeat_at=None, last_error=""
+    ):
+        # আমরা আটকে ছিলাম, অন্য worker job নিয়েছে — তার result-ই থাকবে
+        logger.warning("Job %s finished after it was reclaimed.", job.pk)
+    return True
+
+
+def _fail(job, exc):
+    error = f"{type(exc).__name__}: {exc}"
+    with transaction.atomic():
+        if job.attempts >= MAX_ATTEMPTS:
+            if not _owned(job).update(
+                status=ProcessingJob.FAILED, locked_at=None, heartbeat_at=None, last_error=error
+            ):
+                return
+            Material.objects.filter(pk=job.material_id).update(
+                processing_status=Material.STATUS_FAILED
+            )
+        else:
+            if not _owned(job).update(
+                status=ProcessingJob.PENDING,
+                locked_at=None,
+                heartbeat_at=None,
+                last_error=error,
+                run_after=timezone.now() + RETRY_DELAY * 4 ** (job.attempts - 1),
+            ):
+                return
+            Material.objects.filter(pk=job.material_id).update(
+                processing_status=Material.STATUS_PENDING
+            )
+
+
+def run_pending(limit=None):
+    """Queue খালি না হওয়া পর্যন্ত (বা ``limit`` টা) job চালায়; কয়টা চালালো return।"""
+    done = 0
+    while limit is None or done < limit:
+        job = claim()
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
+
+
+# ---------------------------------------------------------------- steps
+
+def process_material(material):
+    if not material.file:
+        raise ValueError("Material has no file.")
+
+    with material.file.open("rb") as f:
+        # blob storage-এ নামটাই hash — আবার পুরো ফাইল পড়ার দরকার নেই
+        name = material.file.name
+        material.sha256 = storage.digest_of(name) if storage.is_blob(name) else _sha256(f)
+        material.mime_type = filetypes.sniff_file(f, name)
+
+        page_count, text, thumbnail = None, "", None
+        if material.mime_type == filetypes.PDF:
+            page_count, text = _pdf_info(f)
+            thumbnail = _pdf_thumbnail(material, f)
+        elif material.mime_type in (filetypes.DOCX, filetypes.PPTX, filetypes.XLSX):
+            page_count, text = _ooxml_info(f, material.mime_type)
+
+    material.page_count = page_count
+    material.extracted_text = text[:MAX_TEXT_CHARS]
+    if thumbnail:
+        material.thumbnail.save(f"{material.pk}.png", ContentFile(thumbnail), save=False)
+    material.processing_status = Material.STATUS_READY
+    # extracted_text আছে বলে post_save signal search index আপডেট করবে
+    material.save(update_fields=[
+        "sha256", "mime_type", "page_count", "extracted_text", "thumbnail",
+        "processing_status", "updated_at",
+    ])
+
+
+def _sha256(f):
+    f.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def _pdf_info(f):
+    """(page_count, text)। pypdf না থাকলে শুধু page count আন্দাজ।"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+
+    if PdfReader is not None:
+        try:
+            reader = PdfReader(f)
+            parts, size = [], 0
+            for page in reader.pages:
+                if size >= MAX_TEXT_CHARS:
+                    break
+                chunk = page.extract_text() or ""
+                parts.append(chunk)
+                size += len(chunk)
+            return len(reader.pages), "\n".join(parts)
+        except Exception:
+            # ভাঙা/encrypted PDF — অন্তত page count চেষ্টা করি
+            logger.warning("pypdf could not read PDF; falling back to page regex.", exc_info=True)
+        finally:
+            f.seek(0)
+
+    return _count_pdf_pages(f), ""
+
+
+def _count_pdf_pages(f):
+    # Compressed object stream-এ থাকা page গুলো ধরা পড়ে না, তাই শুধু আন্দাজ
+    f.seek(0)
+    count, tail = 0, b""
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+        data = tail + chunk
+        # chunk-এর সীমানায় ভাঙা match: শেষের ৩২ byte পরের chunk-এর সাথে জুড়ে দেখি
+        cut = max(len(data) - 32, 0)
+        count += sum(1 for m in _PDF_PAGE_RE.finditer(data) if m.start() < cut)
+        tail = data[cut:]
+    count += len(_PDF_PAGE_RE.findall(tail))
+    f.seek(0)
+    return count or None
+
+
+def _pdf_thumbnail(material, f):
+    """প্রথম page-এর PNG bytes, না পারলে None।"""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        fitz = None
+
+    if fitz is not None:
+        try:
+            f.seek(0)
+            with fitz.open(stream=f.read(), filetype="pdf") as doc:
+                page = doc[0]
+                zoom = THUMBNAIL_WIDTH / page.rect.width
+                return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+        except Exception:
+            logger.warning("PyMuPDF could not render material %s.", material.pk, exc_info=True)
+            return None
+        finally:
+            f.seek(0)
+
+    if shutil.which("pdftoppm"):
+        return _pdftoppm_thumbnail(material, f)
+    return None
+
+
+def _pdftoppm_thumbnail(material, f):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = f"{tmp}/source.pdf"
+        with open(source, "wb") as out:
+            f.seek(0)
+            shutil.copyfileobj(f, out, CHUNK_SIZE)
+        f.seek(0)
+        try:
+            subprocess.run(
+                [
+                    "pdftoppm", "-png", "-f", "1", "-l", "1",
+                    "-scale-to-x", str(THUMBNAIL_WIDTH), "-scale-to-y", "-1",
+                    "-singlefile", source, f"{tmp}/thumb",
+                ],
+                check=True, capture_output=True, timeout=60,
+            )
+            with open(f"{tmp}/thumb.png", "rb") as thumb:
+                return thumb.read()
+        except (OSError, subprocess.SubprocessError):
+            logger.warning("pdftoppm could not render material %s.", material.pk, exc_info=True)
+            return None
+
+
+def _xml_text(data):
+    text = _XML_BREAK_RE.sub("\n", data.decode("utf-8", "replace"))
+    return html.unescape(_XML_TAG_RE.sub(" ", text))
+
+
+def _ooxml_info(f, mime):
+    """(page_count, text) — pptx হলে page_count = slide সংখ্যা।"""
+    f.seek(0)
+    with zipfile.ZipFile(f) as zf:
+        names = zf.namelist()
+        if mime == filetypes.DOCX:
+            parts = [n for n in names if n == "word/document.xml"]
+            pages = None
+        elif mime == filetypes.PPTX:
+            slides = sorted(
+                (int(m.group(1)), n) for n in names if (m := _SLIDE_RE.match(n))
+            )
+            parts = [n for _, n in slides]
+            pages = len(slides) or None
+        else:
+            parts = [n for n in names if n == "xl/sharedStrings.xml"]
+            pages = None
+
+        texts, size = [], 0
+        for name in parts:
+            if size >= MAX_TEXT_CHARS:
+                break
+            chunk = _xml_text(zf.read(name))
+            texts.append(chunk)
+            size += len(chunk)
+    f.seek(0)
+    return pages, "\n".join(texts)
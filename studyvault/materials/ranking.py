@@ -0,0 +1,142 @@
+# materials/ranking.py
+"""
+Browse-এর "hot" আর "top" sort — দুটোই Material-এর indexed column, তাই
+``ORDER BY hot_score DESC`` default (created_at) ordering এর মতই সস্তা; প্রতি
+request-এ Upvote/Downvote/DownloadDay aggregate করতে হয় না।
+
+  points    = upvote − downvote + 0.5·comment + 0.1·download
+  top_score = points
+  hot_score = sign(points)·log10(max(|points|, 1)) + (created_at − EPOCH) / DECAY_SECONDS
+
+Hot-এ সময়ের decay আসে created_at থেকে: একদিন নতুন material সমান হতে
+পুরোনোটার ১০ গুণ points লাগে। Decay টা সবার জন্য একই হারে বাড়ে, তাই কোনো
+material-এর score শুধু তার নিজের counter বদলালেই বদলায় — সব row নিয়মিত
+আবার হিসাব করতে হয় না।
+
+Incremental: ``counters.bump`` / download flush যে UPDATE-এ counter বাড়ায়,
+সেই একই UPDATE-এ ``score_updates()`` দিয়ে score-ও (পুরোনো log term বাদ, নতুনটা
+যোগ) — আলাদা query নেই। প্রতিটা incremental UPDATE-এ float rounding জমে
+(hot_score-এ বয়সের অংশ বড়, log term ছোট), আর bulk/raw write score এড়িয়ে
+যেতে পারে, তাই নিয়মিত পুরো table আবার হিসাব করি:
+
+    python manage.py rank_materials --every 3600   # worker-এর পাশে আলাদা process
+    python manage.py rank_materials                # একবার (cron / weight বদলালে)
+
+``DRIFT_TOLERANCE`` এর চেয়ে বেশি সরে যাওয়া row গুলোই শুধু লেখা হয়।
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Abs, Greatest, Log, Sign
+from django.utils import timezone
+
+from studyvault import pagecache
+
+from .models import Material
+
+WEIGHTS = {
+    "upvote_count": 1.0,
+    "downvote_count": -1.0,
+    "comment_count": 0.5,
+    "download_count": 0.1,
+}
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+DECAY_SECONDS = 24 * 60 * 60
+# 1e-6 ≈ 0.09 সেকেন্ড বয়স — এর চেয়ে ছোট পার্থক্য (float, save-এর মুহূর্ত) বাদ
+DRIFT_TOLERANCE = 1e-6
+
+SORTS = {
+    # ?sort= -> score column (descending, id tie-break)
+    "hot": "hot_score",
+    "top": "top_score",
+}
+
+
+def points(material):
+    return sum(w * (getattr(material, field) or 0) for field, w in WEIGHTS.items())
+
+
+def _log_term(p):
+    return math.copysign(math.log10(max(abs(p), 1.0)), p) if p else 0.0
+
+
+def hot_score(p, created_at=None):
+    created_at = created_at or timezone.now()
+    return _log_term(p) + (created_at - EPOCH).total_seconds() / DECAY_SECONDS
+
+
+def apply_scores(material):
+    """Counter + created_at থেকে score বসায় (save করে না)। বদলালে True।"""
+    p = points(material)
+    hot = hot_score(p, material.created_at)
+    changed = (
+        material.top_score is None
+        or abs(material.top_score - p) > DRIFT_TOLERANCE
+        or abs(material.hot_score - hot) > DRIFT_TOLERANCE
+    )
+    material.top_score, material.hot_score = p, hot
+    return changed
+
+
+# ---------------------------------------------------------------- SQL
+
+def _points_expr():
+    total = None
+    for field, w in WEIGHTS.items():
+        term = F(field) * Value(w, output_field=FloatField())
+        total = term if total is None else total + term
+    return total
+
+
+def _log_expr(p):
+    return Sign(p) * Log(Value(10.0), Greatest(Abs(p), Value(1.0)))
+
+
+def score_updates(deltas):
+    """
+    ``deltas``: {counter field: int বা expression (CASE WHEN …)}। Counter-এর সাথে
+    একই ``.update()`` এ দেওয়ার মত {field: expression} return করে। UPDATE-এর
+    ডান দিকে F() পুরোনো মান পড়ে, তাই old points = counter গুলো এখন যা আছে।
+    """
+    delta = None
+    for field, d in deltas.items():
+        if field in WEIGHTS:
+            term = Value(WEIGHTS[field], output_field=FloatField()) * (
+                d if hasattr(d, "resolve_expression") else Value(d)
+            )
+            delta = term if delta is None else delta + term
+    if delta is None:
+        return {}
+    old = _points_expr()
+    new = old + delta
+    return {
+        "top_score": new,
+        "hot_score": F("hot_score") - _log_expr(old) + _log_expr(new),
+    }
+
+
+# ---------------------------------------------------------------- batch
+
+def recompute(queryset=None, batch_size=500):
+    """সব (বা ``queryset``-এর) material-এর score আবার হিসাব; কয়টা বদলালো return।"""
+    if queryset is None:
+        queryset = Material.objects.all()
+    fields = ["pk", "created_at", "hot_score", "top_score", *WEIGHTS]
+    qs = queryset.only(*fields).order_by("pk")
+
+    fixed, batch = 0, []
+    for m in qs.iterator(chunk_size=batch_size):
+        if apply_scores(m):
+            batch.append(m)
+        if len(batch) >= batch_size:
+            Material.objects.bulk_update(batch, ["hot_score", "top_score"])
+            fixed += len(batch)
+            batch = []
+    if batch:
+        Material.objects.bulk_update(batch, ["hot_score", "top_score"])
+        fixed += len(batch)
+    if fixed:
+        # bulk_update-এ signal নেই — hot/top order বদলেছে
+        pagecache.purge(pagecache.page_tag("browse"))
+    return fixed
@@ -0,0 +1,231 @@
+# materials/search.py
+"""
+Material search index.
+
+এক interface-এর পেছনে দুইটা backend:
+  * SQLite  -> FTS5 virtual table (``materials_search``), bm25 ranking
+  * Postgres -> tsvector table (``materials_search``) + GIN index, ts_rank ranking
+
+অন্য কোনো DB হলে পুরোনো icontains search-এ fallback করে।
+
+Index টা Material-এর save/delete signal দিয়ে sync থাকে (materials/signals.py),
+আর পুরোটা নতুন করে বানাতে: ``python manage.py rebuild_search_index``
+"""
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import Q
+
+TABLE = "materials_search"
+
+# Title-এর match description-এর চেয়ে বেশি গুরুত্ব পাবে, file-এর ভিতরের
+# text (worker extract করে) সবচেয়ে কম
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 2.0
+CONTENT_WEIGHT = 0.5
+
+# Bangla block (U+0980–U+09FF)-এর vowel sign / hasanta এগুলো unicode category
+# অনুযায়ী "letter" না, তাই \w এর সাথে পুরো block টা আলাদা করে ধরছি।
+_TOKEN_RE = re.compile(r"[\w\u0980-\u09FF]+")
+# ZWJ / ZWNJ — যুক্তাক্ষর লেখার সময় আসে, search-এ কোনো মানে নেই
+_JOINERS = dict.fromkeys(map(ord, "\u200c\u200d"), None)
+# ০-৯ -> 0-9, যাতে "২০২৩" আর "2023" একই token হয়
+_BANGLA_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
+
+
+def tokenize(text):
+    """
+    English + Bangla দুইটার জন্যই একই normalization:
+    NFC, casefold, joiner বাদ, Bangla digit -> ASCII, তারপর word token।
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = text.translate(_JOINERS).translate(_BANGLA_DIGITS)
+    return [t for t in _TOKEN_RE.findall(text) if t.strip("_")]
+
+
+def normalize(text):
+    return " ".join(tokenize(text))
+
+
+class BaseSearchBackend:
+    """
+    সব backend এই method গুলো দেয়:
+      index(materials)  – insert/update (iterable of Material)
+      remove(ids)       – index থেকে বাদ
+      clear()           – পুরো index খালি
+      optimize()        – bulk rebuild শেষে compaction (optional)
+      filter(qs, q)     – qs কে match দিয়ে filter করে relevance অনুযায়ী sort
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def index(self, materials):
+        raise NotImplementedError
+
+    def remove(self, ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def optimize(self):
+        pass
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+    @staticmethod
+    def _rows(materials):
+        return [
+            (
+                m.pk,
+                normalize(m.title),
+                normalize(m.description),
+                normalize(getattr(m, "extracted_text", "")),
+            )
+            for m in materials
+        ]
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    FTS5 table-এ rowid = material id. Text আমরা নিজেরাই normalize করে রাখি,
+    আর FTS5-এর ``ascii`` tokenizer non-ASCII character কে token-এর অংশ ধরে,
+    তাই Bangla শব্দ vowel sign-এ ভেঙে যায় না।
+    """
+
+    def index(self, materials):
+        rows = self._rows(materials)
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {TABLE} WHERE rowid = %s", [(r[0],) for r in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, title, description, content) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {TABLE} WHERE rowid = %s", [(i,) for i in ids]
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+
+    def optimize(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+    @staticmethod
+    def match_expression(tokens):
+        # প্রতিটা token prefix match ("dsa"* → "dsa", "dsalgo" …), সব token AND
+        return " ".join(f'"{t}"*' for t in tokens)
+
+    def filter(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[TABLE],
+            where=[f"{TABLE}.rowid = {table}.id", f"{TABLE} MATCH %s"],
+            params=[self.match_expression(tokens)],
+            select={"search_rank": f"bm25({TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}, {CONTENT_WEIGHT})"},
+            # bm25: যত ছোট তত ভালো match
+            order_by=["search_rank", f"-{table}.created_at"],
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    ``materials_search(material_id, document tsvector)`` + GIN index.
+    'simple' config — stemming নেই, তাই Bangla/English দুটোই একইভাবে চলে।
+    """
+
+    _DOCUMENT = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C')"
+    )
+
+    def index(self, materials):
+        rows = self._rows(materials)
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (material_id, document) VALUES (%s, {self._DOCUMENT}) "
+                f"ON CONFLICT (material_id) DO UPDATE SET document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove(self, ids):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE material_id = ANY(%s)", [list(ids)])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {TABLE}")
+
+    @staticmethod
+    def tsquery(tokens):
+        return " & ".join(f"{t}:*" for t in tokens)
+
+    def filter(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[TABLE],
+            where=[
+                f"{TABLE}.material_id = {table}.id",
+                f"{TABLE}.document @@ to_tsquery('simple', %s)",
+            ],
+            params=[self.tsquery(tokens)],
+            select={
+                "search_rank": f"ts_rank('{{0.1, 0.1, 0.2, 1.0}}', {TABLE}.document, to_tsquery('simple', %s))"
+            },
+            select_params=[self.tsquery(tokens)],
+            order_by=["-search_rank", f"-{table}.created_at"],
+        )
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """অন্য DB-র জন্য পুরোনো icontains search (কোনো index নেই)।"""
+
+    def index(self, materials):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def filter(self, queryset, query):
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend(using="default"):
+    connection = connections[using]
+    return BACKENDS.get(connection.vendor, BasicSearchBackend)(connection)
+
+
+def search(queryset, query):
+    return get_backend(queryset.db).filter(queryset, query)
@@ -0,0 +1,150 @@
+# materials/signals.py
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from studyvault import pagecache
+
+from . import blobs, fragments, leaderboard, lookups, pagination, ranking, search
+from .models import Comment, Downvote, Material, University, Upvote
+
+SEARCH_FIELDS = {"title", "description", "extracted_text"}
+# browse count কোন filter/search-এ material পড়ে তা ঠিক করে এমন field
+COUNTED_FIELDS = SEARCH_FIELDS | {
+    "category", "department", "semester", "university", "file", "file_ext",
+}
+
+
+@receiver(pre_save, sender=Material)
+def initial_hot_score(sender, instance, raw=False, **kwargs):
+    # নতুন material: points সাধারণত 0, তাই hot_score = শুধু সময়ের অংশ।
+    # এরপর থেকে counter-এর সাথে বদলায় (counters.bump)।
+    if raw or not instance._state.adding:
+        return
+    instance.top_score = ranking.points(instance)
+    instance.hot_score = ranking.hot_score(instance.top_score, instance.created_at)
+
+
+@receiver(post_save, sender=Material)
+def index_material(sender, instance, raw=False, using="default", update_fields=None, **kwargs):
+    if raw:
+        return
+    # download_count এর মত update-এ index ছোঁয়ার দরকার নেই
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    search.get_backend(using).index([instance])
+
+
+@receiver(post_delete, sender=Material)
+def unindex_material(sender, instance, using="default", **kwargs):
+    search.get_backend(using).remove([instance.pk])
+
+
+@receiver(post_save, sender=Material)
+def update_university_count(sender, instance, created, raw=False, using="default",
+                            update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        leaderboard.adjust(instance.university_id, 1, using=using)
+    elif update_fields is None or "university" in update_fields:
+        old = getattr(instance, "_loaded_university_id", models.DEFERRED)
+        if old is not models.DEFERRED and old != instance.university_id:
+            # এক university থেকে আরেকটায় সরানো হয়েছে
+            leaderboard.adjust(old, -1, using=using)
+            leaderboard.adjust(instance.university_id, 1, using=using)
+    instance._loaded_university_id = instance.university_id
+
+
+@receiver(post_delete, sender=Material)
+def decrement_university_count(sender, instance, using="default", **kwargs):
+    leaderboard.adjust(instance.university_id, -1, using=using)
+
+
+@receiver(post_save, sender=Material)
+def retain_material_blob(sender, instance, created, raw=False, using="default",
+                         update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and "file" not in update_fields:
+        return
+    name = instance.file.name
+    old = getattr(instance, "_loaded_file_name", models.DEFERRED)
+    if created or old is models.DEFERRED:
+        blobs.retain(name, using=using)
+    elif old != name:
+        # ফাইল বদলানো হয়েছে — নতুনটা ধরো, পুরোনোটা ছাড়ো
+        blobs.retain(name, using=using)
+        blobs.release(old, using=using)
+    instance._loaded_file_name = name
+
+
+@receiver(post_delete, sender=Material)
+def release_material_blob(sender, instance, using="default", **kwargs):
+    blobs.release(instance.file.name, using=using)
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+def bump_material_card(sender, instance, raw=False, using="default", **kwargs):
+    if not raw:
+        fragments.bump(instance.pk, using=using)
+        # নতুন/মোছা material browse list আর home-এর count বদলায়
+        pagecache.purge(pagecache.material_tag(instance.pk), pagecache.page_tag("browse"),
+                        pagecache.page_tag("home"), using=using)
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+def invalidate_browse_counts(sender, instance, raw=False, using="default", update_fields=None,
+                             **kwargs):
+    # counter/score/processing status update-এ count বদলায় না
+    if raw or (update_fields is not None and not COUNTED_FIELDS & set(update_fields)):
+        return
+    pagination.invalidate_counts(using=using)
+
+
+@receiver(post_save, sender=Upvote)
+@receiver(post_delete, sender=Upvote)
+@receiver(post_save, sender=Downvote)
+@receiver(post_delete, sender=Downvote)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_card_of_related(sender, instance, raw=False, using="default", **kwargs):
+    if not raw:
+        fragments.bump(instance.material_id, using=using)
+        pagecache.purge(pagecache.material_tag(instance.material_id), using=using)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_cards_of_user(sender, instance, created, raw=False, using="default",
+                       update_fields=None, **kwargs):
+    # card/page-এ username থাকে। login শুধু last_login লেখে — তখন কিছু না
+    if raw or created or (update_fields is not None and "username" not in update_fields):
+        return
+    ids = list(
+        Material.objects.using(using)
+        .filter(Q(uploader=instance) | Q(comments__user=instance))
+        .values_list("pk", flat=True).distinct()
+    )
+    fragments.bump(*ids, using=using)
+    pagecache.purge(*(pagecache.material_tag(pk) for pk in ids), using=using)
+
+
+def invalidate_lookup(sender, raw=False, using="default", **kwargs):
+    # fixture load (raw) হলেও — cache-এর table পুরোনো হয়ে গেছে
+    lookups.invalidate(sender, using=using)
+    fragments.bump_all(using=using)
+    if sender is University:
+        # home leaderboard-এ university-র নাম — rename/delete হলে পুরোনো নাম দেখাত
+        leaderboard.invalidate()
+        transaction.on_commit(leaderboard.invalidate, using=using)
+    # নাম সব page-এ (filter sidebar, card, detail) — সব cached page বাতিল
+    pagecache.purge("all", using=using)
+
+
+for _model in lookups.MODELS:
+    post_save.connect(invalidate_lookup, sender=_model, dispatch_uid=f"lookup-save-{_model.__name__}")
+    post_delete.connect(invalidate_lookup, sender=_model, dispatch_uid=f"lookup-delete-{_model.__name__}")
@@ -0,0 +1,97 @@
+# materials/storage.py
+"""
+Content-addressed storage — Material.file এর ফাইল তার SHA-256 নামে রাখা হয়:
+
+    blobs/ab/cd/abcd…ef.pdf
+
+একই প্রশ্নপত্র ৫০ জন upload করলেও disk-এ একটাই কপি; নতুন upload শুধু আগের
+blob-এর নাম reference করে। কয়টা Material কোন blob দেখছে সেটা ``Blob.ref_count``
+(materials/blobs.py) — শেষ reference গেলে তবেই ফাইল delete।
+
+এই module models import করে না (models.py নিজেই এটা import করে)।
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from django.core.files.storage import FileSystemStorage
+
+PREFIX = "blobs"
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(content):
+    """File/UploadedFile এর SHA-256 hex; ``chunks()`` নিজেই শুরুতে seek করে।"""
+    digest = hashlib.sha256()
+    for chunk in content.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(digest, name):
+    ext = os.path.splitext(name)[1].lower()
+    return f"{PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(PREFIX + "/")
+
+
+def digest_of(name):
+    """Blob নাম থেকে SHA-256 (extension বাদ)।"""
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    ``upload_to`` যা-ই বলুক, ফাইল যায় hash-এর path-এ; শুধু extension টা রাখি
+    (download-এর content type আর X-Accel-এর জন্য)। আসল নাম থাকে
+    ``Material.original_filename`` এ।
+    """
+
+    # লেখা বাদ দেওয়া content কয়টা পর্যন্ত মনে রাখি (thread প্রতি)
+    SKIPPED_MAX = 8
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def _skipped(self):
+        if not hasattr(self._local, "skipped"):
+            self._local.skipped = OrderedDict()
+        return self._local.skipped
+
+    def _save(self, name, content):
+        target = blob_name(hash_file(content), name)
+        if self.exists(target):
+            # একই bytes আগে থেকেই আছে — লিখবই না। কিন্তু content মনে রাখি: এই
+            # reference DB-তে বসার আগেই collector (শেষ reference চলে গেছে) ফাইলটা
+            # মুছে দিতে পারে — তখন blobs.retain ``take_skipped`` দিয়ে আবার লেখে
+            skipped = self._skipped()
+            skipped[target] = content
+            while len(skipped) > self.SKIPPED_MAX:
+                skipped.popitem(last=False)
+            return target
+        # দুইটা একই ফাইল একসাথে এলে FileSystemStorage এর O_EXCL এ একটা
+        # "_abc123" suffix নাম পায় — ক্ষতি নেই, শুধু dedup হয় না (dedup_media ধরে)
+        return super()._save(target, content)
+
+    def take_skipped(self, name):
+        """এই thread-এ ``name`` এর যে content লেখা হয়নি (না থাকলে None)।"""
+        return self._skipped().pop(name, None)
+
+    def restore(self, name, content):
+        """Blob ফাইল (মুছে গেছে) ঠিক ``name`` path-এই আবার লেখে।"""
+        written = super()._save(name, content)
+        if written != name:
+            # এর মধ্যে অন্য কেউ লিখে ফেলেছে — আমাদের suffix কপি লাগবে না
+            self.delete(written)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def material_storage():
+    # FileField(storage=callable) — migration-এ class-এর settings ঢুকে যায় না
+    return blob_storage
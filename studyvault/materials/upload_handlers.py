@@ -0,0 +1,101 @@
+# materials/upload_handlers.py
+"""
+Material upload-এর জন্য streaming validation।
+
+Django-র default handler পুরো ফাইল memory / temp file-এ তুলে তারপর form
+validator চালায় — 50MB এর বেশি হলেও বা ".pdf" নামে .exe হলেও পুরোটা disk-এ
+লেখা হয়ে যায়। এই handler বাকি handler-দের আগে বসে:
+
+  * Request-এর Content-Length limit ছাড়ালে body একটুও না পড়ে বাদ — view
+    (``upload_material``) CSRF check-এর *আগেই* ``too_large()`` দেখে error দেখায়;
+    CSRF check token-এর জন্য body পড়ে, ফাঁকা body-তে token নেই -> 403 হত
+  * Extension allowed না হলে ফাইলের একটা byte-ও store হয় না
+  * প্রথম কয়েক KB (magic bytes) দেখে type extension-এর সাথে না মিললে বাদ —
+    ``StopUpload(connection_reset=True)``, বাকি body আর পড়ি না
+  * Stream চলাকালীন size limit পেরোলেই থামিয়ে দেয়
+
+Reject হলে ``handler.error`` এ কারণ থাকে, view সেটা form error হিসেবে দেখায়।
+পুরো ফাইল আসার পরে ``MaterialForm.clean_file`` আবার ``sniff_file`` দিয়ে
+নিশ্চিত হয় (zip-এর central directory শেষে থাকে)।
+"""
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+from . import filetypes
+from .models import ALLOWED_EXTENSIONS, MAX_UPLOAD_MB, MAX_UPLOAD_SIZE
+
+# title/description ইত্যাদি form field + multipart boundary-র জন্য জায়গা
+FORM_OVERHEAD = 1024 * 1024
+SNIFF_BYTES = 4 * 1024
+
+
+def too_large(content_length):
+    return content_length > MAX_UPLOAD_SIZE + FORM_OVERHEAD
+
+
+def content_length(meta):
+    # MultiPartParser-এর মতই: না থাকলে / ভুল হলে 0
+    try:
+        return int(meta.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return 0
+
+
+class MaterialUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.error = None
+        # True হলে body একদমই পড়া হয়নি — অন্য field-ও ফাঁকা
+        self.aborted = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if too_large(content_length):
+            self.reject_oversized()
+            # parser কে ফাঁকা result দিলে সে আর input পড়ে না
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def reject_oversized(self):
+        self.error = f"File too large. Max size is {MAX_UPLOAD_MB} MB."
+        self.aborted = True
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.received = 0
+        self.head = b""
+        self.checked = False
+        ext = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+        if ext not in ALLOWED_EXTENSIONS:
+            self.error = f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}."
+            raise StopUpload(connection_reset=True)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > MAX_UPLOAD_SIZE:
+            # Content-Length না দিয়ে (chunked encoding) বড় ফাইল পাঠালে
+            self.error = f"File too large. Max size is {MAX_UPLOAD_MB} MB."
+            raise StopUpload(connection_reset=True)
+
+        if not self.checked:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES and not self._type_ok():
+                # SkipFile দিলে parser বাকি ফাইলটা পড়ে ফেলে দিত — 50MB অকারণে।
+                # এর পরের field আর আসে না; view সেগুলোর "required" error দেখায় না
+                raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # SNIFF_BYTES এর চেয়ে ছোট ফাইল — এখন দেখি। এখান থেকে SkipFile তোলা যায়
+        # না, তাই শুধু error রাখি; view upload টা বাতিল করবে।
+        if not self.checked:
+            self._type_ok()
+        return None
+
+    def _type_ok(self):
+        self.checked = True
+        mime = filetypes.sniff(self.head, self.file_name)
+        if filetypes.plausible(mime, self.file_name):
+            return True
+        self.error = "File content does not match its extension."
+        return False
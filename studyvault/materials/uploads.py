@@ -0,0 +1,198 @@
+# materials/uploads.py
+"""
+Chunked, resumable upload — বড় PDF/zip আর দুর্বল campus wifi-র জন্য।
+
+Flow (সব JSON, login লাগবে):
+  1. POST   /materials/uploads/                 {filename, size, sha256}
+     -> {upload_id, offset: 0, chunk_size}
+  2. PUT    /materials/uploads/<id>/            header ``Upload-Offset: <n>``, body = raw bytes
+     -> {offset}  (connection কেটে গেলে যতটুকু এসেছে ততটুকুই জমা থাকে)
+     GET    /materials/uploads/<id>/            -> {offset, size}  (resume-এর আগে)
+  3. POST   /materials/uploads/<id>/complete/   title, category … (form fields)
+     -> পুরো ফাইলের SHA-256 মিলিয়ে নতুন Material
+
+sha256 বাধ্যতামূলক: শুধু size মেলালে chunk-এর মাঝের নষ্ট/ভুল offset-এর byte
+ধরা পড়ে না, জোড়া লাগানো ফাইল চুপচাপ Material হয়ে যেত।
+
+Chunk সরাসরি disk-এর partial ফাইলে যায় (request body ছোট ছোট read-এ),
+memory-তে পুরো chunk-ও ধরে রাখি না। Partial ফাইল থাকে
+``settings.MATERIALS_UPLOAD_TEMP_DIR`` এ (MEDIA_ROOT না — ওটা public)।
+পরিত্যক্ত session: ``python manage.py purge_uploads``
+"""
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from . import filetypes
+from .models import ALLOWED_EXTENSIONS, MAX_UPLOAD_MB, MAX_UPLOAD_SIZE, UploadSession
+
+# Client এই মাপে কাটবে; server এর বেশি একবারে নেয় না
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+READ_SIZE = 64 * 1024
+SESSION_TTL = timedelta(hours=24)
+
+
+class UploadError(Exception):
+    status = 400
+
+
+class OffsetMismatch(UploadError):
+    """Client-এর offset আর server-এর received আলাদা — client কে আসল offset জানাই।"""
+    status = 409
+
+    def __init__(self, offset):
+        super().__init__(f"Expected offset {offset}.")
+        self.offset = offset
+
+
+class UploadExpired(UploadError):
+    """Session বা partial ফাইল আর নেই — client কে শুরু থেকে আবার করতে হবে।"""
+    status = 410
+
+
+def temp_dir():
+    path = getattr(settings, "MATERIALS_UPLOAD_TEMP_DIR", None) or os.path.join(
+        tempfile.gettempdir(), "studyvault-uploads"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def part_path(session):
+    return os.path.join(temp_dir(), f"{session.pk}.part")
+
+
+def _check_alive(session):
+    if session.expires_at < timezone.now() or not os.path.exists(part_path(session)):
+        discard(session)
+        raise UploadExpired("Upload expired; start again.")
+
+
+def begin(user, filename, size, sha256=""):
+    filename = os.path.basename(filename or "").strip()
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext not in ALLOWED_EXTENSIONS:
+        raise UploadError(f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Invalid size.")
+    if size <= 0:
+        raise UploadError("Empty file.")
+    if size > MAX_UPLOAD_SIZE:
+        raise UploadError(f"File too large. Max size is {MAX_UPLOAD_MB} MB.")
+    sha256 = (sha256 or "").strip().lower()
+    if not sha256:
+        raise UploadError("sha256 of the whole file is required.")
+    if (len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256)):
+        raise UploadError("Invalid sha256.")
+
+    session = UploadSession.objects.create(
+        user=user,
+        filename=filename,
+        size=size,
+        sha256=sha256,
+        expires_at=timezone.now() + SESSION_TTL,
+    )
+    open(part_path(session), "wb").close()
+    return session
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    ``stream`` থেকে ``length`` byte partial ফাইলের ``offset`` এ লেখে; নতুন offset
+    return করে। মাঝপথে connection কাটলে যতটুকু লেখা হয়েছে ততটুকুই গোনা হয়।
+
+    DB lock ধরে রেখে network থেকে পড়ি না (SQLite-এ সেটা পুরো DB আটকে রাখত):
+    আগে লিখি, তারপর ``received = offset`` শর্তে UPDATE। একই offset-এ দুইটা
+    request এলে একটাই জেতে, অন্যটা 409।
+    """
+    _check_alive(session)
+    if offset != session.received:
+        raise OffsetMismatch(session.received)
+    if length <= 0:
+        return offset
+    if length > MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunk too large. Max {MAX_CHUNK_SIZE} bytes.")
+    if offset + length > session.size:
+        raise UploadError("Chunk goes past the declared file size.")
+
+    written = 0
+    with open(part_path(session), "r+b") as f:
+        f.seek(offset)
+        while written < length:
+            data = stream.read(min(READ_SIZE, length - written))
+            if not data:
+                break
+            f.write(data)
+            written += len(data)
+
+    new_offset = offset + written
+    if offset == 0:
+        # ✅ প্রথম chunk-এই magic bytes দেখি — ভুল type হলে বাকি 50MB আর আসবে না
+        with open(part_path(session), "rb") as f:
+            mime = filetypes.sniff(f.read(filetypes.HEADER_SIZE), session.filename)
+        if not filetypes.plausible(mime, session.filename):
+            discard(session)
+            raise UploadError("File content does not match its extension.")
+    updated = UploadSession.objects.filter(pk=session.pk, received=offset).update(
+        received=new_offset,
+        expires_at=timezone.now() + SESSION_TTL,
+    )
+    if not updated:
+        session.refresh_from_db(fields=["received"])
+        raise OffsetMismatch(session.received)
+    session.received = new_offset
+    return new_offset
+
+
+def finish(session):
+    """
+    সব byte এসেছে আর জোড়া লাগানো ফাইলের SHA-256 declared digest-এর সাথে
+    মিলেছে কিনা দেখে ``File`` return করে (caller Material-এ attach করে, তারপর
+    ``discard``)। Digest না মিললে বা না থাকলে upload বাতিল।
+    """
+    _check_alive(session)
+    if session.received != session.size:
+        raise UploadError(f"Upload incomplete: {session.received}/{session.size} bytes.")
+
+    if not session.sha256:
+        # পুরোনো (sha256 optional থাকার সময়ের) session — মেলানোর কিছু নেই
+        discard(session)
+        raise UploadError("Upload has no declared sha256; start again.")
+
+    path = part_path(session)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE * 16), b""):
+            digest.update(chunk)
+    if digest.hexdigest() != session.sha256:
+        # কোথাও byte নষ্ট হয়েছে — আবার শুরু থেকে
+        discard(session)
+        raise UploadError("Checksum mismatch; upload discarded.")
+    return File(open(path, "rb"), name=session.filename)
+
+
+def discard(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
+    if session.pk:
+        session.delete()
+
+
+def purge_expired(now=None):
+    """Expire হওয়া session আর তাদের partial ফাইল মুছে ফেলে। কয়টা গেল return করে।"""
+    expired = UploadSession.objects.filter(expires_at__lt=now or timezone.now())
+    count = 0
+    for session in expired.iterator():
+        discard(session)
+        count += 1
+    return count
@@ -6,14 +6,22 @@ app_name = "materials"
 
 urlpatterns = [
     path("upload/", views.upload_material, name="upload"),
+    # chunked / resumable upload
+    path("uploads/", views.upload_begin, name="upload_begin"),
+    path("uploads/<uuid:upload_id>/", views.upload_chunk, name="upload_chunk"),
+    path("uploads/<uuid:upload_id>/complete/", views.upload_complete, name="upload_complete"),
     path("browse/", views.browse_materials, name="browse"),
     path("universities/", views.universities_list, name="universities"),
     path("<int:pk>/", views.material_detail, name="material_detail"),
+    # live update (SSE)
+    path("events/", views.material_events, name="events"),
+    path("<int:pk>/events/", views.material_events, name="material_events"),
 
     path("<int:pk>/upvote/", views.toggle_upvote, name="toggle_upvote"),
     path("<int:pk>/downvote/", views.toggle_downvote, name="toggle_downvote"),
     # comments
     path("<int:pk>/comment/", views.add_comment, name="add_comment"),
+    path("<int:pk>/comments/", views.material_comments, name="comments"),
 
     # materials/urls.py
     path("<int:pk>/reply/", views.add_reply, name="add_reply"),
@@ -1,107 +1,323 @@
 # materials/views.py
-from django.http import FileResponse, Http404
-from django.shortcuts import render, redirect, get_object_or_404
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import MaterialForm
-from django.core.paginator import Paginator
+from .pagination import CachedCountPaginator, KeysetPaginator
 from .models import Material, University, Category
 from django.http import JsonResponse
 from .models import Material, Upvote
 from .models import Downvote
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.decorators.http import require_POST
 from django.template.loader import render_to_string
 from .forms import CommentForm
-from .models import Comment
+from .models import Comment, UploadSession
 from django.db.models import F
-import mimetypes, os
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+import json, mimetypes, os
 from django.db.models import Q
+from . import (
+    counters, download_stats, downloads, events, facets, fragments, lookups, processing, ranking,
+    search, uploads, votes,
+)
+from .comments import attach_comment_trees, delete_subtree, load_more_roots
+from .upload_handlers import MaterialUploadHandler, content_length, too_large
+from studyvault.pagecache import cache_anonymous_page, material_tag, tag
+from studyvault.replicas import read_from_replica
 
 
 
 
 
+@csrf_exempt
 @login_required
 def upload_material(request):
+    # ✅ Body পড়ার আগেই handler বসাতে হয়, তাই CSRF check (যেটা request.POST পড়ে)
+    # handler বসানোর পরে — Django docs-এর csrf_exempt + csrf_protect pattern
+    handler = MaterialUploadHandler(request)
+    if request.method == "POST" and too_large(content_length(request.META)):
+        # ✅ CSRF check-এর আগেই: token body-তে, আর এত বড় body আমরা পড়বই না।
+        # কিছু save হয় না, শুধু form error — তাই এখানে CSRF লাগে না
+        handler.reject_oversized()
+        return _render_upload(request, _rejected_form(handler))
+    request.upload_handlers.insert(0, handler)
+    return _upload_material(request, handler)
+
+
+def _rejected_form(handler):
+    # body পড়া হয়নি, তাই কোনো field নেই — "required" গুলো বাদ দিয়ে শুধু আসল কারণ
+    form = MaterialForm(data={})
+    form.errors.clear()
+    form.add_error(None, handler.error)
+    return form
+
+
+def _render_upload(request, form):
+    return render(request, "materials/upload.html", {
+        "form": form,
+        "chunk_size": uploads.CHUNK_SIZE,
+    })
+
+
+@csrf_protect
+def _upload_material(request, handler):
     if request.method == "POST":
         form = MaterialForm(request.POST, request.FILES)
-        if form.is_valid():
-            material = form.save(commit=False)
-            material.uploader = request.user
-            material.save()
+        valid = form.is_valid()
+        if handler.error:
+            # stream-এই বাদ পড়েছে: "required" এর বদলে আসল কারণ দেখাই
+            if handler.aborted:
+                form = _rejected_form(handler)
+            else:
+                # ফাইলের পরের field গুলো stream থামানোয় আসেনি — ওদের "required" বাদ
+                for name in [n for n in form.errors if n != "__all__" and n not in request.POST]:
+                    del form.errors[name]
+                form.add_error("file", handler.error)
+        elif valid:
+            _save_new_material(form, request.user)
             messages.success(request, "Material uploaded successfully!")
             return redirect("materials:upload")
     else:
         form = MaterialForm()
 
-    return render(request, "materials/upload.html", {"form": form})
+    return _render_upload(request, form)
+
+
+def _save_new_material(form, user):
+    material = form.save(commit=False)
+    material.uploader = user
+    # ✅ checksum/thumbnail/text এখানে না — worker পরে করবে
+    with transaction.atomic():
+        material.save()
+        processing.enqueue(material)
+    return material
+
+
+# ---------- ✅ Chunked / resumable upload (materials/uploads.py) ----------
+
+def _upload_error(exc):
+    data = {"ok": False, "error": str(exc)}
+    if isinstance(exc, uploads.OffsetMismatch):
+        data["offset"] = exc.offset
+    return JsonResponse(data, status=exc.status)
+
+
+@login_required
+@require_POST
+def upload_begin(request):
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Invalid JSON."}, status=400)
+    try:
+        session = uploads.begin(
+            request.user, payload.get("filename"), payload.get("size"), payload.get("sha256")
+        )
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse({
+        "ok": True,
+        "upload_id": str(session.pk),
+        "offset": 0,
+        "chunk_size": uploads.CHUNK_SIZE,
+    }, status=201)
+
+
+@login_required
+def upload_chunk(request, upload_id):
+    session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+
+    if request.method in ("GET", "HEAD"):
+        return JsonResponse({"ok": True, "offset": session.received, "size": session.size})
+    if request.method == "DELETE":
+        uploads.discard(session)
+        return JsonResponse({"ok": True})
+    if request.method not in ("PUT", "PATCH"):
+        return JsonResponse({"ok": False, "error": "Method not allowed."}, status=405)
+
+    try:
+        offset = int(request.headers.get("Upload-Offset", ""))
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Upload-Offset header required."}, status=400)
+
+    try:
+        # request.body ছুঁই না — তাহলে পুরো chunk memory-তে উঠত
+        new_offset = uploads.write_chunk(session, offset, request, length)
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse({"ok": True, "offset": new_offset, "size": session.size})
+
 
+@login_required
+@require_POST
+def upload_complete(request, upload_id):
+    session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+    try:
+        upload = uploads.finish(session)
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+
+    with upload:
+        form = MaterialForm(request.POST, {"file": upload})
+        if not form.is_valid():
+            # session রেখে দিই — form ঠিক করে আবার complete করা যাবে
+            return JsonResponse({"ok": False, "errors": form.errors}, status=400)
+        material = _save_new_material(form, request.user)
+    uploads.discard(session)
+
+    messages.success(request, "Material uploaded successfully!")
+    return JsonResponse({
+        "ok": True,
+        "material_id": material.pk,
+        "redirect": reverse("materials:upload"),
+    }, status=201)
+
+PER_PAGE = 10
+
+
+@cache_anonymous_page("browse")
+@read_from_replica
 def browse_materials(request):
     # base queryset
     qs = Material.objects.all().select_related(
         "category", "department", "semester", "uploader"
     )
 
-    # ------- Search -------
-    q = request.GET.get("q")
+    # ------- Search (full-text index, relevance অনুযায়ী sort) -------
+    q = (request.GET.get("q") or "").strip()
     if q:
-        qs = qs.filter(title__icontains=q) | qs.filter(description__icontains=q)
+        qs = search.search(qs, q)
 
     # ------- Route params (optional) -------
-    category_id = request.GET.get("category")
-    if category_id:
-        qs = qs.filter(category__id=category_id)
-
-    department = request.GET.get("department")
-    if department:
-        qs = qs.filter(department__id=department)
-
-    semester = request.GET.get("semester")
-    if semester:
-        qs = qs.filter(semester__id=semester)
-
-    university = request.GET.get("university")
-    if university:
-        qs = qs.filter(university__id=university)
-
-    # ------- NEW: kind filter (pdf/docx/pptx) -------
-    file_kinds = ["pdf", "docx", "pptx"]
-    kind = (request.GET.get("kind") or "").lower()
-    if kind in file_kinds:
-        qs = qs.filter(
-            Q(category__slug=kind) |
-            Q(file__iendswith=f".{kind}")
-        )
+    # category / department / semester / university / kind (pdf/docx/pptx)
+    filters = facets.active_filters(request.GET)
+    kind = filters.get("kind", "")
+
+    # ✅ sidebar count: সব facet একটাই GROUP BY থেকে (materials/facets.py)
+    facet_counts = facets.compute(qs, filters)
+    qs = facets.apply(qs, filters)
 
     # ------- Pills data (show only pdf/docx/pptx) -------
     core_slugs = ["pdf", "docx", "pptx"]          # <<-- এখানে ডিফাইন
-    core_categories_qs = Category.objects.filter(
-        slug__in=core_slugs
-    ).only("id", "name", "slug")
-
+    # ✅ lookup cache থেকে (materials/lookups.py) — প্রতি request-এ Category query না;
     # order: pdf, docx, pptx
-    slug_order_map = {s: i for i, s in enumerate(core_slugs)}
-    core_categories = sorted(
-        core_categories_qs, key=lambda c: slug_order_map.get(c.slug, 999)
-    )
+    core_categories = [
+        cat for cat in (lookups.by_slug(Category, slug) for slug in core_slugs) if cat
+    ]
+    kind_counts = {f.value: f.count for f in facet_counts["kind"]}
+    for cat in core_categories:
+        cat.facet_count = kind_counts.get(cat.slug, 0)
 
     # ------- Pagination -------
-    paginator = Paginator(qs, 10)
+    # count cache key: শুধু filter param গুলো (page/cursor/sort বাদ)
+    count_key = [
+        (k, v) for k, v in request.GET.items() if k not in ("page", "cursor", "sort")
+    ]
+    # ✅ ?sort=hot|top — indexed score column (materials/ranking.py), default নতুনগুলো আগে
+    sort = request.GET.get("sort", "")
+    sort_key = ranking.SORTS.get(sort, "created_at")
     page = request.GET.get("page")
-    materials = paginator.get_page(page)
+    if q or page:
+        # search relevance order / পুরোনো ?page= link -> offset paging
+        if sort in ranking.SORTS:
+            qs = qs.order_by(f"-{sort_key}", "-id")
+        paginator = CachedCountPaginator(qs, PER_PAGE, count_key=count_key)
+        materials = paginator.get_page(page)
+        next_query = _page_query(request, page=materials.next_page_number()) if materials.has_next() else ""
+        prev_query = _page_query(request, page=materials.previous_page_number()) if materials.has_previous() else ""
+        num_pages = paginator.num_pages
+    else:
+        # default: keyset (cursor) paging on (created_at, id) / (score, id)
+        materials = KeysetPaginator(qs, PER_PAGE, count_key=count_key, key=sort_key).get_page(
+            request.GET.get("cursor")
+        )
+        next_query = _page_query(request, cursor=materials.next_cursor) if materials.has_next() else ""
+        prev_query = _page_query(request, cursor=materials.previous_cursor) if materials.has_previous() else ""
+        num_pages = materials.num_pages
+    # anonymous page cache: এই material গুলোর কোনোটা বদলালে page purge
+    tag(request, *(material_tag(m.pk) for m in materials.object_list))
+    # card গুলো fragment cache থেকে; miss হলে comment tree (একটাই query) লোড করে render
+    materials.object_list = fragments.render_cards(request, materials.object_list)
 
     return render(request, "materials/browse.html", {
         "materials": materials,
         "core_categories": core_categories,  # pills-এর জন্য
         "active_kind": kind,                 # কোনটা সিলেক্ট
+        "sort_links": _sort_links(request, sort),
+        "facet_groups": _facet_groups(request, facet_counts),
         "q": q or "",
+        "num_pages": num_pages,
+        "next_query": next_query,
+        "prev_query": prev_query,
     })
 
+
+FACET_TITLES = [
+    ("department", "Department"),
+    ("semester", "Semester/Year"),
+    ("university", "University"),
+]
+
+
+def _facet_groups(request, facet_counts):
+    """Sidebar-এর জন্য: প্রতিটা value-র count আর click করলে কোন query (toggle)।"""
+    groups = []
+    for dim, title in FACET_TITLES:
+        values = []
+        for f in facet_counts[dim]:
+            query = request.GET.copy()
+            for key in ("page", "cursor", dim):
+                query.pop(key, None)
+            if not f.active:
+                query[dim] = f.value
+            values.append({
+                "label": f.label, "count": f.count, "active": f.active,
+                "query": query.urlencode(),
+            })
+        if values:
+            groups.append({"title": title, "values": values})
+    return groups
+
+
+SORT_TITLES = [("", "New"), ("hot", "Hot"), ("top", "Top")]
+
+
+def _sort_links(request, active):
+    links = []
+    for value, title in SORT_TITLES:
+        query = request.GET.copy()
+        for key in ("page", "cursor", "sort"):
+            query.pop(key, None)
+        if value:
+            query["sort"] = value
+        links.append({"title": title, "query": query.urlencode(), "active": value == active})
+    return links
+
+
+def _page_query(request, **params):
+    """বর্তমান filter গুলো রেখে শুধু page/cursor বদলানো query string।"""
+    query = request.GET.copy()
+    query.pop("page", None)
+    query.pop("cursor", None)
+    query.update(params)
+    return query.urlencode()
+
+@cache_anonymous_page("universities")
+@read_from_replica
 def universities_list(request):
-    universities = University.objects.all().order_by("name")
+    universities = lookups.objects(University)
     return render(request, "materials/universities.html", {"universities": universities})
 
+@cache_anonymous_page("detail")
+@read_from_replica
 def material_detail(request, pk):
+    tag(request, material_tag(pk))
     material = get_object_or_404(Material, pk=pk)
 
     # ফাইল এক্সটেনশন বের করা
@@ -113,77 +329,105 @@ def material_detail(request, pk):
     else:
         file_type = "other"
 
+    attach_comment_trees([material], limit=None)
+
     return render(request, "materials/detail.html", {
         "material": material,
         "file_type": file_type,
     })
 
-@require_POST
-@login_required
-def toggle_upvote(request, pk):
-    material = get_object_or_404(Material, pk=pk)
 
-    existing = Upvote.objects.filter(user=request.user, material=material)
-    if existing.exists():
-        existing.delete()
-        your_vote = "none"
-    else:
-        Downvote.objects.filter(user=request.user, material=material).delete()
-        Upvote.objects.create(user=request.user, material=material)
-        your_vote = "up"
+def material_comments(request, pk):
+    """
+    "Load more" — offset থেকে পরের কয়েকটা top-level comment (reply সহ) HTML হিসেবে।
+    """
+    material = get_object_or_404(Material.objects.only("id"), pk=pk)
+    try:
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        offset = 0
+
+    roots, remaining = load_more_roots(material, offset)
+    html = "".join(
+        render_to_string("materials/_comment.html", {"c": c}, request=request)
+        for c in roots
+    )
+    return JsonResponse({
+        "ok": True,
+        "html": html,
+        "next_offset": offset + len(roots),
+        "remaining": remaining,
+    })
+
+async def _vote_response(request, pk, direction):
+    user = await request.auser()
+    try:
+        your_vote, ups, downs = await votes.atoggle_vote(user, pk, direction)
+    except Material.DoesNotExist:
+        raise Http404("Material not found")
 
     return JsonResponse({
         "status": "ok",
         "your_vote": your_vote,
-        "total_upvotes": material.upvotes.count(),
-        "total_downvotes": material.downvotes.count(),
+        "total_upvotes": ups,
+        "total_downvotes": downs,
     })
 
+# ✅ vote / comment / download async — ASGI (uvicorn) তে thread-pool adapter ছাড়াই চলে।
+# Transaction লাগে এমন অংশ (async ORM-এ atomic নেই) আর template render (lazy
+# query থাকতে পারে) একটাই sync_to_async hop-এ।
+
+@require_POST
+@login_required
+async def toggle_upvote(request, pk):
+    return await _vote_response(request, pk, votes.UP)
+
 @login_required
 @require_POST
-def toggle_downvote(request, pk):
-    material = get_object_or_404(Material, pk=pk)
+async def toggle_downvote(request, pk):
+    return await _vote_response(request, pk, votes.DOWN)
 
-    existing = Downvote.objects.filter(user=request.user, material=material)
-    if existing.exists():
-        existing.delete()
-        your_vote = "none"
-    else:
-        Upvote.objects.filter(user=request.user, material=material).delete()
-        Downvote.objects.create(user=request.user, material=material)
-        your_vote = "down"
 
-    return JsonResponse({
-        "status": "ok",
-        "your_vote": your_vote,
-        "total_upvotes": material.upvotes.count(),
-        "total_downvotes": material.downvotes.count(),
+def _render_comment(request, c):
+    return render_to_string("materials/_comment.html", {"c": c}, request=request)
+
+
+@sync_to_async
+def _save_comment(request, c):
+    with transaction.atomic():
+        c.save()
+        counters.bump(c.material_id, comment_count=1)
+        count = Material.objects.filter(pk=c.material_id).values_list("comment_count", flat=True).get()
+    html = _render_comment(request, c)
+    # commit হয়ে গেছে — page খোলা থাকা বাকিরাও দেখুক
+    events.publish(c.material_id, events.COMMENT, {
+        "id": c.pk, "material": c.material_id, "parent": c.parent_id, "html": html, "count": count,
     })
+    return html, count
 
 
 @login_required
 @require_POST
-def add_comment(request, pk):
-    material = get_object_or_404(Material, pk=pk)
+async def add_comment(request, pk):
+    material = await aget_object_or_404(Material.objects.only("id"), pk=pk)
     form = CommentForm(request.POST)
     if form.is_valid():
         c = form.save(commit=False)
         c.material = material
-        c.user = request.user
-        c.save()
-        html = render_to_string("materials/_comment.html", {"c": c}, request=request)
-        return JsonResponse({"ok": True, "html": html, "count": material.comments.count()})
+        c.user = await request.auser()
+        html, count = await _save_comment(request, c)
+        return JsonResponse({"ok": True, "html": html, "count": count, "comment_id": c.pk})
     return JsonResponse({"ok": False, "errors": form.errors}, status=400)
 
 
 @login_required
 @require_POST
-def add_reply(request, pk):
+async def add_reply(request, pk):
     """
     AJAX reply handler.
     Expect: body, parent_id  (x-www-form-urlencoded)
     """
-    material = get_object_or_404(Material, pk=pk)
+    material = await aget_object_or_404(Material.objects.only("id"), pk=pk)
 
     body = (request.POST.get("body") or "").strip()
     parent_id = request.POST.get("parent_id")
@@ -193,48 +437,86 @@ def add_reply(request, pk):
     if not parent_id:
         return JsonResponse({"ok": False, "errors": {"parent_id": ["Missing parent_id."]}}, status=400)
 
-    parent = get_object_or_404(Comment, pk=parent_id, material=material)
+    parent = await aget_object_or_404(Comment.objects.only("id"), pk=parent_id, material=material)
 
-    c = Comment.objects.create(
-        material=material,
-        user=request.user,
-        body=body,
-        parent=parent,
-    )
+    c = Comment(material=material, user=await request.auser(), body=body, parent=parent)
+    html, _ = await _save_comment(request, c)
+    return JsonResponse({"ok": True, "html": html, "comment_id": c.pk})
 
-    html = render_to_string("materials/_comment.html", {"c": c}, request=request)
-    return JsonResponse({"ok": True, "html": html})
+
+@sync_to_async
+def _delete_comment(c):
+    cid = c.pk
+    with transaction.atomic():
+        # reply গুলোও একই DELETE-এ মুছে যায়, তাই যতগুলো গেছে ততগুলো কমাই
+        deleted = delete_subtree(c)
+        counters.bump(c.material_id, comment_count=-deleted)
+        count = Material.objects.filter(pk=c.material_id).values_list("comment_count", flat=True).get()
+    events.publish(c.material_id, events.COMMENT_DELETED, {
+        "id": cid, "material": c.material_id, "count": count,
+    })
 
 
 @login_required
 @require_POST
-def delete_comment(request, comment_id):
+async def delete_comment(request, comment_id):
     """
     Delete a comment (owner or staff only). Returns JSON.
     """
-    c = get_object_or_404(Comment, pk=comment_id)
+    c = await aget_object_or_404(Comment.objects.only("id", "material_id", "user_id"), pk=comment_id)
+    user = await request.auser()
 
-    if (c.user_id != request.user.id) and (not request.user.is_staff):
+    if (c.user_id != user.id) and (not user.is_staff):
         return JsonResponse({"ok": False, "error": "forbidden"}, status=403)
 
     cid = c.id
-    c.delete()
+    await _delete_comment(c)
     return JsonResponse({"ok": True, "comment_id": cid})
 
 
-def download_file(request, pk):
-    material = get_object_or_404(Material, pk=pk)
+async def download_file(request, pk):
+    material = await aget_object_or_404(Material, pk=pk)
     file_path = material.file.path  # ধরে নিচ্ছি field নাম file
 
     if not os.path.exists(file_path):
         raise Http404("File not found")
 
-    # ✅ Download count increase
-    material.download_count = F('download_count') + 1
-    material.save(update_fields=['download_count'])
-    material.refresh_from_db(fields=['download_count'])  # আপডেট রিফ্রেশ
+    # ✅ Range / ETag / X-Accel-Redirect — materials/downloads.py
+    # disk-এ নাম hash — user আসল নামটাই পাবে
+    # ASGI হলে async file stream (uvicorn-এ পুরো ফাইল memory-তে না), WSGI হলে FileResponse
+    response = downloads.serve_file(
+        request, file_path, material.original_filename or None,
+        asynchronous=isinstance(request, ASGIRequest),
+    )
 
-    # ✅ File response তৈরি
-    response = FileResponse(open(file_path, 'rb'), as_attachment=True)
-    response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
+    # ✅ Download count increase (resume-এর বাকি অংশ বা 304 হলে না)
+    # সরাসরি UPDATE না — buffer-এ জমে, background-এ batch করে লেখা হয়
+    if response.counts_as_download:
+        await download_stats.arecord(material.pk)
+
+    return response
+
+
+async def material_events(request, pk=None):
+    """
+    SSE — ``/materials/<pk>/events/`` বা ``/materials/events/?ids=1,2,3``।
+    Event: votes {id, up, down, delta_up, delta_down}, comment {id, parent, html,
+    count}, comment_deleted {id, count}।
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI-তে প্রতিটা খোলা stream একটা worker thread আটকে রাখত; 204 পেলে
+        # EventSource আর reconnect করে না — page আগের মতই চলে
+        return HttpResponse(status=204)
+
+    if pk is not None:
+        ids = [pk]
+    else:
+        raw = (request.GET.get("ids") or "").split(",")
+        ids = list(dict.fromkeys(int(v) for v in raw if v.strip().isdigit()))[:events.MAX_CHANNELS]
+    if not ids:
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(events.stream(ids), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx যেন buffer না করে
     return response
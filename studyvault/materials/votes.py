@@ -0,0 +1,80 @@
+# materials/votes.py
+"""
+Upvote/downvote toggle — দুই view একই path দিয়ে যায়।
+
+পুরো toggle একটা transaction-এ: আগে Material row lock (Postgres-এ
+``SELECT … FOR UPDATE``; SQLite-এ ``transaction_mode=IMMEDIATE`` তাই transaction
+শুরুতেই write lock), তারপর পুরোনো vote delete / নতুন vote insert আর counter
+আপডেট। একই user-এর double-click বা অনেক user একসাথে click করলেও
+``unique_upvote_per_user_material`` এ IntegrityError হয় না, counter ভুল হয় না।
+
+নতুন count আবার গুনি না: lock নেওয়ার সময় যে counter পড়েছি তার সাথে delta যোগ।
+"""
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from . import counters, events
+from .models import Downvote, Material, Upvote
+
+UP = "up"
+DOWN = "down"
+NONE = "none"
+
+_SIDES = {
+    UP: (Upvote, "upvote_count", Downvote, "downvote_count"),
+    DOWN: (Downvote, "downvote_count", Upvote, "upvote_count"),
+}
+
+
+def toggle_vote(user, material_id, direction):
+    """
+    direction = "up" | "down".
+    আগে থেকে একই vote থাকলে সরিয়ে দেয় (none), উল্টো vote থাকলে flip করে।
+    Return: (your_vote, total_upvotes, total_downvotes)
+    Material না থাকলে ``Material.DoesNotExist``।
+    """
+    model, field, other_model, other_field = _SIDES[direction]
+
+    with transaction.atomic():
+        counts = (
+            Material.objects.select_for_update()
+            .filter(pk=material_id)
+            .values("upvote_count", "downvote_count")
+            .first()
+        )
+        if counts is None:
+            raise Material.DoesNotExist(f"Material {material_id} does not exist.")
+
+        removed = model.objects.filter(material_id=material_id, user=user).delete()[0]
+        if removed:
+            deltas = {field: -removed}
+            your_vote = NONE
+        else:
+            removed_other = other_model.objects.filter(
+                material_id=material_id, user=user
+            ).delete()[0]
+            model.objects.create(material_id=material_id, user=user)
+            deltas = {field: 1, other_field: -removed_other}
+            your_vote = direction
+
+        counters.bump(material_id, **deltas)
+        ups = counts["upvote_count"] + deltas.get("upvote_count", 0)
+        downs = counts["downvote_count"] + deltas.get("downvote_count", 0)
+        # SSE: browse/detail খোলা থাকা সবাই নতুন count পায় (commit হলে তবেই)
+        transaction.on_commit(lambda: events.publish(material_id, events.VOTES, {
+            "id": material_id,
+            "up": ups,
+            "down": downs,
+            "delta_up": deltas.get("upvote_count", 0),
+            "delta_down": deltas.get("downvote_count", 0),
+        }))
+
+    return your_vote, ups, downs
+
+
+async def atoggle_vote(user, material_id, direction):
+    """
+    Async view-এর জন্য। Django-র async ORM-এ transaction / select_for_update
+    নেই, তাই পুরো toggle একটাই thread hop-এ sync হিসেবে চলে।
+    """
+    return await sync_to_async(toggle_vote)(user, material_id, direction)
@@ -0,0 +1,183 @@
+# studyvault/benchdata.py
+"""
+Benchmark-এর synthetic data — university, material, vote আর গভীর comment
+thread (reply-এর reply-এর reply …), সব ``bench-`` user-এর নামে, যাতে
+``clear()`` শুধু এগুলোই মুছে দেয়।
+
+Material গুলো ORM ``save()`` দিয়ে (search index, blob ref_count, university
+count signal চলে); vote/comment অনেক বেশি তাই ``bulk_create``, শেষে
+counter/score ``reconcile`` আর card cache bump। ``seed`` একই হলে একই data।
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from materials import counters, fragments, ranking
+
+from . import pagecache
+from materials.models import (
+    Category, Comment, Department, DownloadDay, Downvote, Material, SemesterYear, University,
+    Upvote,
+)
+
+PREFIX = "bench-"
+UNIVERSITY_PREFIX = "Bench University"
+
+KINDS = {
+    # category slug -> (category name, file payload)
+    "pdf": ("PDF", b"%PDF-1.4\n% studyvault bench\n"),
+    "docx": ("DOCX", b"PK\x03\x04 studyvault bench docx"),
+    "pptx": ("PPTX", b"PK\x03\x04 studyvault bench pptx"),
+}
+DEPARTMENTS = ["CSE", "EEE", "BBA", "Civil", "Math", "Physics"]
+SEMESTERS = [f"{n} Semester" for n in ("1st", "2nd", "3rd", "4th", "5th", "6th", "7th", "8th")]
+# title-এর শব্দ — search (?q=) scenario-র match যেন থাকে
+WORDS = [
+    "algorithms", "graph", "circuit", "signals", "database", "network", "compiler",
+    "calculus", "thermodynamics", "accounting", "marketing", "structures", "notes",
+    "lecture", "midterm", "final", "solutions", "assignment", "lab", "slides",
+]
+BATCH = 500
+
+
+def _taxonomy(universities):
+    categories = [
+        Category.objects.get_or_create(slug=slug, defaults={"name": name})[0]
+        for slug, (name, _) in KINDS.items()
+    ]
+    departments = [Department.objects.get_or_create(name=n)[0] for n in DEPARTMENTS]
+    semesters = [SemesterYear.objects.get_or_create(name=n)[0] for n in SEMESTERS]
+    unis = [
+        University.objects.get_or_create(name=f"{UNIVERSITY_PREFIX} {i + 1}")[0]
+        for i in range(universities)
+    ]
+    return categories, departments, semesters, unis
+
+
+def _users(n):
+    User = get_user_model()
+    start = User.objects.filter(username__startswith=f"{PREFIX}user-").count()
+    User.objects.bulk_create(
+        [User(username=f"{PREFIX}user-{start + i}") for i in range(n)], batch_size=BATCH
+    )
+    return list(User.objects.filter(username__startswith=f"{PREFIX}user-").order_by("pk"))
+
+
+def generate(*, universities=5, materials=200, users=50, votes=2000, threads=2, depth=4,
+             seed=0, log=None):
+    """
+    ``threads`` টা top-level comment প্রতি material-এ, প্রতিটার নিচে ``depth - 1``
+    স্তর reply। Generate হওয়া সংখ্যা গুলো dict হিসেবে return।
+    """
+    rng = random.Random(seed)
+    log = log or (lambda msg: None)
+    now = timezone.now()
+
+    with transaction.atomic():
+        categories, departments, semesters, unis = _taxonomy(universities)
+        people = _users(users)
+        log(f"{len(people)} users, {len(unis)} universities")
+
+        created = []
+        for i in range(materials):
+            category = rng.choice(categories)
+            words = rng.sample(WORDS, 3)
+            material = Material(
+                uploader=rng.choice(people),
+                title=" ".join(words).title(),
+                description=f"Bench material {i}: " + " ".join(rng.sample(WORDS, 8)),
+                university=rng.choice(unis),
+                category=category,
+                department=rng.choice(departments),
+                semester=rng.choice(semesters),
+                processing_status=Material.STATUS_READY,
+            )
+            # একই payload -> একটাই blob (content-addressed storage)
+            material.file.save(f"bench-{i}.{category.slug}", ContentFile(KINDS[category.slug][1]),
+                               save=False)
+            material.save()
+            created.append(material)
+        log(f"{len(created)} materials")
+
+        # created_at ছড়িয়ে দেই (keyset/hot sort বাস্তবসম্মত), download count random —
+        # DownloadDay-এও, যাতে reconcile এর কাছে counter ঠিক থাকে
+        days = []
+        for material in created:
+            material.created_at = now - timedelta(seconds=rng.randrange(90 * 24 * 3600))
+            material.download_count = rng.randrange(500)
+            if material.download_count:
+                day = (now - timedelta(days=rng.randrange(30))).date()
+                days.append(DownloadDay(material=material, day=day, count=material.download_count))
+        Material.objects.bulk_update(created, ["created_at", "download_count"], batch_size=BATCH)
+        DownloadDay.objects.bulk_create(days, batch_size=BATCH)
+
+        pairs = set()
+        limit = min(votes, len(people) * len(created))
+        while len(pairs) < limit:
+            pairs.add((rng.randrange(len(people)), rng.randrange(len(created))))
+        up, down = [], []
+        for u, m in sorted(pairs):
+            target = up if rng.random() < 0.75 else down
+            model = Upvote if target is up else Downvote
+            target.append(model(user=people[u], material=created[m]))
+        Upvote.objects.bulk_create(up, batch_size=BATCH)
+        Downvote.objects.bulk_create(down, batch_size=BATCH)
+        log(f"{len(up)} upvotes, {len(down)} downvotes")
+
+        # level করে level — parent-এর pk লাগে, bulk_create সেটা ফেরত দেয়
+        level = [
+            Comment(material=m, user=rng.choice(people), body=f"Question about {rng.choice(WORDS)}?")
+            for m in created for _ in range(threads)
+        ]
+        comments = 0
+        for _ in range(depth):
+            if not level:
+                break
+            Comment.objects.bulk_create(level, batch_size=BATCH)
+            comments += len(level)
+            level = [
+                Comment(material_id=c.material_id, user=rng.choice(people), parent=c,
+                        body=f"Reply: {' '.join(rng.sample(WORDS, 4))}")
+                for c in level
+            ]
+        log(f"{comments} comments ({threads} threads x {depth} deep per material)")
+
+        ids = [m.pk for m in created]
+        counters.reconcile(Material.objects.filter(pk__in=ids))
+        ranking.recompute(Material.objects.filter(pk__in=ids))
+        transaction.on_commit(lambda: fragments.bump(*ids))
+        # bulk_create-এ signal নেই — vote/comment পাওয়া material-এর cached page
+        pagecache.purge(*(pagecache.material_tag(pk) for pk in ids))
+
+    return {
+        "universities": len(unis),
+        "users": len(people),
+        "materials": len(created),
+        "upvotes": len(up),
+        "downvotes": len(down),
+        "comments": comments,
+    }
+
+
+def clear():
+    """সব ``bench-`` user (আর তাদের material/vote/comment) আর bench university মুছে দেয়।"""
+    User = get_user_model()
+    with transaction.atomic():
+        deleted, _ = User.objects.filter(username__startswith=PREFIX).delete()
+        University.objects.filter(name__startswith=UNIVERSITY_PREFIX).delete()
+    return deleted
+
+
+def counts():
+    """Report-এর meta — DB-তে এখন কত data (শুধু bench না, সব)।"""
+    return {
+        "universities": University.objects.count(),
+        "materials": Material.objects.count(),
+        "upvotes": Upvote.objects.count(),
+        "downvotes": Downvote.objects.count(),
+        "comments": Comment.objects.count(),
+    }
@@ -0,0 +1,206 @@
+# studyvault/benchmarking.py
+"""
+bench_suite command-এর helper — server spawn, concurrent HTTP load, percentile
+আর diffable JSON report।
+
+Report-এ timestamp/hostname রাখি না, key sorted, float round করা — দুই run-এর
+file সরাসরি ``git diff`` / ``diff -u`` করা যায়।
+"""
+import http.client
+import importlib.util
+import json
+import os
+import re
+import secrets
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from django.test import Client
+
+SERVERS = {
+    # একই worker সংখ্যা — পার্থক্য শুধু WSGI thread vs ASGI event loop
+    "wsgi": "gunicorn studyvault.wsgi:application --bind 127.0.0.1:{port} "
+            "--workers {workers} --threads 8 --log-level warning",
+    "asgi": "uvicorn studyvault.asgi:application --host 127.0.0.1 --port {port} "
+            "--workers {workers} --log-level warning --no-access-log",
+}
+
+
+def wait_for_port(port, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(kind, workers=1, env=None):
+    """(process, port); server package install না থাকলে (None, None)। ``env``: বাড়তি env var।"""
+    port = free_port()
+    argv = shlex.split(SERVERS[kind].format(port=port, workers=workers))
+    if importlib.util.find_spec(argv[0]) is None:
+        return None, None
+    # virtualenv-এর python দিয়ে module হিসেবে চালাই
+    process = subprocess.Popen([sys.executable, "-m", *argv], env={**os.environ, **(env or {})})
+    if not wait_for_port(port):
+        process.terminate()
+        raise RuntimeError(f"{kind} server did not start on port {port}.")
+    return process, port
+
+
+def session_headers(user, host="localhost"):
+    """``user`` হিসেবে logged-in raw HTTP request-এর header (session + CSRF)।"""
+    client = Client()
+    client.force_login(user)
+    # CSRF: cookie আর header-এ একই token (unmasked secret) দিলেই চলে
+    csrf = secrets.token_hex(16)
+    return {
+        "Cookie": f"sessionid={client.cookies['sessionid'].value}; csrftoken={csrf}",
+        "X-CSRFToken": csrf,
+        "Referer": "http://localhost/",
+        "Host": host,
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+
+
+# ---------------------------------------------------------------- stats
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile (``p`` 0–100) — আগে থেকে sort করা list।"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies_ms, elapsed, errors=0):
+    latencies = sorted(latencies_ms)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+# ---------------------------------------------------------------- load
+
+def hammer(host, port, method, path, body, headers, concurrency, duration):
+    """``concurrency`` টা keep-alive connection থেকে ``duration`` সেকেন্ড ধরে একই request।"""
+    results = {"ok": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        ok, errors, latencies = 0, 0, []
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                # download হলে পুরো body পড়ি — নাহলে keep-alive connection নষ্ট
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            if response.status < 400:
+                ok += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+        conn.close()
+        with lock:
+            results["ok"] += ok
+            results["errors"] += errors
+            results["latencies"].extend(latencies)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(results["latencies"], time.perf_counter() - started, results["errors"])
+
+
+_SAMPLE = re.compile(r'^(studyvault_requests_total|studyvault_db_queries_total)\{view="([^"]*)"[^}]*\} (\S+)$')
+
+
+def scrape_query_totals(host, port, headers, token=""):
+    """
+    Server-এর ``/metrics`` থেকে {view: [requests, queries]} — আগে/পরে দুইবার
+    নিয়ে বিয়োগ করলে HTTP run-এর queries/request। ``token``: server-এর
+    METRICS_TOKEN। Endpoint না পেলে / 403 হলে None।
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        conn.request("GET", "/metrics", headers={
+            "Host": headers.get("Host", "localhost"),
+            "Authorization": f"Bearer {token}",
+        })
+        response = conn.getresponse()
+        text = response.read().decode()
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+    if response.status != 200:
+        return None
+    totals = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if match:
+            name, view, value = match.groups()
+            slot = totals.setdefault(view, [0, 0])
+            slot[0 if name == "studyvault_requests_total" else 1] += float(value)
+    return totals
+
+
+# ---------------------------------------------------------------- report
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def dump_report(report):
+    return json.dumps(_rounded(report), indent=2, sort_keys=True) + "\n"
+
+
+def compare(baseline, current):
+    """দুই report-এর একই (mode, scenario) জোড়ার p95 আর rps-এর % পরিবর্তন।"""
+    rows = []
+    for mode, scenarios in sorted(current.get("results", {}).items()):
+        old_scenarios = baseline.get("results", {}).get(mode, {})
+        for name, new in sorted(scenarios.items()):
+            old = old_scenarios.get(name)
+            if not old:
+                continue
+            rows.append((mode, name, {
+                key: ((new[key] - old[key]) / old[key] * 100) if old[key] else None
+                for key in ("p95_ms", "rps")
+            }))
+    return rows
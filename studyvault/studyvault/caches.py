@@ -0,0 +1,74 @@
+# studyvault/caches.py
+"""
+Environment দেখে CACHES বানায় — settings.py শুধু ``CACHES = cache_config(testing=TESTING)``।
+
+আগে CACHES ছিল না, মানে Django-র default LocMemCache: প্রতিটা gunicorn/uvicorn
+worker-এর আলাদা cache। Card fragment, facet count, lookup version, leaderboard,
+page cache — একটা worker invalidate করলে বাকিরা জানত না, আর প্রতিটা worker
+আলাদা করে নিজের cache ভরত। এখন default একটা shared backend:
+
+  CACHE_URL না থাকলে / ``file:///path``  -> FileBasedCache (default <tmp>/studyvault-cache,
+                                            source tree-র বাইরে) — এক machine-এর সব worker
+                                            একই directory
+  ``redis://host:6379/0``                 -> Django RedisCache (``redis`` package লাগবে)
+  ``memcached://host:11211``              -> PyMemcacheCache (``pymemcache`` লাগবে)
+  ``locmem://``                           -> LocMemCache (একটা process, পুরোনো আচরণ)
+
+অন্য env:
+  CACHE_KEY_PREFIX   (default "studyvault") — একই Redis-এ একাধিক deploy
+  CACHE_TIMEOUT      (default 300 sec) — যে set() timeout দেয় না তার জন্য
+  CACHE_MAX_ENTRIES  (default 20000) — file/locmem এর cull সীমা
+
+Test run (``manage.py test``) সবসময় LocMemCache — test-এর ``cache.clear()``
+developer-এর / deploy-এর shared cache মুছত, আর আগের run-এর entry (একই row id)
+পরের run-এ ঢুকে পড়ত।
+"""
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from .db import _env_int
+
+
+def _file_config(path):
+    return {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(path),
+    }
+
+
+DEFAULT_FILE_LOCATION = Path(tempfile.gettempdir()) / "studyvault-cache"
+
+
+def _backend_from_url(url):
+    if not url or url.startswith("file:"):
+        path = unquote(url[len("file://"):]) if url.startswith("file://") else ""
+        return _file_config(path or DEFAULT_FILE_LOCATION)
+
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss"):
+        return {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": url}
+    if parsed.scheme in ("memcached", "pymemcache"):
+        return {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": parsed.netloc,
+        }
+    if parsed.scheme == "locmem":
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": parsed.netloc or "studyvault",
+        }
+    raise ValueError(f"Unsupported CACHE_URL scheme: {parsed.scheme!r}")
+
+
+def cache_config(env=None, testing=False):
+    env = os.environ if env is None else env
+    url = "locmem://studyvault-tests" if testing else env.get("CACHE_URL", "").strip()
+    default = _backend_from_url(url)
+    default["KEY_PREFIX"] = env.get("CACHE_KEY_PREFIX", "studyvault")
+    default["TIMEOUT"] = _env_int(env, "CACHE_TIMEOUT", 300)
+    if default["BACKEND"].endswith(("FileBasedCache", "LocMemCache")):
+        # default 300 — browse-এর card/page entry তে এর চেয়ে অনেক বেশি লাগে
+        default["OPTIONS"] = {"MAX_ENTRIES": _env_int(env, "CACHE_MAX_ENTRIES", 20000)}
+    return {"default": default}
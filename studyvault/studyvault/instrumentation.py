@@ -0,0 +1,317 @@
+# studyvault/instrumentation.py
+"""
+প্রতি request-এ কত query, কত SQL time, template render কত সময়, response কত
+বড় — resolved URL name (``materials:browse``, ``materials:toggle_upvote``,
+``home`` …) অনুযায়ী জমা হয়, ``/metrics`` এ Prometheus text format-এ।
+
+  * SQL: প্রতিটা DB connection-এ একটা ``execute_wrapper`` (connection_created
+    signal দিয়ে বসে)। কোন request-এর হিসাব সেটা ContextVar থেকে — তাই async
+    view-এর ``sync_to_async`` thread-এর query-ও একই request-এ গোনা হয়।
+  * Template: ``InstrumentedTemplates`` backend (settings TEMPLATES) শুধু
+    বাইরের render টা মাপে; ভিতরের ``{% include %}`` আলাদা করে না। Render-এর
+    সময় lazy queryset চললে সেই query SQL time-এও আছে, template time-এও।
+  * Budget: ``QUERY_BUDGETS = {"materials:browse": 8, …}`` — বেশি হলে warning log
+    আর ``studyvault_query_budget_exceeded_total``; test-এ
+    ``studyvault.testing.QueryBudgetMixin`` একই budget দিয়ে fail করে।
+
+Metric গুলো process-এর memory তে — gunicorn/uvicorn-এর প্রতিটা worker নিজের
+হিসাব দেখায় (Prometheus প্রতিটা worker আলাদা scrape করে বা sum করে)।
+"""
+import hmac
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+# request duration histogram (সেকেন্ড)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED = "<unresolved>"
+# failing budget-এর message-এ এর বেশি SQL দেখাই না
+MAX_KEPT_SQL = 200
+
+_current = ContextVar("studyvault_request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("queries", "sql_seconds", "template_seconds", "statements", "_rendering")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.statements = []
+        self._rendering = False
+
+    def add_query(self, sql, seconds):
+        self.queries += 1
+        self.sql_seconds += seconds
+        if len(self.statements) < MAX_KEPT_SQL:
+            self.statements.append(sql)
+
+
+def query_budgets():
+    return getattr(settings, "QUERY_BUDGETS", {})
+
+
+# ---------------------------------------------------------------- collectors
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(sql, time.perf_counter() - start)
+
+
+def _install(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(_install, dispatch_uid="studyvault.instrumentation")
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    @property
+    def origin(self):
+        return self.template.origin
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None or stats._rendering:
+            return self.template.render(context, request)
+        stats._rendering = True
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - start
+            stats._rendering = False
+
+
+class InstrumentedTemplates(DjangoTemplates):
+    """DjangoTemplates-ই, শুধু render() এর সময় request stats-এ যোগ হয়।"""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+# ---------------------------------------------------------------- registry
+
+class _ViewMetrics:
+    __slots__ = ("requests", "queries", "sql_seconds", "template_seconds",
+                 "response_bytes", "max_queries", "over_budget", "duration_buckets",
+                 "duration_sum")
+
+    def __init__(self):
+        self.requests = {}  # (method, status class) -> count
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.response_bytes = 0
+        self.max_queries = 0
+        self.over_budget = 0
+        self.duration_buckets = [0] * len(BUCKETS)
+        self.duration_sum = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, method, status, stats, size, duration):
+        budget = query_budgets().get(view)
+        key = (method, f"{status // 100}xx")
+        with self._lock:
+            m = self._views.get(view)
+            if m is None:
+                m = self._views[view] = _ViewMetrics()
+            m.requests[key] = m.requests.get(key, 0) + 1
+            m.queries += stats.queries
+            m.sql_seconds += stats.sql_seconds
+            m.template_seconds += stats.template_seconds
+            m.response_bytes += size
+            m.max_queries = max(m.max_queries, stats.queries)
+            m.duration_sum += duration
+            for i, bound in enumerate(BUCKETS):
+                if duration <= bound:
+                    m.duration_buckets[i] += 1
+            if budget is not None and stats.queries > budget:
+                m.over_budget += 1
+        if budget is not None and stats.queries > budget:
+            logger.warning("%s ran %d queries (budget %d).", view, stats.queries, budget)
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: {
+                    "requests": dict(m.requests),
+                    "queries": m.queries,
+                    "sql_seconds": m.sql_seconds,
+                    "template_seconds": m.template_seconds,
+                    "response_bytes": m.response_bytes,
+                    "max_queries": m.max_queries,
+                    "over_budget": m.over_budget,
+                    "duration_buckets": list(m.duration_buckets),
+                    "duration_sum": m.duration_sum,
+                }
+                for view, m in self._views.items()
+            }
+
+    # ------------------------------------------------------------ exposition
+
+    def render(self):
+        views = sorted(self.snapshot().items())
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        family("studyvault_requests_total", "counter", "Requests by view, method and status class.", [
+            f'studyvault_requests_total{{view="{_escape(view)}",method="{method}",status="{status}"}} {n}'
+            for view, m in views
+            for (method, status), n in sorted(m["requests"].items())
+        ])
+        for key, name, kind, help_text in (
+            ("queries", "studyvault_db_queries_total", "counter", "SQL queries run while serving the view."),
+            ("sql_seconds", "studyvault_db_seconds_total", "counter", "Time spent in SQL."),
+            ("template_seconds", "studyvault_template_seconds_total", "counter", "Time spent rendering templates."),
+            ("response_bytes", "studyvault_response_bytes_total", "counter", "Response body bytes (streamed bodies use Content-Length)."),
+            ("max_queries", "studyvault_db_queries_max", "gauge", "Most queries a single request of the view ran."),
+            ("over_budget", "studyvault_query_budget_exceeded_total", "counter", "Requests that ran more queries than QUERY_BUDGETS allows."),
+        ):
+            family(name, kind, help_text, [
+                f'{name}{{view="{_escape(view)}"}} {_number(m[key])}' for view, m in views
+            ])
+
+        samples = []
+        for view, m in views:
+            label = _escape(view)
+            for bound, n in zip(BUCKETS, m["duration_buckets"]):
+                samples.append(f'studyvault_request_duration_seconds_bucket{{view="{label}",le="{bound}"}} {n}')
+            total = sum(m["requests"].values())
+            samples.append(f'studyvault_request_duration_seconds_bucket{{view="{label}",le="+Inf"}} {total}')
+            samples.append(f'studyvault_request_duration_seconds_sum{{view="{label}"}} {_number(m["duration_sum"])}')
+            samples.append(f'studyvault_request_duration_seconds_count{{view="{label}"}} {total}')
+        family("studyvault_request_duration_seconds", "histogram", "Wall time per request.", samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+# ---------------------------------------------------------------- middleware
+
+def _response_size(response):
+    if getattr(response, "streaming", False):
+        try:
+            return int(response.get("Content-Length", 0))
+        except ValueError:
+            return 0
+    return len(response.content)
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else UNRESOLVED
+
+
+class InstrumentationMiddleware:
+    """MIDDLEWARE-এর একদম শুরুতে রাখো — session/auth middleware-এর query-ও গোনা হয়।"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # signal-এর আগেই খোলা connection (এই thread-এর) গুলোতেও বসাই
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    def start(self, request):
+        stats = RequestStats()
+        # test helper (QueryBudgetMixin) response.wsgi_request থেকে পড়ে
+        request.instrumentation = stats
+        return stats, _current.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, start):
+        registry.observe(
+            _view_name(request),
+            request.method,
+            response.status_code,
+            stats,
+            _response_size(response),
+            time.perf_counter() - start,
+        )
+        return response
+
+
+# ---------------------------------------------------------------- endpoint
+
+def has_metrics_token(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    return bool(token) and hmac.compare_digest(header, f"Bearer {token}")
+
+
+def metrics_view(request):
+    """
+    Staff user, বা ``Authorization: Bearer <METRICS_TOKEN>`` (Prometheus scraper)
+    — বাকিদের 403। REMOTE_ADDR দেখি না: nginx-এর পেছনে সব request-ই 127.0.0.1।
+    """
+    if not has_metrics_token(request) and not request.user.is_staff:
+        raise PermissionDenied
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
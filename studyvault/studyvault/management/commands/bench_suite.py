@@ -0,0 +1,316 @@
+import itertools
+import json
+import platform
+import secrets
+import time
+from collections import namedtuple
+from fnmatch import fnmatch
+from urllib.parse import urlencode, urlsplit
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from materials import counters, download_stats
+from materials.models import Comment, Downvote, Material, Upvote
+from studyvault import benchdata, benchmarking, pagecache
+
+SUITE_USER = benchdata.PREFIX + "suite"
+
+# name: report-এর key (stable, diff করার জন্য); view: /metrics-এর view label
+Scenario = namedtuple("Scenario", "name view method path data")
+
+BROWSE_FILTERS = ("category", "department", "semester", "university", "kind")
+# @cache_anonymous_page view — "<mode>-cached" mode-এ শুধু এগুলো, anonymous হয়ে
+PAGE_CACHED_VIEWS = {"materials:browse", "materials:material_detail"}
+CACHED_SUFFIX = "-cached"
+# --scenarios-এ "@name" — নামওয়ালা scenario সেট। "async": async view গুলো
+# (vote/comment/download), --modes wsgi,asgi দিয়ে চালালে gunicorn vs uvicorn
+SCENARIO_SETS = {
+    "async": ("upvote", "downvote", "comment", "reply", "download"),
+}
+
+
+def browse_scenarios(material, q):
+    """সব filter-এর সব combination × (search ছাড়া / সহ), আর hot/top sort।"""
+    values = {
+        "category": material.category_id,
+        "department": material.department_id,
+        "semester": material.semester_id,
+        "university": material.university_id,
+        "kind": material.file_ext,
+    }
+    path = reverse("materials:browse")
+    scenarios = []
+    for with_q in (False, True):
+        for size in range(len(BROWSE_FILTERS) + 1):
+            for dims in itertools.combinations(BROWSE_FILTERS, size):
+                params = {dim: values[dim] for dim in dims if values[dim]}
+                if with_q:
+                    params["q"] = q
+                name = "browse" + (f"?{'&'.join(sorted(params))}" if params else "")
+                scenarios.append(Scenario(name, "materials:browse", "GET", path, params))
+    for sort in ("hot", "top"):
+        scenarios.append(Scenario(f"browse?sort={sort}", "materials:browse", "GET", path, {"sort": sort}))
+    return scenarios
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark StudyVault's hot endpoints (browse with every filter/search combination, "
+        "detail, votes, comments, download) through the Django test client and/or a "
+        "concurrent HTTP load generator. Prints a diffable JSON report with p50/p95/p99 "
+        "latency, queries per request and throughput. Seed data first with seed_bench_data. "
+        "Plain modes run logged in with the anonymous page cache off; '<mode>-cached' modes "
+        "run the cacheable GET scenarios anonymously with the page cache on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default="client",
+                            help="Comma separated: client, wsgi, asgi, url (needs --url); "
+                                 "add -cached (e.g. client-cached) for anonymous page-cache runs.")
+        parser.add_argument("--url", help="Running server for the 'url' mode.")
+        parser.add_argument("--scenarios", default="*",
+                            help="Comma separated glob patterns over scenario names, or "
+                                 f"@set ({', '.join('@' + k for k in SCENARIO_SETS)}); e.g. "
+                                 "--modes wsgi,asgi --scenarios @async compares the async views "
+                                 "under gunicorn and uvicorn.")
+        parser.add_argument("--requests", type=int, default=30,
+                            help="Requests per scenario in client mode.")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=3.0,
+                            help="Seconds per scenario in HTTP modes.")
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+        parser.add_argument("--compare", help="Earlier JSON report; print p95/rps change.")
+
+    # ------------------------------------------------------------ scenarios
+
+    def build_scenarios(self, patterns):
+        bench = Material.objects.filter(uploader__username__startswith=benchdata.PREFIX)
+        # সবচেয়ে বেশি comment (গভীর thread) — detail page-এর worst case
+        source = bench if bench.exists() else Material.objects.all()
+        material = source.order_by("-comment_count", "pk").first()
+        if material is None:
+            raise CommandError("No materials to benchmark; run seed_bench_data first.")
+        parent = Comment.objects.filter(material=material).order_by("pk").first()
+        q = material.title.split()[0].lower()
+        pk = material.pk
+
+        scenarios = browse_scenarios(material, q) + [
+            Scenario("detail", "materials:material_detail", "GET",
+                     reverse("materials:material_detail", args=[pk]), {}),
+            Scenario("comments", "materials:comments", "GET",
+                     reverse("materials:comments", args=[pk]), {}),
+            Scenario("upvote", "materials:toggle_upvote", "POST",
+                     reverse("materials:toggle_upvote", args=[pk]), {}),
+            Scenario("downvote", "materials:toggle_downvote", "POST",
+                     reverse("materials:toggle_downvote", args=[pk]), {}),
+            Scenario("comment", "materials:add_comment", "POST",
+                     reverse("materials:add_comment", args=[pk]), {"body": "bench comment"}),
+            Scenario("download", "materials:download", "GET",
+                     reverse("materials:download", args=[pk]), {}),
+        ]
+        if parent is not None:
+            scenarios.append(Scenario("reply", "materials:add_reply", "POST",
+                                      reverse("materials:add_reply", args=[pk]),
+                                      {"body": "bench reply", "parent_id": parent.pk}))
+        self.material = material
+        return [s for s in scenarios if any(fnmatch(s.name, p) for p in patterns)]
+
+    # ------------------------------------------------------------ client mode
+
+    def run_client(self, scenario, client, n, warmup):
+        def call():
+            if scenario.method == "GET":
+                response = client.get(scenario.path, scenario.data)
+            else:
+                response = client.post(scenario.path, scenario.data)
+            if response.streaming:
+                # download: পুরো body পড়া পর্যন্তই request (শেষে test client নিজেই close করে)
+                for _ in response.streaming_content:
+                    pass
+            return response
+
+        for _ in range(warmup):
+            call()
+        latencies, queries, errors = [], 0, 0
+        started = time.perf_counter()
+        for _ in range(n):
+            start = time.perf_counter()
+            response = call()
+            if response.status_code >= 400:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            # InstrumentationMiddleware — async view-এর thread-এর query সহ
+            stats = getattr(response.wsgi_request, "instrumentation", None)
+            queries += stats.queries if stats is not None else 0
+        result = benchmarking.summarize(latencies, time.perf_counter() - started, errors)
+        result["queries_per_request"] = queries / len(latencies) if latencies else None
+        return result
+
+    # ------------------------------------------------------------ HTTP modes
+
+    def run_http(self, scenario, host, port, headers, options):
+        body = None
+        path = scenario.path
+        if scenario.method == "GET" and scenario.data:
+            path = f"{path}?{urlencode(scenario.data)}"
+        elif scenario.data:
+            body = urlencode(scenario.data).encode()
+
+        before = benchmarking.scrape_query_totals(host, port, headers, self.metrics_token)
+        result = benchmarking.hammer(host, port, scenario.method, path, body, headers,
+                                     options["concurrency"], options["duration"])
+        after = benchmarking.scrape_query_totals(host, port, headers, self.metrics_token)
+
+        # /metrics process-প্রতি — একাধিক worker হলে শুধু একটার হিসাব, তাই null
+        result["queries_per_request"] = None
+        if before is not None and after is not None and options["workers"] == 1:
+            old = before.get(scenario.view, [0, 0])
+            new = after.get(scenario.view, [0, 0])
+            if new[0] > old[0]:
+                result["queries_per_request"] = (new[1] - old[1]) / (new[0] - old[0])
+        return result
+
+    def http_target(self, mode, options, cached):
+        if mode == "url":
+            if not options["url"]:
+                raise CommandError("The 'url' mode needs --url.")
+            # চলমান server-এর token — এই process-এর env-এও একই METRICS_TOKEN দিতে হবে
+            self.metrics_token = settings.METRICS_TOKEN
+            url = urlsplit(options["url"])
+            return None, url.hostname, url.port or 80, url.netloc
+        try:
+            process, port = benchmarking.spawn_server(mode, options["workers"], env={
+                "PAGE_CACHE_SECONDS": str(self.page_cache_seconds(cached)),
+                # /metrics scrape-এর জন্য এই run-এর নিজস্ব token
+                "METRICS_TOKEN": self.metrics_token,
+            })
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        if process is None:
+            self.stderr.write(f"{mode} server not installed; skipping.")
+            return None, None, None, None
+        return process, "127.0.0.1", port, "localhost"
+
+    # ------------------------------------------------------------ main
+
+    def page_cache_seconds(self, cached):
+        # plain mode: cache বন্ধ, যাতে view-এর আসল কাজ মাপা হয় (logged-in হলে এমনিতেও bypass)
+        return (pagecache.timeout() or 300) if cached else 0
+
+    def mode_scenarios(self, scenarios, cached):
+        if not cached:
+            return scenarios
+        return [s for s in scenarios if s.method == "GET" and s.view in PAGE_CACHED_VIEWS]
+
+    def cleanup(self, user):
+        # client mode-এর download গুলো buffer-এ জমে থাকে — reconcile-এর আগে লিখে দেই
+        download_stats.flush()
+        Upvote.objects.filter(user=user).delete()
+        Downvote.objects.filter(user=user).delete()
+        Comment.objects.filter(user=user).delete()
+        counters.reconcile(Material.objects.filter(pk=self.material.pk))
+        user.delete()
+
+    def handle(self, *args, **options):
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        for mode in modes:
+            if mode.removesuffix(CACHED_SUFFIX) not in ("client", "url", *benchmarking.SERVERS):
+                raise CommandError(f"Unknown mode {mode!r}.")
+        patterns = []
+        for p in (p.strip() for p in options["scenarios"].split(",")):
+            if p.startswith("@"):
+                if p[1:] not in SCENARIO_SETS:
+                    raise CommandError(f"Unknown scenario set {p!r}; choose from "
+                                       f"{', '.join('@' + k for k in SCENARIO_SETS)}.")
+                patterns.extend(SCENARIO_SETS[p[1:]])
+            elif p:
+                patterns.append(p)
+        scenarios = self.build_scenarios(patterns)
+        if not scenarios:
+            raise CommandError("No scenario matches --scenarios.")
+
+        self.metrics_token = secrets.token_hex(16)
+        user, _ = get_user_model().objects.get_or_create(username=SUITE_USER)
+        results = {}
+        try:
+            for mode in modes:
+                base = mode.removesuffix(CACHED_SUFFIX)
+                cached = base != mode
+                results[mode] = {}
+                if base == "client":
+                    client = Client(HTTP_HOST="localhost")
+                    if not cached:
+                        client.force_login(user)
+                    with override_settings(PAGE_CACHE_SECONDS=self.page_cache_seconds(cached)):
+                        for scenario in self.mode_scenarios(scenarios, cached):
+                            results[mode][scenario.name] = self.run_client(
+                                scenario, client, options["requests"], options["warmup"]
+                            )
+                            self.progress(mode, scenario.name, results[mode][scenario.name])
+                    continue
+
+                process, host, port, netloc = self.http_target(base, options, cached)
+                if host is None:
+                    del results[mode]
+                    continue
+                # cached mode-এর load anonymous (session cookie থাকলে page cache bypass)
+                headers = ({"Host": netloc} if cached
+                           else benchmarking.session_headers(user, host=netloc))
+                try:
+                    for scenario in self.mode_scenarios(scenarios, cached):
+                        results[mode][scenario.name] = self.run_http(scenario, host, port, headers, options)
+                        self.progress(mode, scenario.name, results[mode][scenario.name])
+                finally:
+                    if process is not None:
+                        process.terminate()
+                        process.wait(timeout=30)
+        finally:
+            self.cleanup(user)
+
+        report = {
+            "meta": {
+                "dataset": benchdata.counts(),
+                "database": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+                # plain mode-এ 0 (বন্ধ); "-cached" mode-এ এই মান। url mode-এ server নিজের setting
+                "page_cache_seconds": self.page_cache_seconds(True),
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "options": {k: options[k] for k in (
+                    "requests", "warmup", "concurrency", "duration", "workers")},
+            },
+            "results": results,
+        }
+        text = benchmarking.dump_report(report)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(text)
+            self.stderr.write(f"Wrote {options['output']}.")
+        else:
+            self.stdout.write(text, ending="")
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+            for mode, name, change in benchmarking.compare(baseline, report):
+                cells = "  ".join(
+                    f"{key} {'n/a' if pct is None else f'{pct:+6.1f}%'}" for key, pct in change.items()
+                )
+                self.stderr.write(f"{mode:<7} {name:<48} {cells}")
+
+    def progress(self, mode, name, r):
+        qpr = r["queries_per_request"]
+        self.stderr.write(
+            f"{mode:<7} {name:<48} {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.2f}  "
+            f"p95 {r['p95_ms']:7.2f}  p99 {r['p99_ms']:7.2f} ms  "
+            f"queries {'-' if qpr is None else f'{qpr:.1f}'}"
+        )
@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.shortcuts import render
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from materials import leaderboard
+from materials.models import University
+from studyvault.views import home
+
+
+def legacy_home(request):
+    """আগের home view: প্রতি request-এ সব University-র উপর Count("materials")।"""
+    top_unis = list(
+        University.objects
+        .annotate(num_materials=Count("materials"))
+        .order_by("-num_materials", "name")[:12]
+    )
+    for uni in top_unis:
+        uni.material_count = uni.num_materials
+    return render(request, "home.html", {"top_unis": top_unis})
+
+
+class Command(BaseCommand):
+    help = "Compare home page latency: live Count() aggregation vs. the cached leaderboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+
+    def measure(self, view, n, warmup):
+        # ALLOWED_HOSTS-এ আছে এমন host — page cache key get_host() পড়ে
+        factory = RequestFactory(HTTP_HOST="localhost")
+
+        def call():
+            request = factory.get("/")
+            request.user = AnonymousUser()
+            return view(request)
+
+        for _ in range(warmup):
+            call()
+
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(n):
+                start = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        return {
+            "mean_ms": statistics.fmean(timings),
+            "p50_ms": timings[len(timings) // 2],
+            "p95_ms": timings[int(len(timings) * 0.95) - 1],
+            "queries_per_request": len(ctx.captured_queries) / n,
+        }
+
+    def handle(self, *args, **options):
+        n, warmup = options["requests"], options["warmup"]
+        self.stdout.write(
+            f"{University.objects.count()} universities, {n} requests each\n"
+        )
+
+        leaderboard.invalidate()
+        # anonymous page cache বন্ধ — নাহলে warmup-এর পর শুধু cache hit মাপা হত, view না
+        with override_settings(PAGE_CACHE_SECONDS=0):
+            results = {
+                "before (Count aggregation)": self.measure(legacy_home, n, warmup),
+                "after (cached leaderboard)": self.measure(home, n, warmup),
+            }
+
+        for label, r in results.items():
+            self.stdout.write(
+                f"{label:<28} mean {r['mean_ms']:7.2f} ms  p50 {r['p50_ms']:7.2f} ms  "
+                f"p95 {r['p95_ms']:7.2f} ms  queries/req {r['queries_per_request']:.2f}"
+            )
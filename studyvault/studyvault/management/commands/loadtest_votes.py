@@ -0,0 +1,130 @@
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from materials import counters, votes
+from materials.models import Downvote, Material, Upvote
+
+USER_PREFIX = "loadtest-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the vote toggle from concurrent threads and report write throughput "
+        "per concurrency level. Compare configs by re-running with a different "
+        "environment, e.g. DB_SQLITE_SYNCHRONOUS=FULL or DATABASE_URL=postgres://…"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", default="1,2,4,8",
+                            help="Comma separated concurrency levels.")
+        parser.add_argument("--duration", type=float, default=5.0,
+                            help="Seconds per concurrency level.")
+        parser.add_argument("--materials", type=int, default=5,
+                            help="Spread toggles over this many materials (fewer = more contention).")
+
+    def backend_info(self):
+        info = connection.vendor
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                pragmas = []
+                for name in ("journal_mode", "synchronous", "busy_timeout"):
+                    cursor.execute(f"PRAGMA {name}")
+                    pragmas.append(f"{name}={cursor.fetchone()[0]}")
+            info += " (" + ", ".join(pragmas) + ")"
+        else:
+            settings_dict = connection.settings_dict
+            pool = settings_dict["OPTIONS"].get("pool")
+            info += f" (CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}, pool={bool(pool)})"
+        return info
+
+    def run_level(self, users, material_ids, duration):
+        timings, errors = [], []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker(index, user):
+            mine, failed = [], 0
+            i = index
+            try:
+                while time.perf_counter() < deadline:
+                    material_id = material_ids[i % len(material_ids)]
+                    direction = votes.UP if i % 3 else votes.DOWN
+                    start = time.perf_counter()
+                    try:
+                        votes.toggle_vote(user, material_id, direction)
+                    except OperationalError:
+                        # SQLite busy_timeout পার হয়ে গেছে ("database is locked")
+                        failed += 1
+                    else:
+                        mine.append((time.perf_counter() - start) * 1000)
+                    i += 1
+            finally:
+                # thread-এর নিজের connection — না বন্ধ করলে পরের level-এ জমে থাকে
+                connection.close()
+            with lock:
+                timings.extend(mine)
+                errors.append(failed)
+
+        threads = [
+            threading.Thread(target=worker, args=(n, user)) for n, user in enumerate(users)
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        return {
+            "ops": len(timings),
+            "ops_per_sec": len(timings) / elapsed,
+            "p50_ms": timings[len(timings) // 2] if timings else 0.0,
+            "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)] if timings else 0.0,
+            "errors": sum(errors),
+        }
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(n) for n in options["threads"].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError("--threads must be comma separated integers.")
+        if not levels or min(levels) < 1:
+            raise CommandError("--threads needs at least one level >= 1.")
+
+        material_ids = list(
+            Material.objects.order_by("pk").values_list("pk", flat=True)[: options["materials"]]
+        )
+        if not material_ids:
+            raise CommandError("No materials to vote on; upload or seed some first.")
+
+        User = get_user_model()
+        users = [
+            User.objects.get_or_create(username=f"{USER_PREFIX}{n}")[0]
+            for n in range(max(levels))
+        ]
+
+        self.stdout.write(
+            f"{self.backend_info()}\n"
+            f"{len(material_ids)} materials, {options['duration']:.0f}s per level\n"
+        )
+        try:
+            for level in levels:
+                r = self.run_level(users[:level], material_ids, options["duration"])
+                self.stdout.write(
+                    f"threads {level:>3}  {r['ops']:>7} toggles  {r['ops_per_sec']:8.1f} ops/s  "
+                    f"p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms  "
+                    f"locked {r['errors']}"
+                )
+        finally:
+            # load test-এর vote গুলো মুছে counter ঠিক করে দেই — আসল data অপরিবর্তিত ✅
+            user_ids = [u.pk for u in users]
+            Upvote.objects.filter(user_id__in=user_ids).delete()
+            Downvote.objects.filter(user_id__in=user_ids).delete()
+            counters.reconcile(Material.objects.filter(pk__in=material_ids))
+            User.objects.filter(pk__in=user_ids).delete()
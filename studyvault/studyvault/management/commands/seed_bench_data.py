@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from studyvault import benchdata
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic benchmark data: universities, materials, votes and deep "
+        "comment threads, all owned by 'bench-' users. --clear removes it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--universities", type=int, default=5)
+        parser.add_argument("--materials", type=int, default=200)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--votes", type=int, default=2000)
+        parser.add_argument("--threads", type=int, default=2,
+                            help="Top-level comments per material.")
+        parser.add_argument("--depth", type=int, default=4,
+                            help="Comments per thread, each a reply to the previous one.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--clear", action="store_true",
+                            help="Delete existing bench data before generating.")
+        parser.add_argument("--only-clear", action="store_true", help="Delete bench data and exit.")
+
+    def handle(self, *args, **options):
+        if options["clear"] or options["only_clear"]:
+            deleted = benchdata.clear()
+            self.stdout.write(f"Deleted {deleted} bench rows.")
+            if options["only_clear"]:
+                return
+
+        summary = benchdata.generate(
+            universities=options["universities"],
+            materials=options["materials"],
+            users=options["users"],
+            votes=options["votes"],
+            threads=options["threads"],
+            depth=options["depth"],
+            seed=options["seed"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Generated " + ", ".join(f"{n} {name}" for name, n in summary.items()) + "."
+        ))
@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _is_sqlite(alias):
+    return connections[alias].vendor == "sqlite"
+
+
+class Command(BaseCommand):
+    help = (
+        "Local stand-in for replication: copy the primary SQLite file into every SQLite "
+        "replica (DATABASE_REPLICA_URLS=sqlite:///replica_1.sqlite3). With --interval it "
+        "keeps copying, so replicas lag the primary by up to that many seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Seconds between copies; 0 = copy once and exit.")
+
+    def sync(self, source, aliases):
+        # backup API: primary-তে লেখা চলতে থাকলেও consistent snapshot
+        with sqlite3.connect(source) as src:
+            for alias in aliases:
+                with sqlite3.connect(connections[alias].settings_dict["NAME"]) as dst:
+                    src.backup(dst)
+
+    def handle(self, *args, **options):
+        if not _is_sqlite("default"):
+            raise CommandError("Primary is not SQLite; use the database's own replication.")
+        aliases = [a for a in settings.DATABASE_REPLICAS if _is_sqlite(a)]
+        if not aliases:
+            raise CommandError("No SQLite replicas configured (DATABASE_REPLICA_URLS).")
+
+        source = connections["default"].settings_dict["NAME"]
+        while True:
+            self.sync(source, aliases)
+            self.stdout.write(f"Synced {', '.join(aliases)} from primary.")
+            if options["interval"] <= 0:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,184 @@
+# studyvault/pagecache.py
+"""
+Anonymous visitor-এর পুরো page shared cache (settings CACHES) থেকে — search
+engine / link share থেকে আসা traffic বেশিরভাগই logged-out, আর তাদের home,
+universities, browse, detail সবার জন্য একই HTML।
+
+  * ``@cache_anonymous_page("browse")`` — GET/HEAD, session/messages cookie
+    নেই, primary pin নেই (studyvault/replicas.py) হলে তবেই cache। Logged-in
+    user সবসময় view-এ যায় (vote button, comment form, CSRF token)।
+  * Key = namespace + host + path + query param (sort করা, খালি আর utm_* এর মত
+    tracking param বাদ) — ``?b=2&a=1`` আর ``?a=1&b=2&utm_source=x`` একই entry।
+  * Purge: entry-র সাথে তার tag গুলোর version stamp রাখি (materials/fragments.py
+    এর মত)। Hit-এর সময় tag version মিলিয়ে দেখি; ``purge()`` version বদলালে
+    ওই tag-এর সব entry তখনই বাতিল, key খুঁজে মুছতে হয় না। Tag:
+      - ``all``               সব page (lookup table বদলালে)
+      - ``page:<namespace>``  ওই ধরনের সব page (নতুন material -> browse/home)
+      - ``material:<pk>``     যে page-এ ওই material আছে (view ``tag()`` দিয়ে বলে)
+    Signal গুলো materials/signals.py তে — vote/comment/material save/delete।
+  * Response-এ cookie বসলে বা CSRF token render হলে (``CSRF_COOKIE_NEEDS_UPDATE``)
+    store করি না — একজনের token আরেকজনকে দেওয়া যাবে না।
+
+সীমা: hot/top sort-এ vote পড়লে material যে page-এ *ঢুকবে* সেটা purge হয় না
+(শুধু যেখানে আগে থেকে ছিল) — সর্বোচ্চ ``PAGE_CACHE_SECONDS`` পুরোনো। Replica
+থাকলে purge-এর ঠিক পরের miss replica lag-এর পুরোনো data cache করতে পারে —
+সেক্ষেত্রে PAGE_CACHE_SECONDS ছোট রাখো।
+"""
+import functools
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .replicas import SAFE_METHODS, is_pinned
+
+HEADER = "X-Page-Cache"
+TAG_TIMEOUT = 24 * 60 * 60
+IGNORED_PARAMS = {"fbclid", "gclid", "ref"}
+IGNORED_PREFIXES = ("utm_",)
+SKIPPED_HEADERS = {HEADER.lower(), "set-cookie"}
+
+
+def timeout():
+    return getattr(settings, "PAGE_CACHE_SECONDS", 300)
+
+
+def material_tag(pk):
+    return f"material:{pk}"
+
+
+def page_tag(namespace):
+    return f"page:{namespace}"
+
+
+def _tag_key(tag):
+    return f"pagecache:tag:{tag}"
+
+
+def _entry_key(namespace, request):
+    params = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        if key not in IGNORED_PARAMS and not key.startswith(IGNORED_PREFIXES)
+        for value in values if value != ""
+    )
+    variant = f"{request.get_host()}{request.path}?{urlencode(params)}"
+    return f"pagecache:{namespace}:{hashlib.sha256(variant.encode()).hexdigest()[:32]}"
+
+
+def _tag_versions(tags):
+    """{tag: version}; যেগুলোর version নেই সেগুলোর নতুন বসিয়ে দেয়।"""
+    keys = {tag: _tag_key(tag) for tag in tags}
+    found = cache.get_many(keys.values())
+    result, missing = {}, {}
+    for tag, key in keys.items():
+        if key in found:
+            result[tag] = found[key]
+        else:
+            result[tag] = missing[key] = time.time_ns()
+    if missing:
+        cache.set_many(missing, TAG_TIMEOUT)
+    return result
+
+
+def _is_fresh(entry):
+    keys = {tag: _tag_key(tag) for tag in entry["tags"]}
+    found = cache.get_many(keys.values())
+    return all(found.get(keys[tag]) == version for tag, version in entry["tags"].items())
+
+
+def _cacheable_request(request):
+    if request.method not in SAFE_METHODS or timeout() <= 0:
+        return False
+    # session cookie থাকলে logged-in হতে পারে / session-এ message থাকতে পারে
+    if settings.SESSION_COOKIE_NAME in request.COOKIES or "messages" in request.COOKIES:
+        return False
+    return not is_pinned(request) and not request.user.is_authenticated
+
+
+def _cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+def tag(request, *tags):
+    """View থেকে: এই page-এ কোন material আছে — সেগুলো বদলালে page purge।"""
+    known = getattr(request, "_page_cache_tags", None)
+    if known is None:
+        # cache হচ্ছে না (logged-in ইত্যাদি)
+        return
+    new = [t for t in tags if t not in known]
+    if new:
+        # version এখনই পড়ি (render-এর আগে) — render চলাকালীন purge হলে entry বাতিল থাকে
+        known.update(_tag_versions(new))
+
+
+def purge(*tags, using="default"):
+    """এই tag গুলোর সব cached page বাতিল — এখনই, আর commit হওয়ার পরে আরেকবার।"""
+    tags = {t for t in tags if t}
+    if not tags:
+        return
+
+    def _bump():
+        version = time.time_ns()
+        cache.set_many({_tag_key(t): version for t in tags}, TAG_TIMEOUT)
+
+    # commit-এর আগে কেউ পুরোনো data নতুন version-এ cache করলেও দ্বিতীয়টায় বাতিল
+    _bump()
+    transaction.on_commit(_bump, using=using)
+
+
+def _freeze(response, tags):
+    return {
+        "status": response.status_code,
+        "content": response.content,
+        "headers": [(k, v) for k, v in response.items() if k.lower() not in SKIPPED_HEADERS],
+        "tags": tags,
+    }
+
+
+def _thaw(entry):
+    response = HttpResponse(entry["content"], status=entry["status"])
+    for key, value in entry["headers"]:
+        response[key] = value
+    return response
+
+
+def cache_anonymous_page(namespace):
+    """View decorator — anonymous GET/HEAD এর পুরো response shared cache থেকে।"""
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            key = _entry_key(namespace, request)
+            entry = cache.get(key)
+            if entry is not None and _is_fresh(entry):
+                response = _thaw(entry)
+                response[HEADER] = "hit"
+                return response
+
+            request._page_cache_tags = {}
+            tag(request, "all", page_tag(namespace))
+            response = view(request, *args, **kwargs)
+            if _cacheable_response(request, response):
+                patch_vary_headers(response, ("Cookie",))
+                cache.set(key, _freeze(response, request._page_cache_tags), timeout())
+                response[HEADER] = "miss"
+            return response
+
+        return wrapper
+
+    return decorator
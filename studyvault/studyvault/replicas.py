@@ -0,0 +1,116 @@
+# studyvault/replicas.py
+"""
+Read replica routing — browse/detail/home এর মত read-only page replica থেকে পড়ে,
+vote/comment/upload সব write primary-তে।
+
+  * ``@read_from_replica`` দেওয়া view-এর ভিতরের সব read query একটা replica-তে যায়
+    (request প্রতি একটাই replica বেছে নেই — এক page-এর ভিতরে দুই replica-র
+    আলাদা lag দেখা যাবে না)। বাকি সব view আগের মতই primary।
+  * Read-your-writes: কোনো POST/PUT/PATCH/DELETE সফল হলে ``PrimaryPinMiddleware``
+    একটা ছোট cookie দেয়; ``REPLICA_PIN_SECONDS`` পর্যন্ত সেই browser-এর সব read
+    primary থেকে — নিজের vote/comment পরের page-এ সাথে সাথেই দেখা যায়, replica
+    পিছিয়ে থাকলেও।
+  * Session table সবসময় primary — login-এর পরপরই replica-তে session না থাকলে
+    user logout হয়ে যেত।
+
+Replica configure না থাকলে (``DATABASE_REPLICA_URLS`` খালি) সব কিছু আগের মত
+``default``। Local test: studyvault/management/commands/sync_sqlite_replicas.py
+"""
+import functools
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PIN_COOKIE = "sv_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# এই app গুলোর read replica-তে পাঠাই না
+PRIMARY_ONLY_APPS = {"sessions"}
+
+_replica = ContextVar("studyvault_replica", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+def is_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_from_replica(view):
+    """View decorator — GET/HEAD request-এ (pin না থাকলে) query replica থেকে।"""
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        aliases = replica_aliases()
+        if not aliases or request.method not in SAFE_METHODS or is_pinned(request):
+            return view(request, *args, **kwargs)
+        token = _replica.set(random.choice(aliases))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return "default"
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        # None দিলে Django instance-এর _state.db তে লিখত — replica থেকে পড়া
+        # object save করলে replica-তে লেখা হয়ে যেত
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primary আর replica একই data — এক DB-র object অন্যটার সাথে relate করা যায়
+        return True
+
+
+class PrimaryPinMiddleware:
+    # sync + async দুই রকমই — ASGI-তে async view-এর সামনে sync middleware
+    # থাকলে প্রতিটা request আবার thread-pool adapter দিয়ে যেত
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.pin(request, await self.get_response(request))
+
+    def pin(self, request, response):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_aliases()
+        ):
+            seconds = pin_seconds()
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time() + seconds)),
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
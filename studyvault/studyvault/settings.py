@@ -10,8 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
+from .caches import cache_config
+from .db import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -64,6 +69,8 @@ AUTHENTICATION_BACKENDS = [
 
 
 MIDDLEWARE = [
+    # ✅ সবার আগে — session/auth middleware এর query-ও view-এর হিসাবে আসে
+    'studyvault.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,13 +79,15 @@ MIDDLEWARE = [
     'allauth.account.middleware.AccountMiddleware', # new added
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'studyvault.replicas.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'studyvault.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates + render time মাপা (studyvault/instrumentation.py)
+        'BACKEND': 'studyvault.instrumentation.InstrumentedTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -97,12 +106,45 @@ WSGI_APPLICATION = 'studyvault.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Environment থেকে: DATABASE_URL না থাকলে SQLite (WAL), থাকলে Postgres
+# (pool / persistent connection) — বিস্তারিত studyvault/db.py
+DATABASES = database_config(BASE_DIR)
+
+# Read replica (DATABASE_REPLICA_URLS) — browse/detail/home replica থেকে পড়ে,
+# write করার পর REPLICA_PIN_SECONDS ধরে ওই browser primary থেকে পড়ে
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['studyvault.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = 10
+
+# Shared cache (CACHE_URL): default FileBasedCache — সব worker একই cache দেখে।
+# Redis / memcached / locmem — বিস্তারিত studyvault/caches.py। Test run-এ locmem।
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CACHES = cache_config(testing=TESTING)
+
+# Anonymous visitor-এর পুরো page (home, universities, browse, detail) এতক্ষণ
+# cache-এ; vote/comment/material বদলালে সেই page গুলো তখনই purge
+# (studyvault/pagecache.py)। 0 = বন্ধ (bench_suite spawn করা server-এ env দিয়ে)।
+PAGE_CACHE_SECONDS = int(os.environ.get('PAGE_CACHE_SECONDS', 300))
+
+# Per-view query budget (resolved URL name -> max query)। বেশি হলে warning log
+# আর /metrics-এ studyvault_query_budget_exceeded_total; test-এ
+# studyvault.testing.QueryBudgetMixin fail করে।
+QUERY_BUDGETS = {
+    'home': 3,
+    'materials:browse': 8,
+    'materials:universities': 4,
+    'materials:material_detail': 9,
+    'materials:comments': 3,
+    'materials:toggle_upvote': 10,
+    'materials:toggle_downvote': 10,
+    'materials:add_comment': 10,
+    'materials:add_reply': 10,
+    'materials:delete_comment': 8,
+    'materials:download': 6,
 }
+# /metrics (Prometheus): staff user, বা scraper ``Authorization: Bearer <METRICS_TOKEN>``
+# পাঠালে। খালি = token দিয়ে ঢোকা বন্ধ।
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
 
 
 # Password validation
@@ -178,3 +220,25 @@ LOGOUT_REDIRECT_URL = "/"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Material download: None হলে Django নিজেই stream করে (Range সাপোর্ট সহ)।
+# Production-এ front proxy কে দিয়ে পাঠাতে "x-accel-redirect" (nginx) বা
+# "x-sendfile" (Apache/lighttpd)। nginx-এ prefix টা internal location হতে হবে:
+#   location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MATERIALS_DOWNLOAD_OFFLOAD = None
+MATERIALS_DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+
+# Download count প্রতি request-এ না লিখে এত সেকেন্ড পরপর batch করে flush হয়
+# (materials/download_stats.py)। 0 = সাথে সাথে লেখো।
+MATERIALS_DOWNLOAD_FLUSH_INTERVAL = 10
+
+# Live vote/comment update (SSE, materials/events.py)। একাধিক worker/process হলে:
+#   {'BACKEND': 'materials.events.RedisBroker', 'OPTIONS': {'url': 'redis://localhost:6379/0'}}
+MATERIALS_EVENT_BROKER = {
+    'BACKEND': 'materials.events.InProcessBroker',
+    'OPTIONS': {'queue_size': 100},
+}
+
+
+# Chunked upload-এর partial ফাইল (materials/uploads.py)। None = system temp dir।
+# একাধিক app server হলে সবার জন্য একই shared disk দিতে হবে।
+MATERIALS_UPLOAD_TEMP_DIR = None
@@ -0,0 +1,33 @@
+# studyvault/testing.py
+"""
+Test helper — ``settings.QUERY_BUDGETS`` এর বাইরে query গেলে test fail, যাতে
+N+1 (browse-এর vote count, comment tree) production graph-এ না, CI-তেই ধরা পড়ে।
+
+    class BrowseTests(QueryBudgetMixin, TestCase):
+        def test_browse(self):
+            response = self.client.get(reverse("materials:browse"))
+            self.assertWithinQueryBudget(response)
+"""
+from django.conf import settings
+
+
+class QueryBudgetMixin:
+    def query_stats(self, response):
+        stats = getattr(response.wsgi_request, "instrumentation", None)
+        if stats is None:
+            self.fail("InstrumentationMiddleware did not run for this request.")
+        return stats
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        """``budget`` না দিলে response-এর resolved view-এর ``QUERY_BUDGETS`` মান।"""
+        stats = self.query_stats(response)
+        view = response.wsgi_request.resolver_match.view_name
+        if budget is None:
+            budgets = getattr(settings, "QUERY_BUDGETS", {})
+            if view not in budgets:
+                self.fail(f"No QUERY_BUDGETS entry for {view!r}.")
+            budget = budgets[view]
+        if stats.queries > budget:
+            sql = "\n".join(f"  {i}. {s}" for i, s in enumerate(stats.statements, 1))
+            self.fail(f"{view} ran {stats.queries} queries (budget {budget}):\n{sql}")
+        return stats
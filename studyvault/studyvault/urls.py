@@ -2,12 +2,14 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .instrumentation import metrics_view
 from .views import home, profile_view
 
 urlpatterns = [
     path('', home, name='home'),
     path('u/<str:username>/', profile_view, name='profile'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 
     # তোমার কাস্টম accounts (login, signup, logout)
     path('accounts/', include('accounts.urls')),
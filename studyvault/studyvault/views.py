@@ -1,19 +1,19 @@
 # studyvault/views.py
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Count
 from django.contrib.auth.models import User
-from materials.models import University  # ✅ import
+from materials import leaderboard  # ✅ import
 from accounts.models import UserProfile
 from accounts.forms import ProfileForm
+from .pagecache import cache_anonymous_page
+from .replicas import read_from_replica
 
+@cache_anonymous_page("home")
+@read_from_replica
 def home(request):
     # Top universities by document count (ties -> by name)
-    top_unis = (
-        University.objects
-        .annotate(num_materials=Count("materials"))
-        .order_by("-num_materials", "name")[:12]
-    )
+    # materialized University.material_count + cache, প্রতি view-এ aggregation না
+    top_unis = leaderboard.top_universities()
     return render(request, "home.html", {"top_unis": top_unis})
 
 